@@ -0,0 +1,6 @@
+#! /usr/bin/env python
+# -*- coding: utf-8 -*-
+"""Description.
+
+Mesures de performance de la librairie ordonnancement, voir bench.lance.
+"""
@@ -0,0 +1,131 @@
+#! /usr/bin/env python
+# -*- coding: utf-8 -*-
+"""Description.
+
+Générateurs de graphes de prérequis synthétiques pour les mesures de performance.
+
+Un générateur renvoie une spécification : une liste de tuples
+(nom, heures, [(prerequis, typ, latence_en_heures), ...]).
+vers_texte la met au format de Probleme.par_str, vers_taches en fait des objets Tache,
+ce qui permet de mesurer séparément la lecture et la validation.
+
+Les noms ont tous la même largeur (T0000042) : aucun nom n'est contenu dans un autre.
+"""
+import random
+from typing import Callable, Dict, List, Tuple
+from ordonnancement import Tache, Prerequis, Duree
+
+Specification = List[Tuple[str, int, List[Tuple[str, str, int]]]]
+
+## Largeur des noms de tâche, suffisante pour 10⁷ tâches.
+_LARGEUR = 7
+
+
+def _nom(indice: int) -> str:
+    """Nom de la tâche d'indice donné."""
+    return f"T{indice:0{_LARGEUR}d}"
+
+
+def _prerequis(
+    generateur: random.Random, sources: List[int], mixte: bool
+) -> List[Tuple[str, str, int]]:
+    """Prérequis vers les sources, de type fin ou, si mixte, fin et debut avec latences."""
+    if not mixte:
+        return [(_nom(source), "fin", 0) for source in sources]
+    return [
+        (_nom(source), generateur.choice(["fin", "debut"]), generateur.randint(0, 5))
+        for source in sources
+    ]
+
+
+def chaine(nb_taches: int, graine: int = 0) -> Specification:
+    """Une seule longue chaîne, chaque tâche attendant la fin de la précédente."""
+    generateur = random.Random(graine)
+    return [
+        (
+            _nom(i),
+            generateur.randint(1, 48),
+            _prerequis(generateur, [i - 1] if i else [], False),
+        )
+        for i in range(nb_taches)
+    ]
+
+
+def eventail(nb_taches: int, graine: int = 0) -> Specification:
+    """Une racine, nb_taches - 2 tâches parallèles qui l'attendent, un puits qui les attend toutes."""
+    generateur = random.Random(graine)
+    resultat = [(_nom(0), generateur.randint(1, 48), [])]
+    for i in range(1, nb_taches - 1):
+        resultat.append((_nom(i), generateur.randint(1, 48), _prerequis(generateur, [0], True)))
+    if nb_taches > 1:
+        resultat.append(
+            (
+                _nom(nb_taches - 1),
+                1,
+                _prerequis(generateur, list(range(1, nb_taches - 1)), False),
+            )
+        )
+    return resultat
+
+
+def en_couches(nb_taches: int, graine: int = 0, largeur: int = 100) -> Specification:
+    """Couches de largeur tâches, chacune attendant une à trois tâches de la couche précédente."""
+    generateur = random.Random(graine)
+    resultat = list()
+    for i in range(nb_taches):
+        couche_precedente = range(max(0, i // largeur - 1) * largeur, (i // largeur) * largeur)
+        sources = generateur.sample(
+            couche_precedente, min(len(couche_precedente), generateur.randint(1, 3))
+        )
+        resultat.append(
+            (_nom(i), generateur.randint(1, 48), _prerequis(generateur, sources, True))
+        )
+    return resultat
+
+
+def aleatoire(nb_taches: int, graine: int = 0, degre: int = 3) -> Specification:
+    """Graphe aléatoire : chaque tâche attend jusqu'à degre tâches antérieures quelconques."""
+    generateur = random.Random(graine)
+    resultat = list()
+    for i in range(nb_taches):
+        sources = {generateur.randrange(i) for _ in range(generateur.randint(0, degre))} if i else set()
+        resultat.append(
+            (_nom(i), generateur.randint(1, 48), _prerequis(generateur, sorted(sources), True))
+        )
+    return resultat
+
+
+GENERATEURS: Dict[str, Callable[[int, int], Specification]] = {
+    "chaine": chaine,
+    "eventail": eventail,
+    "en_couches": en_couches,
+    "aleatoire": aleatoire,
+}
+
+
+def vers_texte(specification: Specification) -> str:
+    """Met la spécification au format de Probleme.par_str."""
+    lignes = list()
+    for nom, heures, prerequis in specification:
+        message = " | ".join(
+            f"{source} {typ} ({latence} heures)" if latence else f"{source} {typ}"
+            for source, typ, latence in prerequis
+        )
+        lignes.append(f"{nom} / {heures} heures / {message} / Tache {nom}")
+    return "\n".join(lignes)
+
+
+def vers_taches(specification: Specification) -> List[Tache]:
+    """Construit les objets Tache de la spécification."""
+    return [
+        Tache(
+            nom=nom,
+            duree=Duree(heures=heures),
+            prerequis=[
+                Prerequis(nom=source, typ=typ, latence=Duree(heures=latence))
+                for source, typ, latence in prerequis
+            ],
+            correspondance=f"Tache {nom}",
+        )
+        for nom, heures, prerequis in specification
+    ]
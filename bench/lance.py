@@ -0,0 +1,225 @@
+#! /usr/bin/env python
+# -*- coding: utf-8 -*-
+"""Description.
+
+Mesures de performance de la librairie ordonnancement sur des graphes synthétiques.
+
+Chaque étape est chronométrée séparément, pour chaque générateur et chaque taille :
+lecture (Probleme.par_str), validation (Probleme.__init__), genere_graphe, resous_EDT,
+resous_Calendrier et rendu des tables rich. Le meilleur temps sur plusieurs répétitions est retenu.
+Dès qu'une étape dépasse le budget, elle n'est plus mesurée pour les tailles suivantes du générateur.
+
+Les résultats sont écrits en JSON :
+
+    python -m bench.lance --tailles 100 1000 10000 --sortie resultats.json
+"""
+import argparse
+import io
+import json
+import platform
+import subprocess
+import sys
+import time
+from typing import Any, Callable, Dict, List, Optional
+from ordonnancement import Probleme, genere_graphe, resous_EDT, resous_Calendrier
+from .generateurs import GENERATEURS, vers_texte, vers_taches
+
+ETAPES = [
+    "par_str",
+    "validation",
+    "genere_graphe",
+    "resous_EDT",
+    "resous_Calendrier",
+    "rendu_EDT",
+    "rendu_Calendrier",
+]
+
+DATE_COMMENCEMENT = "1/1/2020"
+
+
+def _chronometre(fonction: Callable[[], Any], repetitions: int):
+    """Meilleur temps d'exécution en secondes, et le résultat du dernier appel."""
+    meilleur = float("inf")
+    resultat = None
+    for _ in range(repetitions):
+        debut = time.perf_counter()
+        resultat = fonction()
+        meilleur = min(meilleur, time.perf_counter() - debut)
+    return meilleur, resultat
+
+
+def _rendu(table) -> str:
+    """Rend une table rich dans une chaîne, comme l'afficherait la console."""
+    from rich.console import Console
+
+    console = Console(file=io.StringIO(), width=120)
+    console.print(table)
+    return console.file.getvalue()
+
+
+def _etapes(specification, texte) -> Dict[str, Callable[[Dict[str, Any]], Any]]:
+    """Fonctions de chaque étape, les résultats précédents étant passés dans un dictionnaire."""
+    taches = vers_taches(specification)
+    return {
+        "par_str": lambda _: Probleme.par_str(texte),
+        "validation": lambda _: Probleme(taches),
+        "genere_graphe": lambda resultats: genere_graphe(resultats["validation"]),
+        "resous_EDT": lambda resultats: resous_EDT(resultats["validation"]),
+        "resous_Calendrier": lambda resultats: resous_Calendrier(
+            resultats["validation"], DATE_COMMENCEMENT
+        ),
+        "rendu_EDT": lambda resultats: _rendu(
+            resultats["resous_EDT"]._genere_table(entier=False, brute=False)
+        ),
+        "rendu_Calendrier": lambda resultats: _rendu(
+            resultats["resous_Calendrier"]._genere_table(entier=False)
+        ),
+    }
+
+
+## Étapes dont dépend chaque étape.
+_DEPENDANCES = {
+    "genere_graphe": ["validation"],
+    "resous_EDT": ["validation"],
+    "resous_Calendrier": ["validation"],
+    "rendu_EDT": ["resous_EDT"],
+    "rendu_Calendrier": ["resous_Calendrier"],
+}
+
+
+def _avec_dependances(etapes: List[str]) -> List[str]:
+    """Étapes demandées et celles dont elles dépendent, dans l'ordre d'exécution."""
+    necessaires = set(etapes)
+    for etape in reversed(ETAPES):
+        if etape in necessaires:
+            necessaires.update(_DEPENDANCES.get(etape, []))
+    return [etape for etape in ETAPES if etape in necessaires]
+
+
+def mesure(
+    generateurs: List[str],
+    tailles: List[int],
+    etapes: List[str] = ETAPES,
+    repetitions: int = 3,
+    budget: float = 60.0,
+    graine: int = 0,
+    journal: Optional[Callable[[Dict[str, Any]], None]] = None,
+) -> List[Dict[str, Any]]:
+    """Renvoie une mesure par générateur, taille et étape.
+
+    Une mesure est un dictionnaire : generateur, taille, nb_prerequis, etape, secondes, ignoree.
+    Les étapes nécessaires aux étapes demandées sont exécutées une fois, sans être rapportées.
+    """
+    resultat = list()
+    for nom in generateurs:
+        depassees = set()
+        for taille in sorted(tailles):
+            specification = GENERATEURS[nom](taille, graine)
+            nb_prerequis = sum(len(prerequis) for _, _, prerequis in specification)
+            fonctions = _etapes(specification, vers_texte(specification))
+            resultats: Dict[str, Any] = dict()
+            for etape in _avec_dependances(etapes):
+                dependances = _DEPENDANCES.get(etape, [])
+                ignoree = etape in depassees or any(d not in resultats for d in dependances)
+                secondes = None
+                if not ignoree:
+                    secondes, resultats[etape] = _chronometre(
+                        lambda: fonctions[etape](resultats),
+                        repetitions if etape in etapes else 1,
+                    )
+                    if secondes > budget:
+                        depassees.add(etape)
+                if etape not in etapes:
+                    continue
+                ligne = {
+                    "generateur": nom,
+                    "taille": taille,
+                    "nb_prerequis": nb_prerequis,
+                    "etape": etape,
+                    "secondes": secondes,
+                    "ignoree": ignoree,
+                }
+                if journal is not None:
+                    journal(ligne)
+                resultat.append(ligne)
+    return resultat
+
+
+def _revision() -> Optional[str]:
+    """Commit git courant, s'il y en a un."""
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "HEAD"], capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def environnement() -> Dict[str, Any]:
+    """Description de la machine et des versions, pour comparer les résultats."""
+    import numpy
+
+    return {
+        "python": platform.python_version(),
+        "numpy": numpy.__version__,
+        "plateforme": platform.platform(),
+        "processeur": platform.processor() or platform.machine(),
+        "revision": _revision(),
+        "date": time.strftime("%Y-%m-%dT%H:%M:%S"),
+    }
+
+
+def _affiche(mesure: Dict[str, Any]):
+    """Affiche une mesure sur une ligne."""
+    temps = "ignorée" if mesure["ignoree"] else f"{mesure['secondes']:.4f} s"
+    print(
+        f"{mesure['generateur']:<11} {mesure['taille']:>8} {mesure['etape']:<18} {temps}",
+        file=sys.stderr,
+    )
+
+
+def main(arguments: Optional[List[str]] = None):
+    """Point d'entrée en ligne de commande."""
+    analyseur = argparse.ArgumentParser(description=__doc__.split("\n\n")[1])
+    analyseur.add_argument(
+        "--generateurs", nargs="+", choices=list(GENERATEURS), default=list(GENERATEURS)
+    )
+    analyseur.add_argument("--tailles", nargs="+", type=int, default=[100, 1000, 10000])
+    analyseur.add_argument("--etapes", nargs="+", choices=ETAPES, default=ETAPES)
+    analyseur.add_argument("--repetitions", type=int, default=3)
+    analyseur.add_argument(
+        "--budget",
+        type=float,
+        default=60.0,
+        help="secondes au-delà desquelles une étape n'est plus mesurée aux tailles suivantes",
+    )
+    analyseur.add_argument("--graine", type=int, default=0)
+    analyseur.add_argument("--sortie", default="-", help="fichier JSON, - pour la sortie standard")
+    options = analyseur.parse_args(arguments)
+    document = {
+        "environnement": environnement(),
+        "parametres": {
+            "repetitions": options.repetitions,
+            "budget": options.budget,
+            "graine": options.graine,
+        },
+        "mesures": mesure(
+            options.generateurs,
+            options.tailles,
+            options.etapes,
+            options.repetitions,
+            options.budget,
+            options.graine,
+            journal=_affiche,
+        ),
+    }
+    if options.sortie == "-":
+        json.dump(document, sys.stdout, indent=2)
+        print()
+    else:
+        with open(options.sortie, "w", encoding="utf-8") as fichier:
+            json.dump(document, fichier, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,121 @@
+#! /usr/bin/env python
+# -*- coding: utf-8 -*-
+"""Description.
+
+Empreinte mémoire des objets de la librairie ordonnancement sur des graphes synthétiques.
+
+La mémoire allouée est mesurée avec tracemalloc pour le problème (tâches et prérequis compris),
+puis pour l'emploi du temps et le calendrier résolus, en plus du problème.
+Le calendrier est résolu par un CalendrierOuvre sans restriction, qui donne le même résultat
+que resous_Calendrier sans passer par Pendulum à chaque tâche.
+
+Les résultats sont écrits en JSON, à comparer d'une révision à l'autre :
+
+    python -m bench.memoire --tailles 1000 100000 --sortie memoire.json
+"""
+import argparse
+import gc
+import json
+import sys
+import tracemalloc
+from typing import Any, Callable, Dict, List, Optional
+from ordonnancement import Probleme, CalendrierOuvre, resous_EDT, resous_Calendrier
+from .generateurs import GENERATEURS, vers_taches
+from .lance import DATE_COMMENCEMENT, environnement
+
+OBJETS = ["probleme", "edt", "calendrier"]
+
+
+def _alloue(fonction: Callable[[], Any]):
+    """Octets encore alloués après fonction, pic d'allocation pendant, et son résultat."""
+    gc.collect()
+    tracemalloc.reset_peak()
+    avant = tracemalloc.get_traced_memory()[0]
+    resultat = fonction()
+    gc.collect()
+    courant, pic = tracemalloc.get_traced_memory()
+    return courant - avant, pic - avant, resultat
+
+
+def mesure(
+    generateurs: List[str],
+    tailles: List[int],
+    graine: int = 0,
+    journal: Optional[Callable[[Dict[str, Any]], None]] = None,
+) -> List[Dict[str, Any]]:
+    """Renvoie une mesure par générateur, taille et objet.
+
+    Une mesure est un dictionnaire : generateur, taille, nb_prerequis, objet, octets,
+    octets_par_tache et pic (octets alloués au plus fort de la construction).
+    """
+    resultat = list()
+    for nom in generateurs:
+        for taille in sorted(tailles):
+            specification = GENERATEURS[nom](taille, graine)
+            nb_prerequis = sum(len(prerequis) for _, _, prerequis in specification)
+            tracemalloc.start()
+            try:
+                octets, pic, probleme = _alloue(lambda: Probleme(vers_taches(specification)))
+                mesures = [("probleme", octets, pic)]
+                octets, pic, _ = _alloue(lambda: resous_EDT(probleme))
+                mesures.append(("edt", octets, pic))
+                octets, pic, _ = _alloue(
+                    lambda: resous_Calendrier(
+                        probleme,
+                        DATE_COMMENCEMENT,
+                        calendrier_ouvre=CalendrierOuvre(DATE_COMMENCEMENT),
+                    )
+                )
+                mesures.append(("calendrier", octets, pic))
+            finally:
+                tracemalloc.stop()
+            for objet, octets, pic in mesures:
+                ligne = {
+                    "generateur": nom,
+                    "taille": taille,
+                    "nb_prerequis": nb_prerequis,
+                    "objet": objet,
+                    "octets": octets,
+                    "octets_par_tache": octets / taille,
+                    "pic": pic,
+                }
+                if journal is not None:
+                    journal(ligne)
+                resultat.append(ligne)
+    return resultat
+
+
+def _affiche(mesure: Dict[str, Any]):
+    """Affiche une mesure sur une ligne."""
+    print(
+        f"{mesure['generateur']:<11} {mesure['taille']:>8} {mesure['objet']:<11} "
+        f"{mesure['octets_par_tache']:>8.0f} octets par tâche",
+        file=sys.stderr,
+    )
+
+
+def main(arguments: Optional[List[str]] = None):
+    """Point d'entrée en ligne de commande."""
+    analyseur = argparse.ArgumentParser(description=__doc__.split("\n\n")[1])
+    analyseur.add_argument(
+        "--generateurs", nargs="+", choices=list(GENERATEURS), default=["aleatoire"]
+    )
+    analyseur.add_argument("--tailles", nargs="+", type=int, default=[1000, 10000])
+    analyseur.add_argument("--graine", type=int, default=0)
+    analyseur.add_argument("--sortie", default="-", help="fichier JSON, - pour la sortie standard")
+    options = analyseur.parse_args(arguments)
+    document = {
+        "environnement": environnement(),
+        "parametres": {"graine": options.graine},
+        "mesures": mesure(options.generateurs, options.tailles, options.graine, journal=_affiche),
+    }
+    if options.sortie == "-":
+        json.dump(document, sys.stdout, indent=2)
+        print()
+    else:
+        with open(options.sortie, "w", encoding="utf-8") as fichier:
+            json.dump(document, fichier, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -177,10 +177,49 @@ Exemple :
 Remarque:
 On pourra faire python -m ordonnancement pour un exemple.
 """
-from .probleme import Tache, Probleme, Prerequis, Duree
+from .probleme import Tache, Probleme, Prerequis, Duree, DUREE_NULLE, Registre
 from .edt import Activite, EDT
-from .algorithme import resous_EDT, resous_Calendrier, genere_graphe
+from .algorithme import resous_EDT, resous_Calendrier, genere_graphe, resous_EDT_vectoriel
 from .calendrier import Date, Calendrier, Datation
+from .dag import Graphe, ErreurCycle
+from .instrumentation import Instrumentation, Phase
+from .cache import CacheSolutions, CacheDisque, StatistiquesCache
+import importlib
+
+## Noms chargés au premier accès (PEP 562) : ces modules importent NumPy.
+## matplotlib, rich, networkx et pendulum ne sont importés que par les méthodes qui s'en servent.
+_IMPORTS_DIFFERES = {
+    "Reseau": ".reseau",
+    "VueEDT": ".reseau",
+    "ProblemeCompile": ".compilation",
+    "SessionEDT": ".compilation",
+    "analyse_risque": ".risque",
+    "TroisPoints": ".risque",
+    "Loi": ".risque",
+    "RapportRisque": ".risque",
+    "analyse_marges": ".marges",
+    "Marges": ".marges",
+    "Marge": ".marges",
+    "CalendrierOuvre": ".ouvre",
+    "JoursFeries": ".feries",
+    "vers_binaire": ".binaire",
+    "depuis_binaire": ".binaire",
+}
+
+
+def __getattr__(nom: str):
+    """Importe à la demande les objets des modules qui dépendent de NumPy."""
+    if nom not in _IMPORTS_DIFFERES:
+        raise AttributeError(f"module {__name__!r} has no attribute {nom!r}")
+    valeur = getattr(importlib.import_module(_IMPORTS_DIFFERES[nom], __name__), nom)
+    globals()[nom] = valeur
+    return valeur
+
+
+def __dir__():
+    """Liste aussi les noms chargés à la demande."""
+    return sorted(set(globals()) | set(_IMPORTS_DIFFERES))
+
 
 __all__ = [
     "Activite",
@@ -189,10 +228,35 @@ __all__ = [
     "Probleme",
     "resous_EDT",
     "resous_Calendrier",
+    "resous_EDT_vectoriel",
+    "Reseau",
+    "VueEDT",
+    "ProblemeCompile",
+    "SessionEDT",
+    "analyse_risque",
+    "TroisPoints",
+    "Loi",
+    "RapportRisque",
+    "analyse_marges",
+    "Marges",
+    "Marge",
     "genere_graphe",
+    "Graphe",
+    "ErreurCycle",
     "Prerequis",
+    "Registre",
     "Date",
     "Calendrier",
     "Duree",
+    "DUREE_NULLE",
     "Datation",
+    "CalendrierOuvre",
+    "JoursFeries",
+    "Instrumentation",
+    "Phase",
+    "CacheSolutions",
+    "CacheDisque",
+    "StatistiquesCache",
+    "vers_binaire",
+    "depuis_binaire",
 ]
@@ -4,62 +4,69 @@
 
 Contient la fonction de résolution du problème d'ordonnancement.
 """
-from .probleme import Probleme, Tache, Prerequis, Duree
+from .probleme import Probleme, Tache, Prerequis, Duree, DUREE_NULLE
 from .edt import Activite, EDT
 from .calendrier import Date, Calendrier, Datation
-import networkx as nx
-from pendulum import duration, datetime
-from typing import Union, Optional
-
-
-def genere_graphe(probleme: Probleme) -> nx.DiGraph:
-    """Crée le graphe associé au problème."""
-    resultat = nx.DiGraph()
-    for tache in probleme.taches:
-        for prerequis in tache.prerequis:
-            if prerequis:
-                resultat.add_edge(
-                    prerequis.nom,
-                    tache.nom,
-                    temps=tache.duree,
-                    attente=prerequis.latence,
-                    typ=prerequis.typ,
-                )
-    return resultat
+from .dag import Graphe
+from .instrumentation import Instrumentation, sans_mesure
+from typing import Callable, Generator, List, Union, Optional, TYPE_CHECKING
+
+if TYPE_CHECKING:
+    import numpy as np
+    from .reseau import VueEDT
+    from .ouvre import CalendrierOuvre
+    from .feries import JoursFeries
 
 
-def _calcule_demarrage(tache: Tache, edt: EDT) -> Duree:
+def genere_graphe(probleme: Probleme, mesure: Callable = sans_mesure) -> Graphe:
+    """Crée le graphe associé au problème, avec toutes ses tâches.
+
+    Graphe.vers_networkx() en donne une version networkx.
+    """
+    return Graphe(probleme, mesure)
+
+
+def _prerequis(tache: Tache) -> Generator[Prerequis, None, None]:
+    """Prérequis d'une tâche, dans l'ordre des prédécesseurs du graphe."""
+    for prerequis in tache.prerequis:
+        if prerequis:
+            yield prerequis
+
+
+def _calcule_demarrage(
+    tache: Tache, sources: List[int], debuts: List[Duree], fins: List[Duree]
+) -> Duree:
     """Calcule sur quels prerequis une tâche doit commencer.
+    sources donne l'identifiant de chaque prérequis dans le graphe, qui indexe debuts et fins.
     Retourne un type Duree"""
 
     fins_prerequis = list()
-    for prerequis in tache.prerequis:
-        if prerequis:
-            if prerequis.typ == "fin":
-                fins_prerequis.append(edt[prerequis.nom].fin.add(prerequis.latence))
-            if prerequis.typ == "debut":
-                fins_prerequis.append(edt[prerequis.nom].debut.add(prerequis.latence))
+    for prerequis, source in zip(_prerequis(tache), sources):
+        if prerequis.typ == "fin":
+            fins_prerequis.append(fins[source].add(prerequis.latence))
+        if prerequis.typ == "debut":
+            fins_prerequis.append(debuts[source].add(prerequis.latence))
     if fins_prerequis:
         return max(fins_prerequis)
-    return Duree()
+    return DUREE_NULLE
 
 
 def _calcule_demarrage2(
-    tache: Tache, calendrier: Calendrier, date_commencement: Date
+    tache: Tache,
+    sources: List[int],
+    debuts: List[Date],
+    fins: List[Date],
+    date_commencement: Date,
 ) -> Date:
     """Calcule sur quelle prerequis une tâche doit commencer.
+    sources donne l'identifiant de chaque prérequis dans le graphe, qui indexe debuts et fins.
     Retourne type Date"""
     fins_prerequis = list()
-    for prerequis in tache.prerequis:
-        if prerequis:
-            if prerequis.typ == "fin":
-                fins_prerequis.append(
-                    calendrier[prerequis.nom].date_fin.add(prerequis.latence)
-                )
-            if prerequis.typ == "debut":
-                fins_prerequis.append(
-                    calendrier[prerequis.nom].date_debut.add(prerequis.latence)
-                )
+    for prerequis, source in zip(_prerequis(tache), sources):
+        if prerequis.typ == "fin":
+            fins_prerequis.append(fins[source].add(prerequis.latence))
+        if prerequis.typ == "debut":
+            fins_prerequis.append(debuts[source].add(prerequis.latence))
     if fins_prerequis:
         return max(fins_prerequis)
     return date_commencement
@@ -137,6 +144,27 @@ def _choix(
         )
 
 
+def _durees_effectives(
+    durees: "np.ndarray",
+    duree_max_journalier: Optional[Union[float, int]],
+    nb_jours_repos: Optional[Union[float, int]],
+) -> "np.ndarray":
+    """Vecteur des durées d'éxécution en secondes selon les conditions, à partir des durées en secondes.
+
+    Sans condition, durees est renvoyé tel quel."""
+    if duree_max_journalier is None and nb_jours_repos is None:
+        return durees
+    import numpy as np
+
+    return np.asarray(
+        [
+            _choix(Duree._depuis_secondes(duree), duree_max_journalier, nb_jours_repos)._secondes
+            for duree in durees.tolist()
+        ],
+        dtype=np.int64,
+    )
+
+
 def _choix2(
     demarrage: Duree,
     duree_tache: Duree,
@@ -180,10 +208,28 @@ def _choix2(
         return demarrage_valide, arrivee_valide
 
 
+def _verifie_conditions_EDT(
+    duree_max_journalier: Optional[Union[float, int]],
+    nb_jours_repos: Optional[Union[float, int]],
+):
+    """Vérifie les conditions de résolution d'un emploi du temps."""
+    if duree_max_journalier is not None:
+        if duree_max_journalier <= 0 or duree_max_journalier >= 24:
+            raise ValueError(
+                "La durée maximum d'éxécution des tâches journalier doit-être strictement positive ou inférieure à 24."
+            )
+    if nb_jours_repos is not None:
+        if nb_jours_repos <= 0 or nb_jours_repos > 6:
+            raise ValueError(
+                "Le nombre hebdomadaire de jours de repos doit être compris entre 1 et 6."
+            )
+
+
 def resous_EDT(
     probleme: Probleme,
     duree_max_journalier: Optional[Union[float, int]] = None,
     nb_jours_repos: Optional[Union[float, int]] = None,
+    instrumentation: Optional[Instrumentation] = None,
 ) -> EDT:
     """Renvoie un calendrier optimal.
 
@@ -199,6 +245,9 @@ def resous_EDT(
                     - 6
         Attention ! Nous perdons de la précision avec cet argument
 
+        [optionnel] instrumentation
+        Une Instrumentation qui mesure le temps et les appels de chaque phase de la résolution.
+
         Exemple:
 
         >>> mon_probleme.affiche_probleme()
@@ -250,45 +299,93 @@ def resous_EDT(
     │       │ heures 18 minutes                │ heures 18 minutes 1 seconde      │
     └───────┴──────────────────────────────────┴──────────────────────────────────┘
     """
+    if instrumentation is not None:
+        with instrumentation._active() as mesure:
+            return _resous_EDT(probleme, duree_max_journalier, nb_jours_repos, mesure)
+    return _resous_EDT(probleme, duree_max_journalier, nb_jours_repos, sans_mesure)
 
-    graphe = genere_graphe(probleme)
+
+def _ajoute_activite(edt: EDT, tache: Tache, debut: Duree, fin: Duree):
+    """Ajoute l'activité d'une tâche à l'emploi du temps."""
+    edt.ajoute(Activite(tache=tache, debut=debut, fin=fin))
+
+
+def _resous_EDT(
+    probleme: Probleme,
+    duree_max_journalier: Optional[Union[float, int]],
+    nb_jours_repos: Optional[Union[float, int]],
+    mesure: Callable,
+) -> EDT:
+    """Algorithme de resous_EDT, chaque phase passant par mesure."""
+    graphe = mesure("graphe", genere_graphe)(probleme, mesure)
 
     ##Conditions nécessaires au bon déroulement de l'algorithme
-    if duree_max_journalier is not None:
-        if duree_max_journalier <= 0 or duree_max_journalier >= 24:
-            raise ValueError(
-                "La durée maximum d'éxécution des tâches journalier doit-être strictement positive ou inférieure à 24."
-            )
-    if nb_jours_repos is not None:
-        if nb_jours_repos <= 0 or nb_jours_repos > 6:
-            raise ValueError(
-                "Le nombre hebdomadaire de jours de repos doit être compris entre 1 et 6."
-            )
-    if not nx.is_directed_acyclic_graph(G=graphe):
-        raise ValueError("Le problème n'a pas de solution.")
+    _verifie_conditions_EDT(duree_max_journalier, nb_jours_repos)
+    mesure("acyclicite", graphe.verifie_acyclique)()
     ##################Algorithme##############################
-    bon_ordre = [probleme[nom] for nom in nx.topological_sort(G=graphe)]
+    calcule_demarrage = mesure("demarrage", _calcule_demarrage)
+    choix = mesure("temps_ouvre", _choix)
+    ajoute = mesure("insertion", _ajoute_activite)
+    debuts: List[Optional[Duree]] = [None] * len(graphe)
+    fins: List[Optional[Duree]] = [None] * len(graphe)
     resultat = EDT(activites=[])
-    for tache_courante in bon_ordre:
-        demarrage = _calcule_demarrage(tache=tache_courante, edt=resultat)
-        arrivee = demarrage.add(
-            _choix(tache_courante.duree, duree_max_journalier, nb_jours_repos)
+    for indice in graphe.ordre:
+        tache_courante = graphe.taches[indice]
+        demarrage = calcule_demarrage(
+            tache=tache_courante,
+            sources=graphe.predecesseurs[indice],
+            debuts=debuts,
+            fins=fins,
         )
-        resultat.ajoute(
-            Activite(
-                tache=tache_courante,
-                debut=demarrage,
-                fin=arrivee,
-            )
+        arrivee = demarrage.add(
+            choix(tache_courante.duree, duree_max_journalier, nb_jours_repos)
         )
+        debuts[indice] = demarrage
+        fins[indice] = arrivee
+        ajoute(resultat, tache_courante, demarrage, arrivee)
     return resultat
 
 
+def resous_EDT_vectoriel(
+    probleme: Probleme,
+    duree_max_journalier: Optional[Union[float, int]] = None,
+    nb_jours_repos: Optional[Union[float, int]] = None,
+    colonnes: Optional[bool] = False,
+) -> Union[EDT, "VueEDT"]:
+    """Renvoie un emploi du temps optimal, calculé sur les tableaux d'un Reseau.
+
+        Mêmes arguments que resous_EDT.
+
+        [optionnel] colonnes
+        Renvoie une VueEDT en colonnes plutôt qu'un EDT, sans créer d'objet par tâche.
+
+        >>> resolution=resous_EDT_vectoriel(mon_probleme)
+        >>> resolution == resous_EDT(mon_probleme)
+    True
+        >>> vue=resous_EDT_vectoriel(mon_probleme, colonnes=True)
+        >>> vue.fins
+    array([ 95817600,  97556400,  96193380, 216721380, 216721381])
+    """
+    from .reseau import Reseau, VueEDT
+
+    _verifie_conditions_EDT(duree_max_journalier, nb_jours_repos)
+    reseau = Reseau.par_probleme(probleme)
+    durees = _durees_effectives(reseau.durees, duree_max_journalier, nb_jours_repos)
+    debuts = reseau.passe_avant(durees=durees)
+    vue = VueEDT(probleme, reseau, debuts, debuts + durees)
+    if colonnes:
+        return vue
+    return vue.vers_EDT()
+
+
 def resous_Calendrier(
     probleme: Probleme,
     date_commencement: Union[Date, str],
     heures_execution: Optional[str] = None,
     jours_repos: Optional[str] = None,
+    calendrier_ouvre: Optional["CalendrierOuvre"] = None,
+    jours_feries: Optional["JoursFeries"] = None,
+    instrumentation: Optional[Instrumentation] = None,
 ) -> Calendrier:
     """Renvoie un calendrier optimal.
 
@@ -309,6 +406,19 @@ def resous_Calendrier(
                     - Lundi Vendredi
         Attention ! Nous perdons de la précision avec cet argument
 
+        [optionnel] calendrier_ouvre
+        Un CalendrierOuvre, qui remplace heures_execution et jours_repos sans perte de précision.
+        Les durées des tâches sont alors comptées en temps ouvré, les latences en temps calendaire.
+        Exemple :   - CalendrierOuvre("23/12/1998", heures_execution="10-18", jours_repos="Mardi mercredi")
+
+        [optionnel] jours_feries
+        Des JoursFeries où aucune tâche ne s'exécute. Le calcul passe alors par un CalendrierOuvre
+        construit avec heures_execution et jours_repos, à donner au CalendrierOuvre s'il y en a un.
+        Exemple :   - JoursFeries.par_fichier("feries.txt")
+
+        [optionnel] instrumentation
+        Une Instrumentation qui mesure le temps et les appels de chaque phase de la résolution.
+
         >>> mon_probleme.affiche_probleme()
                        Problème d'ordonnancement
     ┌───────┬─────────────────────┬────────────────────────────────┐
@@ -346,13 +456,70 @@ def resous_Calendrier(
     └───────┴───────────────────────────┴───────────────────────────┘
     """
 
-    graphe = genere_graphe(probleme)
+    if instrumentation is not None:
+        with instrumentation._active() as mesure:
+            return _resous_Calendrier(
+                probleme,
+                date_commencement,
+                heures_execution,
+                jours_repos,
+                calendrier_ouvre,
+                jours_feries,
+                mesure,
+            )
+    return _resous_Calendrier(
+        probleme,
+        date_commencement,
+        heures_execution,
+        jours_repos,
+        calendrier_ouvre,
+        jours_feries,
+        sans_mesure,
+    )
+
+
+def _ajoute_datation(calendrier: Calendrier, tache: Tache, debut: Date, fin: Date):
+    """Ajoute la datation d'une tâche au calendrier."""
+    calendrier.ajoute(Datation(tache=tache, date_debut=debut, date_fin=fin))
+
+
+def _resous_Calendrier(
+    probleme: Probleme,
+    date_commencement: Union[Date, str],
+    heures_execution: Optional[str],
+    jours_repos: Optional[str],
+    calendrier_ouvre: Optional["CalendrierOuvre"],
+    jours_feries: Optional["JoursFeries"],
+    mesure: Callable,
+) -> Calendrier:
+    """Algorithme de resous_Calendrier, chaque phase passant par mesure."""
+    graphe = mesure("graphe", genere_graphe)(probleme, mesure)
     if type(date_commencement) == str:
         date_commencement = _convertit_en_date(date_commencement)
 
     ##Conditions nécessaires au bon déroulement de l'algorithme
-    if not nx.is_directed_acyclic_graph(G=graphe):
-        raise ValueError("Le problème n'a pas de solution.")
+    mesure("acyclicite", graphe.verifie_acyclique)()
+
+    if calendrier_ouvre is not None:
+        if heures_execution is not None or jours_repos is not None or jours_feries is not None:
+            raise ValueError(
+                "Les heures d'éxécution et les jours de repos sont déjà donnés par le calendrier ouvré."
+            )
+        return _resous_Calendrier_ouvre(
+            graphe, date_commencement, calendrier_ouvre, mesure
+        )
+    if jours_feries is not None:
+        from .ouvre import CalendrierOuvre
+
+        calendrier_ouvre = CalendrierOuvre(
+            date_commencement,
+            heures_execution=heures_execution,
+            jours_repos=jours_repos,
+            jours_feries=jours_feries,
+        )
+        return _resous_Calendrier_ouvre(
+            graphe, date_commencement, calendrier_ouvre, mesure
+        )
 
     if jours_repos is not None:
         liste_verification = list()
@@ -374,26 +541,90 @@ def resous_Calendrier(
                 "La condition sur les heures journalières d'éxécution sont invalide"
             )
     ######################Algorithme###########################
-    bon_ordre = [probleme[nom] for nom in nx.topological_sort(G=graphe)]
+    calcule_demarrage = mesure("demarrage", _calcule_demarrage2)
+    choix = mesure("temps_ouvre", _choix2)
+    ajoute = mesure("insertion", _ajoute_datation)
+    debuts: List[Optional[Date]] = [None] * len(graphe)
+    fins: List[Optional[Date]] = [None] * len(graphe)
     resultat = Calendrier(dates=[])
-    for tache_courante in bon_ordre:
-        demarrage = _calcule_demarrage2(
+    for indice in graphe.ordre:
+        tache_courante = graphe.taches[indice]
+        demarrage = calcule_demarrage(
             tache=tache_courante,
-            calendrier=resultat,
+            sources=graphe.predecesseurs[indice],
+            debuts=debuts,
+            fins=fins,
             date_commencement=date_commencement,
         )
-        demarrage_valide, arrivee_valide = _choix2(
+        demarrage_valide, arrivee_valide = choix(
             demarrage=demarrage,
             duree_tache=tache_courante.duree,
             heures_execution=heures_execution,
             jours_repos=jours_repos,
         )
-        resultat.ajoute(
-            Datation(
-                tache=tache_courante,
-                date_debut=demarrage_valide,
-                date_fin=arrivee_valide,
-            )
+        debuts[indice] = demarrage_valide
+        fins[indice] = arrivee_valide
+        ajoute(resultat, tache_courante, demarrage_valide, arrivee_valide)
+    return resultat
+
+
+def _calcule_demarrage_ouvre(
+    tache: Tache,
+    sources: List[int],
+    debuts: List[int],
+    fins: List[int],
+    origine: int,
+    calendrier_ouvre: "CalendrierOuvre",
+) -> int:
+    """Calcule, en secondes depuis l'origine du calendrier ouvré, quand une tâche peut commencer."""
+    demarrage = origine
+    for prerequis, source in zip(_prerequis(tache), sources):
+        reference = fins if prerequis.typ == "fin" else debuts
+        demarrage = max(
+            demarrage,
+            calendrier_ouvre._decale(reference[source], prerequis.latence),
+        )
+    return demarrage
+
+
+def _plage_ouvree(calendrier_ouvre: "CalendrierOuvre", demarrage: int, duree: Duree):
+    """Début et fin en temps ouvré d'une tâche qui peut commencer à demarrage."""
+    debut = calendrier_ouvre._debut(demarrage)
+    return debut, calendrier_ouvre._fin(debut, duree)
+
+
+def _resous_Calendrier_ouvre(
+    graphe: Graphe,
+    date_commencement: Date,
+    calendrier_ouvre: "CalendrierOuvre",
+    mesure: Callable = sans_mesure,
+) -> Calendrier:
+    """Résout le calendrier en secondes depuis l'origine du calendrier ouvré."""
+    calcule_demarrage = mesure("demarrage", _calcule_demarrage_ouvre)
+    plage_ouvree = mesure("temps_ouvre", _plage_ouvree)
+    ajoute = mesure("insertion", _ajoute_datation)
+    origine = calendrier_ouvre._en_secondes(date_commencement)
+    debuts = [0] * len(graphe)
+    fins = [0] * len(graphe)
+    resultat = Calendrier(dates=[])
+    for indice in graphe.ordre:
+        tache_courante = graphe.taches[indice]
+        demarrage = calcule_demarrage(
+            tache_courante,
+            graphe.predecesseurs[indice],
+            debuts,
+            fins,
+            origine,
+            calendrier_ouvre,
+        )
+        debut, fin = plage_ouvree(calendrier_ouvre, demarrage, tache_courante.duree)
+        debuts[indice] = debut
+        fins[indice] = fin
+        ajoute(
+            resultat,
+            tache_courante,
+            calendrier_ouvre._en_date(debut),
+            calendrier_ouvre._en_date(fin),
         )
     return resultat
 
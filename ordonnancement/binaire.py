@@ -0,0 +1,454 @@
+#! /usr/bin/env python
+# -*- coding: utf-8 -*-
+"""Description.
+
+Format binaire versionné des problèmes, emplois du temps et calendriers.
+
+Un fichier commence par un en-tête (signature, version, nature, nombre de tableaux)
+suivi d'une table des matières puis des tableaux, chacun aligné sur 8 octets.
+Les tâches y sont rangées en colonnes :
+    - les noms et les correspondances dans des tables de chaînes UTF-8 avec leurs décalages ;
+    - les durées en secondes, les quelques durées dont la décomposition n'est pas celle
+      de Duree._depuis_secondes gardant leurs composantes à part ;
+    - les prérequis au format CSR : indices des tâches prérequises, types et latences.
+Les dates d'un calendrier sont des secondes depuis le 1er janvier 1970.
+
+lit_tableaux donne les tableaux sans copie (numpy.frombuffer) ; depuis_binaire reconstruit
+les objets sans relire de texte ni refaire les contrôles de chaque objet : les contrôles
+sont faits une fois, en bloc, sur les tableaux. Les estimations des tâches ne sont pas conservées.
+"""
+import gc
+import mmap
+import struct
+import sys
+from contextlib import contextmanager
+import numpy as np
+from typing import Any, Dict, List, Optional, Tuple, Union, TYPE_CHECKING
+from .probleme import Probleme, Registre, Tache, Prerequis, Duree
+from .edt import EDT, Activite
+from .calendrier import Date, Calendrier, Datation
+
+if TYPE_CHECKING:
+    from .reseau import Reseau
+
+VERSION = 1
+
+## Signature, version, nature et nombre de tableaux.
+_ENTETE = struct.Struct("<8sHHI")
+_SIGNATURE = b"ORDOBIN\0"
+## Nom, type NumPy, décalage, nombre de lignes et de colonnes (0 pour un tableau à une dimension).
+_ENTREE = struct.Struct("<16s4sQQQ")
+_ALIGNEMENT = 8
+
+_NATURES = {1: "probleme", 2: "edt", 3: "calendrier"}
+_CLASSES = {Probleme: 1, EDT: 2, Calendrier: 3}
+_TYPES = ["fin", "debut"]
+
+## Secondes de chaque composante d'une durée, dans l'ordre de _COMPOSANTES.
+_COMPOSANTES = ("secondes", "minutes", "heures", "jours", "semaines", "mois", "annees")
+_FACTEURS = np.asarray(
+    [1, 60, 3600, 86400, 7 * 86400, 30 * 86400, 365 * 86400], dtype=np.int64
+)
+## Jour 0 des dates, 1er janvier 1970, en numéro de jour de datetime.date.toordinal.
+_ORDINAL_EPOQUE = 719163
+
+Objet = Union[Probleme, EDT, Calendrier]
+
+
+def _ecrit(nature: int, tableaux: Dict[str, np.ndarray]) -> bytes:
+    """Assemble l'en-tête, la table des matières et les tableaux."""
+    position = _ENTETE.size + _ENTREE.size * len(tableaux)
+    entrees = list()
+    morceaux = list()
+    for nom, tableau in tableaux.items():
+        if len(nom) > 16:
+            raise ValueError(f"Le nom de tableau {nom} dépasse 16 caractères.")
+        tableau = np.ascontiguousarray(tableau)
+        position += -position % _ALIGNEMENT
+        morceaux.append((position, tableau.tobytes()))
+        lignes = tableau.shape[0] if tableau.ndim else 1
+        colonnes = tableau.shape[1] if tableau.ndim == 2 else 0
+        entrees.append(
+            _ENTREE.pack(
+                nom.encode("ascii"),
+                tableau.dtype.str.encode("ascii"),
+                position,
+                lignes,
+                colonnes,
+            )
+        )
+        position += tableau.nbytes
+    resultat = bytearray(position)
+    _ENTETE.pack_into(resultat, 0, _SIGNATURE, VERSION, nature, len(tableaux))
+    resultat[_ENTETE.size : _ENTETE.size + _ENTREE.size * len(entrees)] = b"".join(entrees)
+    for debut, octets in morceaux:
+        resultat[debut : debut + len(octets)] = octets
+    return bytes(resultat)
+
+
+def lit_tableaux(donnees: Any) -> Tuple[str, Dict[str, np.ndarray]]:
+    """Renvoie la nature ("probleme", "edt" ou "calendrier") et les tableaux, sans copie.
+
+    donnees est un objet exposant le protocole tampon : bytes, memoryview, mmap...
+    Les tableaux restent des vues en lecture seule sur donnees.
+    """
+    tampon = memoryview(donnees).cast("B")
+    if len(tampon) < _ENTETE.size:
+        raise ValueError("Les données binaires sont tronquées.")
+    signature, version, nature, nb_tableaux = _ENTETE.unpack_from(tampon, 0)
+    if signature != _SIGNATURE:
+        raise ValueError("Les données ne sont pas au format binaire d'ordonnancement.")
+    if version != VERSION:
+        raise ValueError(f"La version {version} du format binaire n'est pas prise en charge.")
+    if nature not in _NATURES:
+        raise ValueError(f"Nature {nature} inconnue.")
+    tableaux = dict()
+    for i in range(nb_tableaux):
+        decalage = _ENTETE.size + i * _ENTREE.size
+        if decalage + _ENTREE.size > len(tampon):
+            raise ValueError("Les données binaires sont tronquées.")
+        nom, code, position, lignes, colonnes = _ENTREE.unpack_from(tampon, decalage)
+        type_numpy = np.dtype(code.rstrip(b"\0").decode("ascii"))
+        forme = (lignes, colonnes) if colonnes else (lignes,)
+        nombre = lignes * max(colonnes, 1)
+        if position + nombre * type_numpy.itemsize > len(tampon):
+            raise ValueError("Les données binaires sont tronquées.")
+        tableaux[nom.rstrip(b"\0").decode("ascii")] = np.frombuffer(
+            tampon, dtype=type_numpy, count=nombre, offset=position
+        ).reshape(forme)
+    return _NATURES[nature], tableaux
+
+
+def _encode_chaines(chaines: List[str], nom: str) -> Dict[str, np.ndarray]:
+    """Table de chaînes : octets UTF-8 concaténés et décalages."""
+    octets = [chaine.encode("utf-8") for chaine in chaines]
+    decalages = np.zeros(len(octets) + 1, dtype=np.int64)
+    np.cumsum([len(morceau) for morceau in octets], out=decalages[1:])
+    return {
+        nom: np.frombuffer(b"".join(octets), dtype=np.uint8),
+        f"{nom}_indptr": decalages,
+    }
+
+
+def _decode_chaines(tableaux: Dict[str, np.ndarray], nom: str) -> List[str]:
+    """Chaînes d'une table, internées."""
+    octets = tableaux[nom].tobytes()
+    decalages = tableaux[f"{nom}_indptr"].tolist()
+    texte = octets.decode("utf-8")
+    if len(texte) != len(octets):
+        return [
+            sys.intern(octets[debut:fin].decode("utf-8"))
+            for debut, fin in zip(decalages, decalages[1:])
+        ]
+    return [sys.intern(texte[debut:fin]) for debut, fin in zip(decalages, decalages[1:])]
+
+
+def _decompose(totaux: np.ndarray) -> np.ndarray:
+    """Composantes de Duree._depuis_secondes, en colonnes dans l'ordre de _COMPOSANTES."""
+    resultat = np.zeros((len(totaux), len(_FACTEURS)), dtype=np.int64)
+    reste = totaux.copy()
+    for colonne in range(len(_FACTEURS) - 1, -1, -1):
+        resultat[:, colonne], reste = np.divmod(reste, _FACTEURS[colonne])
+    return resultat
+
+
+def _composantes(durees: List[Duree]) -> np.ndarray:
+    """Composantes des durées, une ligne par durée dans l'ordre de _COMPOSANTES."""
+    return np.asarray(
+        [[getattr(duree, composante) for composante in _COMPOSANTES] for duree in durees],
+        dtype=np.int64,
+    ).reshape(len(durees), len(_COMPOSANTES))
+
+
+def _construit_durees(composantes: np.ndarray, totaux: np.ndarray) -> List[Duree]:
+    """Durées de composantes déjà vérifiées, partagées entre valeurs égales."""
+    internees = Duree._internees
+    return [
+        internees.get(tuple(ligne)) or Duree._construit(*ligne, total)
+        for ligne, total in zip(composantes.tolist(), totaux.tolist())
+    ]
+
+
+def _encode_durees(durees: List[Duree], nom: str) -> Dict[str, np.ndarray]:
+    """Durées en secondes, et composantes de celles qui ne se décomposent pas canoniquement."""
+    composantes = _composantes(durees)
+    totaux = composantes @ _FACTEURS
+    exceptions = np.flatnonzero((composantes != _decompose(totaux)).any(axis=1))
+    return {
+        nom: totaux,
+        f"{nom}_exc": exceptions.astype(np.int64),
+        f"{nom}_comp": composantes[exceptions],
+    }
+
+
+def _decode_durees(tableaux: Dict[str, np.ndarray], nom: str) -> List[Duree]:
+    """Reconstruit les durées d'une colonne."""
+    totaux = tableaux[nom]
+    if (totaux < 0).any():
+        raise ValueError("Les durées doivent être positives.")
+    composantes = _decompose(totaux)
+    exceptions = tableaux[f"{nom}_exc"]
+    if len(exceptions):
+        composantes[exceptions] = tableaux[f"{nom}_comp"]
+        if (composantes < 0).any() or (composantes @ _FACTEURS != totaux).any():
+            raise ValueError("Les composantes d'une durée ne correspondent pas à son total.")
+    return _construit_durees(composantes, totaux)
+
+
+def _encode_dates(dates: List[Date], nom: str) -> Dict[str, np.ndarray]:
+    """Dates en secondes depuis le 1er janvier 1970."""
+    import datetime
+
+    return {
+        nom: np.asarray(
+            [
+                (
+                    datetime.date(date.annees, date.mois, date.jours).toordinal()
+                    - _ORDINAL_EPOQUE
+                )
+                * 86400
+                + date.heures * 3600
+                + date.minutes * 60
+                + date.secondes
+                for date in dates
+            ],
+            dtype=np.int64,
+        )
+    }
+
+
+def _decode_dates(tableaux: Dict[str, np.ndarray], nom: str) -> List[Date]:
+    """Reconstruit les dates d'une colonne."""
+    jours, secondes = np.divmod(tableaux[nom], 86400)
+    calendrier = jours.astype("datetime64[D]")
+    annees = calendrier.astype("datetime64[Y]")
+    mois = calendrier.astype("datetime64[M]")
+    colonnes = [
+        (calendrier - mois).astype(np.int64) + 1,
+        (mois - annees).astype(np.int64) + 1,
+        annees.astype(np.int64) + 1970,
+        secondes // 3600,
+        secondes // 60 % 60,
+        secondes % 60,
+    ]
+    if (colonnes[2] < 1).any() or (colonnes[2] > 9999).any():
+        raise ValueError("Une date est hors de l'intervalle des années 1 à 9999.")
+    return [Date._construit(*ligne) for ligne in zip(*(colonne.tolist() for colonne in colonnes))]
+
+
+def _encode_taches(taches: List[Tache]) -> Dict[str, np.ndarray]:
+    """Colonnes des tâches : noms, correspondances, durées et prérequis au format CSR."""
+    indices = {tache.nom: i for i, tache in enumerate(taches)}
+    if len(indices) >= 2**31:
+        raise ValueError("Trop de tâches pour le format binaire.")
+    prerequis = [prerequis for tache in taches for prerequis in tache.prerequis]
+    try:
+        sources = [indices[prerequis.nom] for prerequis in prerequis]
+    except KeyError as erreur:
+        raise ValueError(f"{erreur.args[0]} n'est pas une tâche existante.")
+    indptr = np.zeros(len(taches) + 1, dtype=np.int64)
+    np.cumsum([len(tache.prerequis) for tache in taches], out=indptr[1:])
+    absentes = [i for i, tache in enumerate(taches) if tache.correspondance is None]
+    return {
+        **_encode_chaines([tache.nom for tache in taches], "noms"),
+        **_encode_chaines(
+            [tache.correspondance or "" for tache in taches], "corresp"
+        ),
+        "corresp_absentes": np.asarray(absentes, dtype=np.int64),
+        **_encode_durees([tache.duree for tache in taches], "durees"),
+        "prerequis_indptr": indptr,
+        "prerequis": np.asarray(sources, dtype=np.int32),
+        "types": np.asarray(
+            [_TYPES.index(prerequis.typ) for prerequis in prerequis], dtype=np.uint8
+        ),
+        **_encode_durees([prerequis.latence for prerequis in prerequis], "latences"),
+    }
+
+
+@contextmanager
+def _sans_ramasse_miettes():
+    """Suspend le ramasse-miettes, inutile pendant la création d'objets sans cycle."""
+    actif = gc.isenabled()
+    gc.disable()
+    try:
+        yield
+    finally:
+        if actif:
+            gc.enable()
+
+
+def _sans_controle(classe: type, **champs: Any) -> Any:
+    """Instancie une dataclass sans appeler __post_init__, ses champs ayant été vérifiés en bloc."""
+    resultat = object.__new__(classe)
+    for nom, valeur in champs.items():
+        object.__setattr__(resultat, nom, valeur)
+    return resultat
+
+
+def _decode_taches(tableaux: Dict[str, np.ndarray]) -> List[Tache]:
+    """Reconstruit les tâches après avoir vérifié leurs colonnes."""
+    noms = _decode_chaines(tableaux, "noms")
+    correspondances: List[Optional[str]] = _decode_chaines(tableaux, "corresp")
+    for i in tableaux["corresp_absentes"].tolist():
+        correspondances[i] = None
+    durees = _decode_durees(tableaux, "durees")
+    latences = _decode_durees(tableaux, "latences")
+    indptr = tableaux["prerequis_indptr"]
+    sources = tableaux["prerequis"]
+    types = tableaux["types"]
+    nb_taches = len(noms)
+    if len(set(noms)) != nb_taches:
+        raise ValueError("Un nom de tâche est présent plusieurs fois.")
+    if len(indptr) != nb_taches + 1 or indptr[0] != 0 or (np.diff(indptr) < 0).any():
+        raise ValueError("Les décalages des prérequis sont invalides.")
+    if not len(sources) == len(types) == len(latences) == indptr[-1]:
+        raise ValueError("Les tableaux des prérequis n'ont pas la même longueur.")
+    if len(sources) and (sources.min() < 0 or sources.max() >= nb_taches):
+        raise ValueError("Un prérequis désigne une tâche inexistante.")
+    if (types > 1).any():
+        raise ValueError("Le type d'un prérequis doit être 'fin' ou 'debut'.")
+    if any(duree._secondes == 0 for duree in durees):
+        raise ValueError("Veuillez indiquer une durée non nul")
+    destinations = np.repeat(np.arange(nb_taches), np.diff(indptr))
+    if (sources == destinations).any():
+        raise ValueError(
+            "Vous ne pouvez pas associé un pré-requis à un nom de tâche, qui à le même nom."
+        )
+    paires = destinations.astype(np.int64) * nb_taches + sources
+    if len(np.unique(paires)) != len(paires):
+        raise ValueError("Les prérequis doivent comporter des noms de tâches différents.")
+    noms_prerequis = [noms[source] for source in sources.tolist()]
+    typs = [_TYPES[typ] for typ in types.tolist()]
+    bornes = indptr.tolist()
+    return [
+        _sans_controle(
+            Tache,
+            nom=noms[i],
+            duree=durees[i],
+            prerequis=[
+                _sans_controle(
+                    Prerequis,
+                    nom=noms_prerequis[k],
+                    typ=typs[k],
+                    latence=latences[k],
+                )
+                for k in range(bornes[i], bornes[i + 1])
+            ],
+            correspondance=correspondances[i],
+            estimation=None,
+        )
+        for i in range(nb_taches)
+    ]
+
+
+def vers_binaire(objet: Objet) -> bytes:
+    """Encode un Probleme, un EDT ou un Calendrier."""
+    if isinstance(objet, Probleme):
+        return _ecrit(1, _encode_taches(list(objet.taches)))
+    if isinstance(objet, EDT):
+        activites = list(objet.activites)
+        return _ecrit(
+            2,
+            {
+                **_encode_taches([activite.tache for activite in activites]),
+                **_encode_durees([activite.debut for activite in activites], "debuts"),
+                **_encode_durees([activite.fin for activite in activites], "fins"),
+            },
+        )
+    if isinstance(objet, Calendrier):
+        datations = list(objet.dates)
+        return _ecrit(
+            3,
+            {
+                **_encode_taches([datation.tache for datation in datations]),
+                **_encode_dates([datation.date_debut for datation in datations], "debuts"),
+                **_encode_dates([datation.date_fin for datation in datations], "fins"),
+            },
+        )
+    raise ValueError(f"Impossible d'encoder un objet {type(objet).__name__}.")
+
+
+def depuis_binaire(donnees: Any, classe: Optional[type] = None) -> Objet:
+    """Décode des données écrites par vers_binaire.
+
+    [optionnel] classe
+    Classe attendue parmi Probleme, EDT et Calendrier.
+    """
+    nature, tableaux = lit_tableaux(donnees)
+    if classe is not None and _NATURES[_CLASSES[classe]] != nature:
+        raise ValueError(f"Les données contiennent un objet {nature}, pas {classe.__name__}.")
+    try:
+        with _sans_ramasse_miettes():
+            return _decode(nature, tableaux)
+    except KeyError as erreur:
+        raise ValueError(f"Le tableau {erreur.args[0]} est absent des données.")
+
+
+def _decode(nature: str, tableaux: Dict[str, np.ndarray]) -> Objet:
+    """Reconstruit l'objet d'une nature donnée à partir de ses tableaux."""
+    taches = _decode_taches(tableaux)
+    if nature == "probleme":
+        resultat = Probleme.__new__(Probleme)
+        resultat._taches = {tache.nom: tache for tache in taches}
+        resultat._correspondances = {tache.nom: tache.correspondance for tache in taches}
+        resultat._registre = Registre(resultat._taches)
+        return resultat
+    if len(tableaux["debuts"]) != len(taches) or len(tableaux["fins"]) != len(taches):
+        raise ValueError("Il doit y avoir un début et une fin par tâche.")
+    if (tableaux["fins"] < tableaux["debuts"]).any():
+        raise ValueError("Une fin précède son début.")
+    if nature == "edt":
+        if (tableaux["fins"] - tableaux["debuts"] < tableaux["durees"]).any():
+            raise ValueError("Une activité ne respecte pas la durée de sa tâche.")
+        debuts = _decode_durees(tableaux, "debuts")
+        fins = _decode_durees(tableaux, "fins")
+        resultat = EDT(activites=[])
+        for tache, debut, fin in zip(taches, debuts, fins):
+            resultat.ajoute(_sans_controle(Activite, tache=tache, debut=debut, fin=fin))
+        return resultat
+    debuts = _decode_dates(tableaux, "debuts")
+    fins = _decode_dates(tableaux, "fins")
+    resultat = Calendrier(dates=[])
+    for tache, debut, fin in zip(taches, debuts, fins):
+        resultat.ajoute(
+            _sans_controle(Datation, tache=tache, date_debut=debut, date_fin=fin)
+        )
+    return resultat
+
+
+def sauvegarde(objet: Objet, chemin: str):
+    """Écrit un Probleme, un EDT ou un Calendrier dans un fichier binaire."""
+    with open(chemin, "wb") as fichier:
+        fichier.write(vers_binaire(objet))
+
+
+def charge(chemin: str) -> Objet:
+    """Lit un fichier binaire en le projetant en mémoire.
+
+    En cas d'erreur, la trace de l'exception garde des vues sur la projection :
+    celle-ci n'est alors libérée qu'avec la trace, et l'erreur remonte telle quelle."""
+    with open(chemin, "rb") as fichier:
+        projection = mmap.mmap(fichier.fileno(), 0, access=mmap.ACCESS_READ)
+    tampon = memoryview(projection)
+    resultat = depuis_binaire(tampon)
+    tampon.release()
+    projection.close()
+    return resultat
+
+
+def reseau_binaire(donnees: Any) -> "Reseau":
+    """Compile directement un Reseau à partir des tableaux, sans créer d'objet Tache."""
+    from .reseau import Reseau
+
+    _, tableaux = lit_tableaux(donnees)
+    try:
+        return Reseau(
+            _decode_chaines(tableaux, "noms"),
+            tableaux["durees"],
+            tableaux["prerequis_indptr"],
+            tableaux["prerequis"],
+            tableaux["types"],
+            tableaux["latences"],
+        )
+    except KeyError as erreur:
+        raise ValueError(f"Le tableau {erreur.args[0]} est absent des données.")
@@ -0,0 +1,467 @@
+#! /usr/bin/env python
+# -*- coding: utf-8 -*-
+"""Description.
+
+Contient les classes CacheSolutions et CacheDisque, mémoïsation de resous_EDT et resous_Calendrier.
+
+La clé d'une solution est une empreinte de la structure du problème (tâches, durées,
+prérequis, correspondances) et des options de résolution : deux problèmes construits
+séparément mais identiques partagent la même solution.
+
+Les solutions sont conservées sérialisées au format du module binaire : chaque succès renvoie
+une copie neuve, qu'un appelant peut modifier sans altérer le cache. La taille sérialisée sert
+aussi à borner la mémoire occupée. Ce format ne contient que des tableaux et des chaînes :
+relire un fichier ne peut pas exécuter de code, contrairement à pickle. Les estimations
+des tâches (analyse de risque) ne font pas partie des solutions conservées. Les solutions les moins récemment utilisées sont évincées
+dès que le nombre de solutions ou le nombre d'octets dépasse sa limite.
+
+CacheDisque conserve les solutions dans un répertoire partagé par plusieurs processus,
+un fichier compressé par empreinte, créé accessible à son seul propriétaire.
+Les écritures passent par un fichier temporaire
+renommé atomiquement, si bien qu'un lecteur voit une solution entière ou aucune.
+La date de modification d'un fichier est celle de son dernier usage ; l'éviction,
+sous verrou de fichier, supprime les plus anciens.
+"""
+import hashlib
+import json
+import os
+import tempfile
+import threading
+import zlib
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Any, Callable, List, Optional, Union
+from .probleme import Probleme, Duree
+from .calendrier import Date, Calendrier
+from .edt import EDT
+from .algorithme import resous_EDT, resous_Calendrier, _convertit_en_date
+
+try:
+    import fcntl
+except ImportError:
+    fcntl = None
+
+## Signature des fichiers de CacheDisque, suivie d'une solution binaire compressée par zlib.
+## Les fichiers d'une autre version sont traités comme corrompus et remplacés.
+_SIGNATURE = b"ORDOSOL2"
+_EXTENSION = ".solution"
+
+
+def _duree(duree: Duree) -> List[int]:
+    """Composantes d'une durée, dans un ordre fixe."""
+    return [
+        duree.secondes,
+        duree.minutes,
+        duree.heures,
+        duree.jours,
+        duree.semaines,
+        duree.mois,
+        duree.annees,
+    ]
+
+
+def _date(date: Union[Date, str]) -> List[int]:
+    """Composantes d'une date, dans un ordre fixe."""
+    if type(date) == str:
+        date = _convertit_en_date(date)
+    return [date.annees, date.mois, date.jours, date.heures, date.minutes, date.secondes]
+
+
+def empreinte(probleme: Probleme, solveur: str, **options: Any) -> str:
+    """Empreinte SHA-256 d'un problème et des options de résolution.
+
+    L'ordre des tâches et des prérequis fait partie de l'empreinte, comme dans les solutions.
+    Les dates sont normalisées : "23/12/1998" et Date(jours=23, mois=12, annees=1998) sont équivalentes.
+    """
+    structure = {
+        "solveur": solveur,
+        "options": {
+            nom: _date(valeur) if nom == "date_commencement" else valeur
+            for nom, valeur in sorted(options.items())
+        },
+        "taches": [
+            [
+                tache.nom,
+                _duree(tache.duree),
+                [
+                    [prerequis.nom, prerequis.typ, _duree(prerequis.latence)]
+                    for prerequis in tache.prerequis
+                ],
+                tache.correspondance,
+            ]
+            for tache in probleme.taches
+        ],
+    }
+    message = json.dumps(structure, ensure_ascii=False, separators=(",", ":"))
+    return hashlib.sha256(message.encode("utf-8")).hexdigest()
+
+
+@dataclass
+class StatistiquesCache:
+    """Compteurs d'un cache de solutions."""
+
+    succes: int = 0
+    echecs: int = 0
+    evictions: int = 0
+    solutions: int = 0
+    octets: int = 0
+
+    @property
+    def taux_succes(self) -> float:
+        """Part des demandes servies par le cache."""
+        total = self.succes + self.echecs
+        return self.succes / total if total else 0.0
+
+
+class _Cache(ABC):
+    """Mémoïsation commune aux caches, qui fournissent _cherche et _conserve."""
+
+    @abstractmethod
+    def _cherche(self, cle: str) -> Optional[bytes]:
+        """Solution sérialisée d'une empreinte, None si elle est absente."""
+
+    @abstractmethod
+    def _conserve(self, cle: str, donnees: bytes):
+        """Conserve une solution sérialisée."""
+
+    def _resous(self, cle: str, solveur: Callable[[], Any]) -> Any:
+        """Renvoie une copie de la solution conservée, ou la calcule et la conserve.
+
+        Une solution conservée illisible est recalculée et remplacée."""
+        from .binaire import vers_binaire, depuis_binaire
+
+        donnees = self._cherche(cle)
+        if donnees is not None:
+            try:
+                return depuis_binaire(donnees)
+            except ValueError:
+                pass
+        solution = solveur()
+        self._conserve(cle, vers_binaire(solution))
+        return solution
+
+    def resous_EDT(
+        self,
+        probleme: Probleme,
+        duree_max_journalier: Optional[Union[float, int]] = None,
+        nb_jours_repos: Optional[Union[float, int]] = None,
+    ) -> EDT:
+        """resous_EDT, mémoïsé."""
+        cle = empreinte(
+            probleme,
+            "resous_EDT",
+            duree_max_journalier=duree_max_journalier,
+            nb_jours_repos=nb_jours_repos,
+        )
+        return self._resous(
+            cle, lambda: resous_EDT(probleme, duree_max_journalier, nb_jours_repos)
+        )
+
+    def resous_Calendrier(
+        self,
+        probleme: Probleme,
+        date_commencement: Union[Date, str],
+        heures_execution: Optional[str] = None,
+        jours_repos: Optional[str] = None,
+    ) -> Calendrier:
+        """resous_Calendrier, mémoïsé."""
+        cle = empreinte(
+            probleme,
+            "resous_Calendrier",
+            date_commencement=date_commencement,
+            heures_execution=heures_execution,
+            jours_repos=jours_repos,
+        )
+        return self._resous(
+            cle,
+            lambda: resous_Calendrier(
+                probleme, date_commencement, heures_execution, jours_repos
+            ),
+        )
+
+
+class CacheSolutions(_Cache):
+    """Cache LRU des solutions, borné en nombre de solutions et en octets.
+
+        >>> cache = CacheSolutions(taille_max=256, octets_max=32 * 1024 * 1024)
+
+        >>> edt = cache.resous_EDT(mon_probleme)
+
+        >>> edt = cache.resous_EDT(Probleme.par_str(str_mon_probleme))
+
+        >>> cache.statistiques
+    StatistiquesCache(succes=1, echecs=1, evictions=0, solutions=1, octets=1337)
+
+    Le cache peut être partagé entre plusieurs fils d'exécution.
+    """
+
+    def __init__(
+        self,
+        taille_max: int = 128,
+        octets_max: Optional[int] = 64 * 1024 * 1024,
+        disque: Optional["CacheDisque"] = None,
+    ):
+        """Crée un cache vide.
+
+        [optionnel] taille_max
+        Nombre maximal de solutions conservées.
+
+        [optionnel] octets_max
+        Taille maximale, en octets sérialisés, des solutions conservées. None pour ne pas la borner.
+
+        [optionnel] disque
+        Un CacheDisque consulté quand une solution n'est pas en mémoire, et qui reçoit les nouvelles.
+        """
+        if taille_max < 1:
+            raise ValueError("Le cache doit pouvoir contenir au moins une solution.")
+        if octets_max is not None and octets_max < 1:
+            raise ValueError("La taille maximale du cache doit être positive.")
+        self.taille_max = taille_max
+        self.octets_max = octets_max
+        self.disque = disque
+        self._solutions: "OrderedDict[str, bytes]" = OrderedDict()
+        self._verrou = threading.Lock()
+        self._statistiques = StatistiquesCache()
+
+    def __len__(self) -> int:
+        """Nombre de solutions conservées."""
+        return len(self._solutions)
+
+    def __contains__(self, cle: str) -> bool:
+        """Indique si une empreinte a une solution conservée."""
+        return cle in self._solutions
+
+    def __repr__(self) -> str:
+        """Représentation."""
+        return (
+            f"CacheSolutions(taille_max={self.taille_max}, octets_max={self.octets_max}, "
+            f"solutions={len(self)})"
+        )
+
+    @property
+    def statistiques(self) -> StatistiquesCache:
+        """Copie des compteurs du cache."""
+        with self._verrou:
+            return StatistiquesCache(**vars(self._statistiques))
+
+    def vide(self):
+        """Retire toutes les solutions, sans remettre les compteurs à zéro."""
+        with self._verrou:
+            self._solutions.clear()
+            self._statistiques.solutions = 0
+            self._statistiques.octets = 0
+
+    def _cherche(self, cle: str) -> Optional[bytes]:
+        """Solution sérialisée d'une empreinte, marquée comme la plus récente."""
+        with self._verrou:
+            donnees = self._solutions.get(cle)
+            if donnees is not None:
+                self._solutions.move_to_end(cle)
+                self._statistiques.succes += 1
+                return donnees
+            self._statistiques.echecs += 1
+        if self.disque is not None:
+            donnees = self.disque._cherche(cle)
+            if donnees is not None:
+                self._garde(cle, donnees)
+        return donnees
+
+    def _conserve(self, cle: str, donnees: bytes):
+        """Conserve une solution sérialisée, en mémoire et sur disque."""
+        self._garde(cle, donnees)
+        if self.disque is not None:
+            self.disque._conserve(cle, donnees)
+
+    def _garde(self, cle: str, donnees: bytes):
+        """Garde une solution sérialisée en mémoire puis évince les plus anciennes au besoin."""
+        if self.octets_max is not None and len(donnees) > self.octets_max:
+            return
+        statistiques = self._statistiques
+        with self._verrou:
+            if cle in self._solutions:
+                statistiques.octets -= len(self._solutions.pop(cle))
+            self._solutions[cle] = donnees
+            statistiques.octets += len(donnees)
+            while len(self._solutions) > self.taille_max or (
+                self.octets_max is not None and statistiques.octets > self.octets_max
+            ):
+                _, evincee = self._solutions.popitem(last=False)
+                statistiques.octets -= len(evincee)
+                statistiques.evictions += 1
+            statistiques.solutions = len(self._solutions)
+
+
+class CacheDisque(_Cache):
+    """Cache des solutions dans un répertoire, partagé par plusieurs processus.
+
+        >>> disque = CacheDisque("/var/cache/ordonnancement", octets_max=512 * 1024 * 1024)
+
+        >>> edt = disque.resous_EDT(mon_probleme)
+
+        >>> cache = CacheSolutions(disque=disque)
+
+    Les solutions sont écrites compressées. Le répertoire est créé au besoin, en mode 0700.
+    Quiconque peut écrire dans le répertoire choisit les solutions servies : il ne doit être
+    accessible qu'aux processus de confiance.
+    Le verrou d'éviction utilise fcntl ; sans lui (Windows), l'éviction n'est pas verrouillée,
+    mais les écritures restent atomiques.
+    """
+
+    def __init__(
+        self,
+        repertoire: str,
+        octets_max: Optional[int] = 256 * 1024 * 1024,
+        niveau_compression: int = 6,
+    ):
+        """Ouvre ou crée le répertoire du cache.
+
+        [optionnel] octets_max
+        Taille maximale, en octets sur disque, des solutions conservées. None pour ne pas la borner.
+
+        [optionnel] niveau_compression
+        Niveau de compression zlib, de 0 à 9.
+        """
+        if octets_max is not None and octets_max < 1:
+            raise ValueError("La taille maximale du cache doit être positive.")
+        if not 0 <= niveau_compression <= 9:
+            raise ValueError("Le niveau de compression doit être compris entre 0 et 9.")
+        self.repertoire = repertoire
+        self.octets_max = octets_max
+        self.niveau_compression = niveau_compression
+        os.makedirs(repertoire, mode=0o700, exist_ok=True)
+        self._statistiques = StatistiquesCache()
+
+    def __repr__(self) -> str:
+        """Représentation."""
+        return f"CacheDisque(repertoire={self.repertoire!r}, octets_max={self.octets_max})"
+
+    def __len__(self) -> int:
+        """Nombre de solutions conservées."""
+        return len(self._fichiers())
+
+    def __contains__(self, cle: str) -> bool:
+        """Indique si une empreinte a une solution conservée."""
+        return os.path.exists(self._chemin(cle))
+
+    def _chemin(self, cle: str) -> str:
+        """Fichier de la solution d'une empreinte."""
+        return os.path.join(self.repertoire, cle + _EXTENSION)
+
+    def _fichiers(self) -> List[os.DirEntry]:
+        """Fichiers de solutions présents dans le répertoire."""
+        with os.scandir(self.repertoire) as entrees:
+            return [entree for entree in entrees if entree.name.endswith(_EXTENSION)]
+
+    @property
+    def statistiques(self) -> StatistiquesCache:
+        """Compteurs de ce processus, et contenu actuel du répertoire."""
+        resultat = StatistiquesCache(**vars(self._statistiques))
+        for entree in self._fichiers():
+            try:
+                resultat.octets += entree.stat().st_size
+                resultat.solutions += 1
+            except FileNotFoundError:
+                pass
+        return resultat
+
+    def vide(self):
+        """Supprime toutes les solutions du répertoire."""
+        with self._verrou():
+            for entree in self._fichiers():
+                self._supprime(entree.path)
+
+    @staticmethod
+    def _supprime(chemin: str):
+        """Supprime un fichier, qu'un autre processus a pu supprimer avant."""
+        try:
+            os.remove(chemin)
+        except FileNotFoundError:
+            pass
+
+    def _verrou(self):
+        """Verrou exclusif entre processus sur le répertoire."""
+        return _VerrouFichier(os.path.join(self.repertoire, ".verrou"))
+
+    def _cherche(self, cle: str) -> Optional[bytes]:
+        """Lit une solution et rafraîchit sa date d'usage."""
+        chemin = self._chemin(cle)
+        try:
+            with open(chemin, "rb") as fichier:
+                contenu = fichier.read()
+            os.utime(chemin)
+        except FileNotFoundError:
+            self._statistiques.echecs += 1
+            return None
+        if not contenu.startswith(_SIGNATURE):
+            self._supprime(chemin)
+            self._statistiques.echecs += 1
+            return None
+        try:
+            donnees = zlib.decompress(contenu[len(_SIGNATURE) :])
+        except zlib.error:
+            self._supprime(chemin)
+            self._statistiques.echecs += 1
+            return None
+        self._statistiques.succes += 1
+        return donnees
+
+    def _conserve(self, cle: str, donnees: bytes):
+        """Écrit une solution atomiquement puis évince les plus anciennes au besoin."""
+        contenu = _SIGNATURE + zlib.compress(donnees, self.niveau_compression)
+        if self.octets_max is not None and len(contenu) > self.octets_max:
+            return
+        descripteur, temporaire = tempfile.mkstemp(
+            dir=self.repertoire, prefix=".", suffix=".tmp"
+        )
+        try:
+            with os.fdopen(descripteur, "wb") as fichier:
+                fichier.write(contenu)
+                fichier.flush()
+                os.fsync(fichier.fileno())
+            os.replace(temporaire, self._chemin(cle))
+        except BaseException:
+            self._supprime(temporaire)
+            raise
+        if self.octets_max is not None:
+            self._evince()
+
+    def _evince(self):
+        """Supprime les solutions les moins récemment utilisées jusqu'à passer sous octets_max."""
+        with self._verrou():
+            fichiers = list()
+            for entree in self._fichiers():
+                try:
+                    etat = entree.stat()
+                except FileNotFoundError:
+                    continue
+                fichiers.append((etat.st_mtime_ns, etat.st_size, entree.path))
+            total = sum(taille for _, taille, _ in fichiers)
+            for _, taille, chemin in sorted(fichiers):
+                if total <= self.octets_max:
+                    break
+                self._supprime(chemin)
+                total -= taille
+                self._statistiques.evictions += 1
+
+
+class _VerrouFichier:
+    """Verrou exclusif fcntl sur un fichier, utilisé comme gestionnaire de contexte."""
+
+    def __init__(self, chemin: str):
+        """Mémorise le chemin du fichier de verrou."""
+        self.chemin = chemin
+        self._fichier = None
+
+    def __enter__(self):
+        """Attend puis prend le verrou."""
+        self._fichier = open(self.chemin, "a")
+        if fcntl is not None:
+            fcntl.flock(self._fichier.fileno(), fcntl.LOCK_EX)
+        return self
+
+    def __exit__(self, *exception):
+        """Relâche le verrou."""
+        if fcntl is not None:
+            fcntl.flock(self._fichier.fileno(), fcntl.LOCK_UN)
+        self._fichier.close()
@@ -4,12 +4,25 @@
 
 Contient les classes Date, Datation et Calendrier.
 """
-import matplotlib.pyplot as plt
-from typing import Any, List, Union, Generator, Dict, Optional
+from typing import Any, List, Union, Generator, Dict, Optional, Tuple, TYPE_CHECKING
 from dataclasses import dataclass
-from rich.table import Table
-from .probleme import Nom, Tache, Prerequis, Duree
-from pendulum import datetime
+import functools
+from .probleme import (
+    Nom,
+    Tache,
+    Prerequis,
+    Duree,
+    _TAILLE_CACHE_ANALYSES,
+    _conversions_comptees,
+)
+
+if TYPE_CHECKING:
+    import matplotlib.pyplot as plt
+    from rich.table import Table
+    from pendulum import DateTime
+
+## Temporalités d'une date, accessibles par Date.__getitem__.
+_TEMPORALITES_DATE = ("jours", "mois", "annees", "heures", "minutes", "secondes")
 
 
 @dataclass
@@ -33,8 +46,10 @@ class Date:
         >>> date_bis
     Date(jours=23, mois=12, annees=1998, heures=12, minutes=0, secondes=0)"""
 
+    __slots__ = _TEMPORALITES_DATE
+
     def __init__(self, jours, mois, annees, heures=0, minutes=0, secondes=0):
-        """Construction de la classe Date et stockage sous forme de dict des durées."""
+        """Construction de la classe Date."""
         ##Creation de l'objet
         self.jours = jours
         self.mois = mois
@@ -43,21 +58,24 @@ class Date:
         self.minutes = minutes
         self.secondes = secondes
 
-        ##Dict sur les temps
-        self._temps = dict()
-        self._temps["jours"] = self.jours
-        self._temps["mois"] = self.mois
-        self._temps["annees"] = self.annees
-        self._temps["heures"] = self.heures
-        self._temps["minutes"] = self.minutes
-        self._temps["secondes"] = self.secondes
-
         self._est_valide()
 
+    @classmethod
+    def _construit(cls, jours, mois, annees, heures, minutes, secondes) -> "Date":
+        """Construit une date déjà vérifiée sans refaire les contrôles."""
+        date = object.__new__(cls)
+        date.jours = jours
+        date.mois = mois
+        date.annees = annees
+        date.heures = heures
+        date.minutes = minutes
+        date.secondes = secondes
+        return date
+
     def _est_valide(self):
         """Détecte la validité de la date."""
-        for clefs in self._temps.keys():
-            if self._temps[clefs] < 0:
+        for temps in _TEMPORALITES_DATE:
+            if getattr(self, temps) < 0:
                 raise ValueError("Vous devez indiquer une date valide.")
         self._erreur()
 
@@ -86,8 +104,14 @@ class Date:
             else:
                 raise VE
 
-    def _convertit_datetime(self) -> datetime:
+    def _convertit_datetime(self) -> "DateTime":
         """Renvoi le temps sous forme d'un objet datetime"""
+        from pendulum import datetime
+
+        compteur = _conversions_comptees.get()
+        if compteur is not None:
+            compteur["Date vers DateTime"] += 1
+
         return datetime(
             day=self.jours,
             second=self.secondes,
@@ -98,11 +122,14 @@ class Date:
         )
 
     @classmethod
-    def _convertit_date(cls, datetime: datetime) -> "Date":
+    def _convertit_date(cls, datetime: "DateTime") -> "Date":
         """Convertit un objet datetime en objet Date"""
         return cls._convertion(datetime)
 
-    def _convertion(datetime: datetime) -> "Date":
+    def _convertion(datetime: "DateTime") -> "Date":
+        compteur = _conversions_comptees.get()
+        if compteur is not None:
+            compteur["DateTime vers Date"] += 1
         return Date(
             secondes=datetime.second,
             jours=datetime.day,
@@ -238,7 +265,9 @@ class Date:
 
     def __getitem__(self, nom: Nom) -> int:
         """Accès aux valeurs des temporalités."""
-        return self._temps[nom]
+        if nom not in _TEMPORALITES_DATE:
+            raise KeyError(nom)
+        return getattr(self, nom)
 
     @classmethod
     def par_str(cls, message: str) -> "Date":
@@ -253,38 +282,11 @@ class Date:
         [optionnel] HH : Heures
         [optionnel] MM : Minutes
         [optionnel] SS : Secondes
+
+        Les analyses des derniers textes lus sont conservées ; chaque appel renvoie
+        cependant une nouvelle date, les dates étant modifiables.
         """
-        if len(message.split("/")) == 4:
-            jour, mois, annees, heure = message.split("/")
-            if len(heure.split(":")) == 3:
-                heures, minutes, secondes = heure.split(":")
-            elif len(heure.split(":")) == 2:
-                heures, minutes = heure.split(":")
-                secondes = "0"
-            elif len(heure.split(":")) == 1:
-                heures = heure.split(":")
-                minutes, secondes = "0", "0"
-            else:
-                raise ValueError("Vous avez mal rempli l'heure de la date")
-        elif len(message.split("/")) == 3:
-            jour, mois, annees = message.split("/")
-            heures, minutes, secondes = "0", "0", "0"
-        else:
-            raise ValueError("Vous avez mal rempli les valeurs de la date.")
-        jours_valide = cls._encode(jour)
-        mois_valide = cls._encode(mois)
-        annees_valide = cls._encode(annees)
-        heures_valide = cls._encode(heures)
-        minutes_valide = cls._encode(minutes)
-        secondes_valide = cls._encode(secondes)
-        return Date(
-            jours=jours_valide,
-            mois=mois_valide,
-            annees=annees_valide,
-            heures=heures_valide,
-            minutes=minutes_valide,
-            secondes=secondes_valide,
-        )
+        return cls._construit(*_analyse_date(message))
 
     @staticmethod
     def _encode(valeur) -> "Date":
@@ -296,7 +298,40 @@ class Date:
         return valeur_valide
 
 
-@dataclass
+@functools.lru_cache(maxsize=_TAILLE_CACHE_ANALYSES)
+def _analyse_date(message: str) -> Tuple[int, int, int, int, int, int]:
+    """Valeurs vérifiées d'un texte de date, dans l'ordre de Date._construit."""
+    champs = message.split("/")
+    if len(champs) == 4:
+        jour, mois, annees, heure = champs
+        horaire = heure.split(":")
+        if len(horaire) == 3:
+            heures, minutes, secondes = horaire
+        elif len(horaire) == 2:
+            heures, minutes = horaire
+            secondes = "0"
+        elif len(horaire) == 1:
+            (heures,) = horaire
+            minutes, secondes = "0", "0"
+        else:
+            raise ValueError("Vous avez mal rempli l'heure de la date")
+    elif len(champs) == 3:
+        jour, mois, annees = champs
+        heures, minutes, secondes = "0", "0", "0"
+    else:
+        raise ValueError("Vous avez mal rempli les valeurs de la date.")
+    date = Date(
+        jours=Date._encode(jour),
+        mois=Date._encode(mois),
+        annees=Date._encode(annees),
+        heures=Date._encode(heures),
+        minutes=Date._encode(minutes),
+        secondes=Date._encode(secondes),
+    )
+    return (date.jours, date.mois, date.annees, date.heures, date.minutes, date.secondes)
+
+
+@dataclass(slots=True)
 class Datation:
     tache: Tache
     date_debut: Date
@@ -379,6 +414,7 @@ class Calendrier:
     def __init__(self, dates: List[Datation]):
         """Instancie à partir de la liste de date."""
         self._dates: List[Datation] = []
+        self._index: Dict[Nom, Datation] = dict()
         for date in dates:
             self.ajoute(date)
 
@@ -399,31 +435,46 @@ class Calendrier:
 
     def __getitem__(self, nom: Nom) -> Datation:
         """Accède aux date par leur nom de tâche."""
-        for date in self._dates:
-            if date.tache.nom == nom:
-                return date
-
-        raise ValueError("Pas d'activité avec ce nom de tâche.")
+        try:
+            return self._index[nom]
+        except KeyError:
+            raise ValueError("Pas d'activité avec ce nom de tâche.")
 
     def ajoute(self, date: Date) -> "Calendrier":
         """Rajoute une nouvelle activité."""
-        if any(date.tache.nom == autre.tache.nom for autre in self.dates):
+        if date.tache.nom in self._index:
             raise ValueError(
                 f"La tache {date.tache.nom} est déjà présente "
                 "dans l'emploi du temps."
             )
+        self._index[date.tache.nom] = date
         self._dates.append(date)
 
+    def vers_binaire(self) -> bytes:
+        """Encode le calendrier au format binaire du module binaire."""
+        from .binaire import vers_binaire
+
+        return vers_binaire(self)
+
+    @classmethod
+    def par_binaire(cls, donnees: Any) -> "Calendrier":
+        """Constructeur alternatif à partir de données écrites par vers_binaire."""
+        from .binaire import depuis_binaire
+
+        return depuis_binaire(donnees, cls)
+
     def est_valide(self) -> bool:
         """Vérifie si le calendrier respecte les contraintes."""
-        for datation in self.dates:
+        for datation in self._dates:
             for prerequis in datation.tache.prerequis:
                 if datation.date_debut < self[prerequis.nom].date_fin:
                     return False
         return True
 
-    def _genere_table(self, entier: bool) -> Table:
+    def _genere_table(self, entier: bool) -> "Table":
         """Retourne une table rich."""
+        from rich.table import Table
+
         if entier:
             resultat = Table(title="Solution du problème : calendrier")
             resultat.add_column("Tâche")
@@ -463,8 +514,10 @@ class Calendrier:
 
         print(self._genere_table(entier=entier))
 
-    def genere_graphique(self) -> plt.Figure:
+    def genere_graphique(self) -> "plt.Figure":
         """Renvoie une figure matplotlib."""
+        import matplotlib.pyplot as plt
+
         figure, repere = plt.subplots()
         repere.set_ylabel("Tâches")
         repere.set_xlabel("Dates")
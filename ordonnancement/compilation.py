@@ -0,0 +1,340 @@
+#! /usr/bin/env python
+# -*- coding: utf-8 -*-
+"""Description.
+
+Contient la classe ProblemeCompile, pour résoudre plusieurs fois un même réseau de prérequis,
+et la classe SessionEDT, pour mettre à jour un emploi du temps après chaque modification.
+"""
+import dataclasses
+import heapq
+import numpy as np
+from typing import List, Mapping, Optional, Sequence, Set, Tuple, Union
+from .probleme import Nom, Probleme, Tache, Duree
+from .edt import Activite, EDT
+from .reseau import Reseau, TYPE_FIN
+from .algorithme import genere_graphe, _durees_effectives, _verifie_conditions_EDT
+
+Durees = Union[Mapping[Nom, Duree], Sequence[int], np.ndarray]
+Latences = Union[Mapping[Tuple[Nom, Nom], Duree], Sequence[int], np.ndarray]
+
+
+class ProblemeCompile:
+    """Problème dont le graphe, la vérification d'acyclicité et l'ordre topologique sont calculés une fois.
+
+    Seules les durées et les latences peuvent changer d'une résolution à l'autre.
+
+        >>> compile = ProblemeCompile(mon_probleme)
+
+        >>> compile.resous() == resous_EDT(mon_probleme)
+    True
+
+        >>> compile.resous(durees={"A": Duree(annees=1)})["B"].debut
+    Duree(annees=1, jours=2, heures=3)
+
+        >>> compile.resous(latences={("C", "D"): Duree()})["D"].debut
+    Duree(annees=3, semaines=2, jours=4, heures=8, minutes=23)
+
+    Les durées et latences peuvent aussi être données en secondes,
+    dans l'ordre de compile.noms et de compile.aretes.
+    """
+
+    def __init__(self, probleme: Probleme):
+        """Compile le problème."""
+        self.probleme = probleme
+        self.graphe = genere_graphe(probleme)
+        self.ordre: List[Nom] = self.graphe.ordre_topologique()
+        self.reseau = Reseau.par_probleme(probleme)
+        self._rangs = list(self.graphe.ordre)
+        self._aretes = list(self.reseau.aretes)
+        self._indices_aretes = {arete: i for i, arete in enumerate(self._aretes)}
+
+    def __repr__(self) -> str:
+        """Représentation."""
+        return f"ProblemeCompile(taches={len(self.reseau)}, prerequis={len(self._aretes)})"
+
+    @property
+    def noms(self) -> List[Nom]:
+        """Noms des tâches, dans l'ordre attendu pour un vecteur de durées."""
+        return self.reseau.noms
+
+    @property
+    def aretes(self) -> List[Tuple[Nom, Nom]]:
+        """Prérequis (prérequis, tâche), dans l'ordre attendu pour un vecteur de latences."""
+        return self._aretes
+
+    def _durees(self, durees: Optional[Durees]) -> np.ndarray:
+        """Convertit les durées demandées en vecteur de secondes."""
+        if durees is None:
+            return self.reseau.durees
+        if isinstance(durees, Mapping):
+            resultat = self.reseau.durees.copy()
+            for nom, duree in durees.items():
+                if nom not in self.reseau.indices:
+                    raise ValueError(f"{nom} n'est pas une tâche existante.")
+                resultat[self.reseau.indices[nom]] = duree._secondes
+            return resultat
+        resultat = np.asarray(durees, dtype=np.int64)
+        if resultat.shape != self.reseau.durees.shape:
+            raise ValueError(
+                f"Le vecteur de durées doit contenir {len(self.reseau)} valeurs."
+            )
+        if (resultat <= 0).any():
+            raise ValueError("Veuillez indiquer une durée non nul")
+        return resultat
+
+    def _latences(self, latences: Optional[Latences]) -> np.ndarray:
+        """Convertit les latences demandées en vecteur de secondes."""
+        if latences is None:
+            return self.reseau.latences
+        if isinstance(latences, Mapping):
+            resultat = self.reseau.latences.copy()
+            for arete, latence in latences.items():
+                if arete not in self._indices_aretes:
+                    raise ValueError(f"{arete[1]} n'a pas {arete[0]} comme prérequis.")
+                resultat[self._indices_aretes[arete]] = latence._secondes
+            return resultat
+        resultat = np.asarray(latences, dtype=np.int64)
+        if resultat.shape != self.reseau.latences.shape:
+            raise ValueError(
+                f"Le vecteur de latences doit contenir {len(self._aretes)} valeurs."
+            )
+        if (resultat < 0).any():
+            raise ValueError("Vous devez indiquer des durées positifs.")
+        return resultat
+
+    def _tache(self, indice: int, durees: np.ndarray, latences: np.ndarray) -> Tache:
+        """Renvoie la tâche d'origine, ou une copie si sa durée ou ses latences ont changé."""
+        tache = self.probleme[self.reseau.noms[indice]]
+        debut, fin = self.reseau.indptr[indice], self.reseau.indptr[indice + 1]
+        duree_change = durees[indice] != self.reseau.durees[indice]
+        latences_changent = (latences[debut:fin] != self.reseau.latences[debut:fin]).any()
+        if not duree_change and not latences_changent:
+            return tache
+        modifications = dict()
+        if duree_change:
+            modifications["duree"] = Duree._depuis_secondes(int(durees[indice]))
+        if latences_changent:
+            modifications["prerequis"] = [
+                dataclasses.replace(
+                    prerequis, latence=Duree._depuis_secondes(int(latence))
+                )
+                if latence != ancienne
+                else prerequis
+                for prerequis, latence, ancienne in zip(
+                    tache.prerequis,
+                    latences[debut:fin].tolist(),
+                    self.reseau.latences[debut:fin].tolist(),
+                )
+            ]
+        return dataclasses.replace(tache, **modifications)
+
+    def resous(
+        self,
+        durees: Optional[Durees] = None,
+        latences: Optional[Latences] = None,
+        duree_max_journalier: Optional[Union[float, int]] = None,
+        nb_jours_repos: Optional[Union[float, int]] = None,
+    ) -> EDT:
+        """Renvoie l'emploi du temps optimal pour ces durées et latences.
+
+        [optionnel] durees
+        Dictionnaire {nom: Duree} des durées modifiées, ou vecteur de secondes dans l'ordre de noms.
+
+        [optionnel] latences
+        Dictionnaire {(prérequis, tâche): Duree} des latences modifiées,
+        ou vecteur de secondes dans l'ordre de aretes.
+
+        [optionnel] duree_max_journalier et nb_jours_repos
+        Mêmes conditions que pour resous_EDT.
+        """
+        _verifie_conditions_EDT(duree_max_journalier, nb_jours_repos)
+        durees = self._durees(durees)
+        latences = self._latences(latences)
+        durees_effectives = _durees_effectives(durees, duree_max_journalier, nb_jours_repos)
+        debuts = self.reseau.passe_avant(durees=durees_effectives, latences=latences)
+        fins = debuts + durees_effectives
+        resultat = EDT(activites=[])
+        for indice in self._rangs:
+            resultat.ajoute(
+                Activite(
+                    tache=self._tache(indice, durees, latences),
+                    debut=Duree._depuis_secondes(int(debuts[indice])),
+                    fin=Duree._depuis_secondes(int(fins[indice])),
+                )
+            )
+        return resultat
+
+
+class SessionEDT:
+    """Emploi du temps mis à jour de façon incrémentale, une modification à la fois.
+
+    Après une modification de durée ou de latence, seuls les successeurs concernés sont recalculés,
+    dans l'ordre topologique, et la propagation s'arrête dès qu'un début ne change pas.
+
+        >>> session = SessionEDT(mon_probleme)
+
+        >>> session.modifie_duree("A", Duree(annees=1))
+    ['A', 'B', 'C', 'D', 'E']
+
+        >>> session.modifie_latence("A", "B", Duree(jours=1))
+    ['B', 'C', 'D', 'E']
+
+        >>> session["B"].debut
+    Duree(annees=1, jours=1)
+
+        >>> session.vers_EDT() == resous_EDT(probleme_modifie)
+    True
+    """
+
+    def __init__(
+        self,
+        probleme: Probleme,
+        duree_max_journalier: Optional[Union[float, int]] = None,
+        nb_jours_repos: Optional[Union[float, int]] = None,
+    ):
+        """Résout le problème une première fois.
+
+        [optionnel] duree_max_journalier et nb_jours_repos
+        Mêmes conditions que pour resous_EDT, appliquées aussi aux durées modifiées.
+        """
+        _verifie_conditions_EDT(duree_max_journalier, nb_jours_repos)
+        self.compile = ProblemeCompile(probleme)
+        self.duree_max_journalier = duree_max_journalier
+        self.nb_jours_repos = nb_jours_repos
+        reseau = self.compile.reseau
+        self._taches: List[Tache] = [probleme[nom] for nom in reseau.noms]
+        self._durees: List[int] = _durees_effectives(
+            reseau.durees, duree_max_journalier, nb_jours_repos
+        ).tolist()
+        self._latences: List[int] = reseau.latences.tolist()
+        self._sources: List[int] = reseau.sources.tolist()
+        self._est_fin: List[bool] = (reseau.types == TYPE_FIN).tolist()
+        self._indptr: List[int] = reseau.indptr.tolist()
+        self._successeurs: List[int] = reseau.destinations[
+            reseau.successeurs_aretes
+        ].tolist()
+        self._successeurs_indptr: List[int] = reseau.successeurs_indptr.tolist()
+        self._position: List[int] = reseau.position.tolist()
+        self._debuts: List[int] = reseau.passe_avant(
+            durees=np.asarray(self._durees, dtype=np.int64)
+        ).tolist()
+        self._activites: List[Optional[Activite]] = [None] * len(reseau)
+
+    def __repr__(self) -> str:
+        """Représentation."""
+        return f"SessionEDT(taches={len(self._taches)})"
+
+    def _duree_effective(self, duree: Duree) -> int:
+        """Durée d'exécution en secondes, selon les conditions de la session."""
+        return int(
+            _durees_effectives(
+                np.array([duree._secondes], dtype=np.int64),
+                self.duree_max_journalier,
+                self.nb_jours_repos,
+            )[0]
+        )
+
+    def _indice(self, nom: Nom) -> int:
+        """Indice d'une tâche."""
+        try:
+            return self.compile.reseau.indices[nom]
+        except KeyError:
+            raise ValueError(f"{nom} n'est pas une tâche existante.")
+
+    def _demarrage(self, indice: int) -> int:
+        """Début au plus tôt d'une tâche d'après les débuts actuels de ses prérequis."""
+        demarrage = 0
+        for k in range(self._indptr[indice], self._indptr[indice + 1]):
+            source = self._sources[k]
+            candidat = self._debuts[source] + self._latences[k]
+            if self._est_fin[k]:
+                candidat += self._durees[source]
+            if candidat > demarrage:
+                demarrage = candidat
+        return demarrage
+
+    def _propage(self, departs: List[int], changees: Set[int]) -> List[Nom]:
+        """Recalcule les débuts à partir des tâches departs, dans l'ordre topologique.
+
+        Renvoie les noms des tâches dont le début ou la fin a changé.
+        """
+        tas = [(self._position[indice], indice) for indice in set(departs)]
+        heapq.heapify(tas)
+        en_attente = set(departs)
+        while tas:
+            _, courant = heapq.heappop(tas)
+            en_attente.discard(courant)
+            debut = self._demarrage(courant)
+            if debut == self._debuts[courant]:
+                continue
+            self._debuts[courant] = debut
+            changees.add(courant)
+            self._pousse_successeurs(courant, tas, en_attente)
+        for indice in changees:
+            self._activites[indice] = None
+        return [
+            self.compile.reseau.noms[indice]
+            for indice in sorted(changees, key=self._position.__getitem__)
+        ]
+
+    def _pousse_successeurs(self, indice: int, tas: List[Tuple[int, int]], en_attente: Set[int]):
+        """Ajoute les successeurs d'une tâche au tas, sans doublon."""
+        for k in range(self._successeurs_indptr[indice], self._successeurs_indptr[indice + 1]):
+            successeur = self._successeurs[k]
+            if successeur not in en_attente:
+                en_attente.add(successeur)
+                heapq.heappush(tas, (self._position[successeur], successeur))
+
+    def modifie_duree(self, nom: Nom, duree: Duree) -> List[Nom]:
+        """Change la durée d'une tâche et renvoie les noms des activités modifiées."""
+        indice = self._indice(nom)
+        self._taches[indice] = dataclasses.replace(self._taches[indice], duree=duree)
+        self._activites[indice] = None
+        nouvelle = self._duree_effective(duree)
+        if nouvelle == self._durees[indice]:
+            return []
+        self._durees[indice] = nouvelle
+        tas: List[Tuple[int, int]] = list()
+        en_attente: Set[int] = set()
+        self._pousse_successeurs(indice, tas, en_attente)
+        return self._propage([indice for _, indice in tas], {indice})
+
+    def modifie_latence(self, prerequis: Nom, tache: Nom, latence: Duree) -> List[Nom]:
+        """Change la latence du prérequis de tache envers prerequis et renvoie les noms des activités modifiées."""
+        try:
+            arete = self.compile._indices_aretes[(prerequis, tache)]
+        except KeyError:
+            raise ValueError(f"{tache} n'a pas {prerequis} comme prérequis.")
+        indice = self._indice(tache)
+        courante = self._taches[indice]
+        rang = arete - self._indptr[indice]
+        liste = list(courante.prerequis)
+        liste[rang] = dataclasses.replace(liste[rang], latence=latence)
+        self._taches[indice] = dataclasses.replace(courante, prerequis=liste)
+        self._activites[indice] = None
+        if latence._secondes == self._latences[arete]:
+            return []
+        self._latences[arete] = latence._secondes
+        return self._propage([indice], set())
+
+    def __getitem__(self, nom: Nom) -> Activite:
+        """Activité actuelle d'une tâche."""
+        return self._activite(self._indice(nom))
+
+    def _activite(self, indice: int) -> Activite:
+        """Activité d'une tâche, reconstruite seulement si elle a changé."""
+        if self._activites[indice] is None:
+            debut = self._debuts[indice]
+            self._activites[indice] = Activite(
+                tache=self._taches[indice],
+                debut=Duree._depuis_secondes(debut),
+                fin=Duree._depuis_secondes(debut + self._durees[indice]),
+            )
+        return self._activites[indice]
+
+    def vers_EDT(self) -> EDT:
+        """Renvoie l'emploi du temps actuel, dans l'ordre de resous_EDT."""
+        resultat = EDT(activites=[])
+        for indice in self.compile._rangs:
+            resultat.ajoute(self._activite(indice))
+        return resultat
@@ -0,0 +1,265 @@
+#! /usr/bin/env python
+# -*- coding: utf-8 -*-
+"""Description.
+
+Contient la classe Graphe, graphe orienté des prérequis d'un problème.
+
+Les tâches y sont numérotées par le registre du problème et les arcs rangés dans des listes d'adjacence.
+L'ordre topologique est calculé par l'algorithme de Kahn lors de la construction,
+ce qui détecte les cycles du même coup. Toutes les tâches sont présentes,
+y compris celles qui n'ont ni prérequis ni successeur.
+
+En cas de cycle, seules les tâches que Kahn n'a pas pu ordonner sont analysées
+(algorithme de Tarjan sur les composantes fortement connexes) et une ErreurCycle
+décrit chaque cycle et les prérequis qui le forment.
+"""
+from collections import deque
+from typing import Any, Callable, Dict, Generator, List, Optional, Sequence, Tuple
+from .probleme import Nom, Probleme, Registre, Tache
+
+## Nombre maximal de cycles décrits dans le message d'une ErreurCycle.
+_CYCLES_AFFICHES = 10
+
+
+class ErreurCycle(ValueError):
+    """Le problème contient des cycles de prérequis.
+
+    composantes : noms des tâches de chaque composante fortement connexe cyclique.
+    cycles : pour chaque composante, un cycle de tâches, la première étant prérequis de la seconde, etc.
+    aretes : pour chaque composante, les prérequis (prérequis, tâche) qui la forment.
+
+        >>> resous_EDT(Probleme.par_str("A / 1 jour / B fin / A\nB / 1 jour / A fin / B"))
+    ErreurCycle: Le problème n'a pas de solution, 1 cycle de prérequis :
+        A -> B -> A
+    """
+
+    def __init__(
+        self,
+        composantes: List[List[Nom]],
+        cycles: List[List[Nom]],
+        aretes: List[List[Tuple[Nom, Nom]]],
+    ):
+        """Mémorise les cycles et construit le message."""
+        self.composantes = composantes
+        self.cycles = cycles
+        self.aretes = aretes
+        lignes = [
+            f"Le problème n'a pas de solution, {len(cycles)} cycle"
+            f"{'s' if len(cycles) > 1 else ''} de prérequis :"
+        ]
+        for cycle in cycles[:_CYCLES_AFFICHES]:
+            lignes.append("    " + " -> ".join(cycle + cycle[:1]))
+        if len(cycles) > _CYCLES_AFFICHES:
+            lignes.append(f"    ... et {len(cycles) - _CYCLES_AFFICHES} autres.")
+        super().__init__("\n".join(lignes))
+
+
+def _composantes_cycliques(
+    successeurs: Sequence[Sequence[int]], noeuds: Sequence[int]
+) -> List[List[int]]:
+    """Algorithme de Tarjan, itératif, restreint aux noeuds donnés.
+
+    Renvoie les composantes fortement connexes qui contiennent un cycle, triées.
+    """
+    dans_residu = set(noeuds)
+    rang: Dict[int, int] = dict()
+    bas: Dict[int, int] = dict()
+    pile: List[int] = list()
+    sur_pile = set()
+    resultat = list()
+    for racine in noeuds:
+        if racine in rang:
+            continue
+        rang[racine] = bas[racine] = len(rang)
+        pile.append(racine)
+        sur_pile.add(racine)
+        travail = [(racine, 0)]
+        while travail:
+            noeud, k = travail[-1]
+            voisins = successeurs[noeud]
+            if k < len(voisins):
+                travail[-1] = (noeud, k + 1)
+                voisin = voisins[k]
+                if voisin not in dans_residu:
+                    continue
+                if voisin not in rang:
+                    rang[voisin] = bas[voisin] = len(rang)
+                    pile.append(voisin)
+                    sur_pile.add(voisin)
+                    travail.append((voisin, 0))
+                elif voisin in sur_pile:
+                    bas[noeud] = min(bas[noeud], rang[voisin])
+                continue
+            travail.pop()
+            if travail:
+                parent = travail[-1][0]
+                bas[parent] = min(bas[parent], bas[noeud])
+            if bas[noeud] == rang[noeud]:
+                composante = list()
+                while True:
+                    membre = pile.pop()
+                    sur_pile.discard(membre)
+                    composante.append(membre)
+                    if membre == noeud:
+                        break
+                if len(composante) > 1 or noeud in successeurs[noeud]:
+                    resultat.append(sorted(composante))
+    return sorted(resultat)
+
+
+def _cycle(successeurs: Sequence[Sequence[int]], composante: List[int]) -> List[int]:
+    """Plus court cycle passant par le premier noeud d'une composante, par parcours en largeur."""
+    membres = set(composante)
+    depart = composante[0]
+    parents = {depart: depart}
+    file = deque([depart])
+    while file:
+        courant = file.popleft()
+        for voisin in successeurs[courant]:
+            if voisin == depart:
+                chemin = [courant]
+                while chemin[-1] != depart:
+                    chemin.append(parents[chemin[-1]])
+                return chemin[::-1]
+            if voisin in membres and voisin not in parents:
+                parents[voisin] = courant
+                file.append(voisin)
+    return [depart]
+
+
+def diagnostique_cycles(
+    noms: Sequence[Nom], successeurs: Sequence[Sequence[int]], restants: Sequence[int]
+) -> ErreurCycle:
+    """Construit l'ErreurCycle des tâches restantes après l'algorithme de Kahn."""
+    composantes = _composantes_cycliques(successeurs, restants)
+    aretes = list()
+    for composante in composantes:
+        membres = set(composante)
+        aretes.append(
+            [
+                (noms[source], noms[destination])
+                for source in composante
+                for destination in successeurs[source]
+                if destination in membres
+            ]
+        )
+    return ErreurCycle(
+        [[noms[i] for i in composante] for composante in composantes],
+        [[noms[i] for i in _cycle(successeurs, composante)] for composante in composantes],
+        aretes,
+    )
+
+
+class Graphe:
+    """Graphe orienté des prérequis, à identifiants entiers.
+
+        >>> graphe = genere_graphe(mon_probleme)
+
+        >>> graphe.est_acyclique
+    True
+
+        >>> graphe.ordre_topologique()
+    ['A', 'B', 'C', 'D', 'E']
+
+        >>> list(graphe.aretes)
+    [('A', 'B'), ('B', 'C'), ('A', 'D'), ('C', 'D'), ('D', 'E')]
+
+        >>> graphe.vers_networkx()
+    <networkx.classes.digraph.DiGraph object at ...>
+    """
+
+    def __init__(self, probleme: Probleme, mesure: Optional[Callable] = None):
+        """Construit les listes d'adjacence puis l'ordre topologique.
+
+        [optionnel] mesure
+        Fonction de mesure d'une Instrumentation, par laquelle passe le tri topologique."""
+        self.taches: List[Tache] = list(probleme.taches)
+        self.noms: List[Nom] = [tache.nom for tache in self.taches]
+        self.indices: Registre = probleme.registre
+        self.predecesseurs: List[List[int]] = [list() for _ in self.taches]
+        self.successeurs: List[List[int]] = [list() for _ in self.taches]
+        for indice, tache in enumerate(self.taches):
+            for prerequis in tache.prerequis:
+                if prerequis:
+                    source = self.indices[prerequis.nom]
+                    self.predecesseurs[indice].append(source)
+                    self.successeurs[source].append(indice)
+        if mesure is None:
+            self._genere_ordre()
+        else:
+            mesure("tri_topologique", self._genere_ordre)()
+
+    def _genere_ordre(self):
+        """Algorithme de Kahn. Les tâches hors de l'ordre appartiennent à un cycle ou en dépendent."""
+        degres = [len(predecesseurs) for predecesseurs in self.predecesseurs]
+        file = deque(i for i, degre in enumerate(degres) if degre == 0)
+        self.ordre: List[int] = list()
+        while file:
+            courant = file.popleft()
+            self.ordre.append(courant)
+            for successeur in self.successeurs[courant]:
+                degres[successeur] -= 1
+                if degres[successeur] == 0:
+                    file.append(successeur)
+
+    def __len__(self) -> int:
+        """Nombre de tâches."""
+        return len(self.noms)
+
+    def __repr__(self) -> str:
+        """Représentation."""
+        return f"Graphe(taches={len(self)}, prerequis={self.nb_aretes})"
+
+    @property
+    def nb_aretes(self) -> int:
+        """Nombre de prérequis."""
+        return sum(len(predecesseurs) for predecesseurs in self.predecesseurs)
+
+    @property
+    def aretes(self) -> Generator[Tuple[Nom, Nom], None, None]:
+        """Itère sur les prérequis sous forme (prérequis, tâche), dans l'ordre du problème."""
+        for indice, predecesseurs in enumerate(self.predecesseurs):
+            for source in predecesseurs:
+                yield self.noms[source], self.noms[indice]
+
+    @property
+    def est_acyclique(self) -> bool:
+        """Indique si le graphe n'a pas de cycle."""
+        return len(self.ordre) == len(self.noms)
+
+    def verifie_acyclique(self):
+        """Lève une ErreurCycle décrivant les cycles du graphe s'il en a."""
+        if not self.est_acyclique:
+            ordonnees = set(self.ordre)
+            raise diagnostique_cycles(
+                self.noms,
+                self.successeurs,
+                [i for i in range(len(self.noms)) if i not in ordonnees],
+            )
+
+    def ordre_topologique(self) -> List[Nom]:
+        """Renvoie les noms des tâches dans un ordre compatible avec les prérequis."""
+        self.verifie_acyclique()
+        return [self.noms[indice] for indice in self.ordre]
+
+    def vers_networkx(self) -> Any:
+        """Renvoie le graphe sous forme de networkx.DiGraph, avec toutes les tâches.
+
+        Les arcs portent la durée de la tâche (temps), la latence (attente) et le type (typ) du prérequis.
+        networkx doit être installé.
+        """
+        import networkx as nx
+
+        resultat = nx.DiGraph()
+        resultat.add_nodes_from(self.noms)
+        for tache in self.taches:
+            for prerequis in tache.prerequis:
+                if prerequis:
+                    resultat.add_edge(
+                        prerequis.nom,
+                        tache.nom,
+                        temps=tache.duree,
+                        attente=prerequis.latence,
+                        typ=prerequis.typ,
+                    )
+        return resultat
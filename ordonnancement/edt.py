@@ -4,16 +4,17 @@
 
 Contient les classes Activite et EDT.
 """
-import matplotlib.pyplot as plt
-from typing import Any, List, Union, Generator, Optional
+from typing import Any, Dict, List, Union, Generator, Optional, TYPE_CHECKING
 from dataclasses import dataclass
-from rich.table import Table
 from .probleme import Nom, Tache, Prerequis, Duree
 from .calendrier import Date, Calendrier
-from pendulum import datetime
 
+if TYPE_CHECKING:
+    import matplotlib.pyplot as plt
+    from rich.table import Table
 
-@dataclass
+
+@dataclass(slots=True)
 class Activite:
     """Tâche plannifiée."""
 
@@ -27,7 +28,7 @@ class Activite:
             raise ValueError(
                 f"Les durées de l'activité correspondant à la tache {self.tache} ne respecte pas l'ordre."
             )
-        if self.fin - self.debut < self.tache.duree:
+        if self.fin._secondes - self.debut._secondes < self.tache.duree._secondes:
             raise ValueError(
                 f"L'activité correspondant à la tache {self.tache} ne respecte pas la durée."
             )
@@ -101,6 +102,7 @@ class EDT:
     def __init__(self, activites: List[Activite]):
         """Instancie à partir de la liste d'activites."""
         self._activites: List[Activite] = []
+        self._index: Dict[Nom, Activite] = dict()
         for activite in activites:
             self.ajoute(activite)
 
@@ -121,21 +123,34 @@ class EDT:
 
     def __getitem__(self, nom: Nom) -> Activite:
         """Accède aux activités par leur nom de tâche."""
-        for activite in self._activites:
-            if activite.tache.nom == nom:
-                return activite
-
-        raise ValueError("Pas d'activité avec ce nom de tâche.")
+        try:
+            return self._index[nom]
+        except KeyError:
+            raise ValueError("Pas d'activité avec ce nom de tâche.")
 
     def ajoute(self, activite: Activite) -> "EDT":
         """Rajoute une nouvelle activité."""
-        if any(activite.tache.nom == autre.tache.nom for autre in self.activites):
+        if activite.tache.nom in self._index:
             raise ValueError(
                 f"La tâche {activite.tache.nom} est déjà présente "
                 "dans l'emploi du temps."
             )
+        self._index[activite.tache.nom] = activite
         self._activites.append(activite)
 
+    def vers_binaire(self) -> bytes:
+        """Encode l'emploi du temps au format binaire du module binaire."""
+        from .binaire import vers_binaire
+
+        return vers_binaire(self)
+
+    @classmethod
+    def par_binaire(cls, donnees: Any) -> "EDT":
+        """Constructeur alternatif à partir de données écrites par vers_binaire."""
+        from .binaire import depuis_binaire
+
+        return depuis_binaire(donnees, cls)
+
     def est_valide(self) -> bool:
         """Vérifie si l'emploi du temps respecte les contraintes."""
         for activite in self.activites:
@@ -144,8 +159,10 @@ class EDT:
                     return False
         return True
 
-    def _genere_table(self, entier: bool, brute: bool) -> Table:
+    def _genere_table(self, entier: bool, brute: bool) -> "Table":
         """Retourne une table rich."""
+        from rich.table import Table
+
         if entier:
             resultat = Table(title="Solution du problème : emploi du temps")
             resultat.add_column("Tâche")
@@ -185,8 +202,10 @@ class EDT:
 
         print(self._genere_table(entier=entier, brute=brute))
 
-    def genere_graphique(self) -> plt.Figure:
+    def genere_graphique(self) -> "plt.Figure":
         """Renvoie une figure matplotlib."""
+        import matplotlib.pyplot as plt
+
         figure, repere = plt.subplots()
         repere.set_ylabel("Tâches")
         repere.set_xlabel("Instants")
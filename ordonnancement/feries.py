@@ -0,0 +1,182 @@
+#! /usr/bin/env python
+# -*- coding: utf-8 -*-
+"""Description.
+
+Contient la classe JoursFeries, ensemble de jours non ouvrés : jours fériés, fermetures, exceptions.
+
+Les jours sont stockés dans un tableau NumPy de booléens indexé par le nombre de jours depuis
+une origine, le premier jour chômé. Les périodes sont posées par sommes cumulées,
+sans boucle jour par jour, et les tests d'appartenance se font en bloc.
+
+Un JoursFeries se lit d'un fichier texte ou se sauvegarde dans un fichier binaire
+qui peut ensuite être projeté en mémoire (memmap) plutôt que relu.
+"""
+import datetime
+import numpy as np
+from typing import Iterable, Tuple, Union
+from .calendrier import Date
+
+## Signature et taille de l'en-tête des fichiers binaires : signature, origine, nombre de jours.
+_SIGNATURE = b"FERIES01"
+_TAILLE_ENTETE = len(_SIGNATURE) + 16
+
+Periode = Union[Date, str, Tuple[Union[Date, str], Union[Date, str]]]
+
+
+def _ordinal(date: Union[Date, str]) -> int:
+    """Numéro du jour d'une date, celui de datetime.date.toordinal."""
+    if type(date) == str:
+        date = Date.par_str(date.strip())
+    return datetime.date(date.annees, date.mois, date.jours).toordinal()
+
+
+def _bornes(periode: Periode) -> Tuple[int, int]:
+    """Premier et dernier jour, inclus, d'une date ou d'une période (début, fin)."""
+    if isinstance(periode, tuple):
+        debut, fin = _ordinal(periode[0]), _ordinal(periode[1])
+        if fin < debut:
+            raise ValueError("La fin d'une période de jours fériés précède son début.")
+        return debut, fin
+    jour = _ordinal(periode)
+    return jour, jour
+
+
+class JoursFeries:
+    """Jours non ouvrés, à combiner avec les jours de repos hebdomadaires d'un CalendrierOuvre.
+
+        >>> feries = JoursFeries(["25/12/2024", "1/1/2025", ("1/8/2025", "15/8/2025")])
+
+        >>> len(feries)
+    17
+
+        >>> Date.par_str("10/8/2025") in feries
+    True
+
+        >>> feries | JoursFeries.par_fichier("fermetures.txt")
+    JoursFeries(origine=Date(jours=25, mois=12, annees=2024), nb_jours=...)
+    """
+
+    def __init__(self, periodes: Iterable[Periode] = ()):
+        """Construit l'ensemble à partir de dates et de périodes (début, fin), fins incluses."""
+        bornes = [_bornes(periode) for periode in periodes]
+        debuts = np.asarray([debut for debut, _ in bornes], dtype=np.int64)
+        fins = np.asarray([fin for _, fin in bornes], dtype=np.int64)
+        self._depuis_bornes(debuts, fins)
+
+    def _depuis_bornes(self, debuts: np.ndarray, fins: np.ndarray):
+        """Pose les périodes par différences puis somme cumulée."""
+        if len(debuts) == 0:
+            self._origine = 0
+            self._jours = np.zeros(0, dtype=np.bool_)
+            return
+        self._origine = int(debuts.min())
+        taille = int(fins.max()) - self._origine + 1
+        differences = np.zeros(taille + 1, dtype=np.int64)
+        np.add.at(differences, debuts - self._origine, 1)
+        np.add.at(differences, fins - self._origine + 1, -1)
+        self._jours = np.cumsum(differences[:-1]) > 0
+
+    @classmethod
+    def _depuis_tableau(cls, origine: int, jours: np.ndarray) -> "JoursFeries":
+        """Construit l'ensemble depuis une origine et un tableau de booléens, sans copie."""
+        resultat = cls.__new__(cls)
+        resultat._origine = origine
+        resultat._jours = jours
+        return resultat
+
+    @classmethod
+    def par_str(cls, message: str) -> "JoursFeries":
+        """Constructeur alternatif.
+
+        Une date ou une période par ligne, "JJ/MM/AAAA" ou "JJ/MM/AAAA - JJ/MM/AAAA".
+        Les lignes vides et ce qui suit un # sont ignorés.
+        """
+        periodes = list()
+        for numero, ligne in enumerate(message.split("\n"), start=1):
+            ligne = ligne.split("#")[0].strip()
+            if not ligne:
+                continue
+            morceaux = ligne.split(" - ")
+            try:
+                if len(morceaux) == 1:
+                    periodes.append(_bornes(morceaux[0]))
+                elif len(morceaux) == 2:
+                    periodes.append(_bornes((morceaux[0], morceaux[1])))
+                else:
+                    raise ValueError("Une période a un début et une fin.")
+            except ValueError as erreur:
+                raise ValueError(f"Ligne {numero} des jours fériés invalide : {erreur}")
+        resultat = cls.__new__(cls)
+        resultat._depuis_bornes(
+            np.asarray([debut for debut, _ in periodes], dtype=np.int64),
+            np.asarray([fin for _, fin in periodes], dtype=np.int64),
+        )
+        return resultat
+
+    @classmethod
+    def par_fichier(cls, chemin: str) -> "JoursFeries":
+        """Lit un fichier texte au format de par_str."""
+        with open(chemin, encoding="utf-8") as fichier:
+            return cls.par_str(fichier.read())
+
+    def sauvegarde(self, chemin: str):
+        """Écrit l'ensemble dans un fichier binaire, relu par charge."""
+        with open(chemin, "wb") as fichier:
+            fichier.write(_SIGNATURE)
+            fichier.write(np.asarray([self._origine, len(self._jours)], dtype="<i8").tobytes())
+            fichier.write(np.ascontiguousarray(self._jours, dtype=np.bool_).tobytes())
+
+    @classmethod
+    def charge(cls, chemin: str) -> "JoursFeries":
+        """Projette en mémoire un fichier écrit par sauvegarde, en lecture seule."""
+        with open(chemin, "rb") as fichier:
+            entete = fichier.read(_TAILLE_ENTETE)
+        if len(entete) < _TAILLE_ENTETE or not entete.startswith(_SIGNATURE):
+            raise ValueError(f"{chemin} n'est pas un fichier de jours fériés.")
+        origine, taille = np.frombuffer(entete[len(_SIGNATURE) :], dtype="<i8").tolist()
+        if taille == 0:
+            return cls._depuis_tableau(origine, np.zeros(0, dtype=np.bool_))
+        jours = np.memmap(
+            chemin, dtype=np.bool_, mode="r", offset=_TAILLE_ENTETE, shape=(taille,)
+        )
+        return cls._depuis_tableau(origine, jours)
+
+    def __len__(self) -> int:
+        """Nombre de jours non ouvrés."""
+        return int(np.count_nonzero(self._jours))
+
+    def __repr__(self) -> str:
+        """Représentation."""
+        if not len(self._jours):
+            return "JoursFeries(nb_jours=0)"
+        origine = datetime.date.fromordinal(self._origine)
+        return (
+            f"JoursFeries(origine={Date(jours=origine.day, mois=origine.month, annees=origine.year)}, "
+            f"nb_jours={len(self)})"
+        )
+
+    def __contains__(self, date: Union[Date, str]) -> bool:
+        """Indique si le jour de la date est non ouvré."""
+        return bool(self.masque(np.asarray([_ordinal(date)]))[0])
+
+    def __or__(self, autre: "JoursFeries") -> "JoursFeries":
+        """Réunion de deux ensembles de jours non ouvrés."""
+        if not len(autre._jours):
+            return JoursFeries._depuis_tableau(self._origine, np.array(self._jours))
+        if not len(self._jours):
+            return JoursFeries._depuis_tableau(autre._origine, np.array(autre._jours))
+        origine = min(self._origine, autre._origine)
+        fin = max(self._origine + len(self._jours), autre._origine + len(autre._jours))
+        jours = np.zeros(fin - origine, dtype=np.bool_)
+        for ensemble in (self, autre):
+            decalage = ensemble._origine - origine
+            jours[decalage : decalage + len(ensemble._jours)] |= ensemble._jours
+        return JoursFeries._depuis_tableau(origine, jours)
+
+    def masque(self, ordinaux: np.ndarray) -> np.ndarray:
+        """Indique pour chaque numéro de jour (datetime.date.toordinal) s'il est non ouvré."""
+        positions = np.asarray(ordinaux, dtype=np.int64) - self._origine
+        dedans = (positions >= 0) & (positions < len(self._jours))
+        resultat = np.zeros(positions.shape, dtype=np.bool_)
+        resultat[dedans] = self._jours[positions[dedans]]
+        return resultat
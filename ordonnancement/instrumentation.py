@@ -0,0 +1,179 @@
+#! /usr/bin/env python
+# -*- coding: utf-8 -*-
+"""Description.
+
+Contient la classe Instrumentation, mesure par phase des algorithmes de résolution.
+
+Les algorithmes reçoivent leurs fonctions de phase au travers de mesure : sans instrumentation,
+ce sont les fonctions elles-mêmes, sans enveloppe, et la résolution ne paie rien.
+Avec une instrumentation, chaque appel est chronométré ; le temps d'une phase exclut
+celui des phases appelées à l'intérieur.
+
+Les conversions vers et depuis Pendulum sont comptées par les méthodes de conversion de Duree
+et Date elles-mêmes, dans les compteurs de l'instrumentation active du contexte d'exécution
+(une ContextVar). Aucune classe n'est modifiée : des résolutions instrumentées concurrentes
+ne se gênent pas et les autres ne paient rien. Une même instrumentation ne doit cependant pas
+servir à des résolutions concurrentes dans plusieurs fils d'exécution.
+"""
+from contextlib import contextmanager
+from dataclasses import dataclass
+from time import perf_counter
+from typing import Any, Callable, Dict, List, Optional, TypeVar, TYPE_CHECKING
+from .probleme import _conversions_comptees
+
+if TYPE_CHECKING:
+    from rich.table import Table
+
+Fonction = TypeVar("Fonction", bound=Callable[..., Any])
+
+## Sens des conversions comptées.
+_CONVERSIONS = ["Duree vers Duration", "Date vers DateTime", "DateTime vers Date"]
+
+## Ordre d'affichage des phases connues.
+PHASES = [
+    "graphe",
+    "tri_topologique",
+    "acyclicite",
+    "demarrage",
+    "temps_ouvre",
+    "insertion",
+]
+
+
+def sans_mesure(nom: str, fonction: Fonction) -> Fonction:
+    """Renvoie la fonction telle quelle, quand la résolution n'est pas instrumentée."""
+    return fonction
+
+
+@dataclass
+class Phase:
+    """Nombre d'appels et temps passé, en secondes, dans une phase."""
+
+    nom: str
+    appels: int = 0
+    secondes: float = 0.0
+
+
+class Instrumentation:
+    """Temps et nombre d'appels par phase d'une ou plusieurs résolutions.
+
+        >>> instrumentation = Instrumentation()
+
+        >>> resous_Calendrier(mon_probleme, "23/12/1998", instrumentation=instrumentation)
+
+        >>> instrumentation["demarrage"]
+    Phase(nom='demarrage', appels=5, secondes=0.0003...)
+
+        >>> instrumentation.conversions
+    {'Duree vers Duration': 9, 'Date vers DateTime': 52, 'DateTime vers Date': 9}
+
+        >>> instrumentation.affiche()
+
+    [optionnel] rappel
+    Fonction appelée avec l'instrumentation à la fin de chaque résolution.
+    Exemple :   - lambda instrumentation: journal.info(instrumentation.vers_dict())
+    """
+
+    def __init__(self, rappel: Optional[Callable[["Instrumentation"], None]] = None):
+        """Crée une instrumentation vide."""
+        self.rappel = rappel
+        self.nb_resolutions = 0
+        self.secondes = 0.0
+        self._phases: Dict[str, Phase] = dict()
+        self.conversions: Dict[str, int] = {sens: 0 for sens in _CONVERSIONS}
+        self._pile: List[float] = list()
+
+    def __repr__(self) -> str:
+        """Représentation."""
+        return (
+            f"Instrumentation(resolutions={self.nb_resolutions}, secondes={self.secondes:.6f}, "
+            f"phases={list(self.phases)!r})"
+        )
+
+    def __getitem__(self, nom: str) -> Phase:
+        """Accès à une phase par son nom."""
+        try:
+            return self._phases[nom]
+        except KeyError:
+            raise ValueError(f"Pas de phase {nom} mesurée.")
+
+    @property
+    def phases(self) -> List[Phase]:
+        """Phases mesurées, dans l'ordre de PHASES puis d'apparition."""
+        rang = {nom: i for i, nom in enumerate(PHASES)}
+        return sorted(self._phases.values(), key=lambda phase: rang.get(phase.nom, len(rang)))
+
+    def _phase(self, nom: str) -> Phase:
+        """Phase du nom donné, créée au besoin."""
+        if nom not in self._phases:
+            self._phases[nom] = Phase(nom)
+        return self._phases[nom]
+
+    def mesure(self, nom: str, fonction: Fonction) -> Fonction:
+        """Enveloppe fonction pour chronométrer ses appels dans la phase nom."""
+        phase = self._phase(nom)
+        pile = self._pile
+
+        def mesuree(*args, **kwargs):
+            pile.append(0.0)
+            debut = perf_counter()
+            try:
+                return fonction(*args, **kwargs)
+            finally:
+                duree = perf_counter() - debut
+                phase.appels += 1
+                phase.secondes += duree - pile.pop()
+                if pile:
+                    pile[-1] += duree
+
+        return mesuree
+
+    @contextmanager
+    def _active(self):
+        """Compte les conversions et le temps total le temps d'une résolution."""
+        jeton = _conversions_comptees.set(self.conversions)
+        debut = perf_counter()
+        try:
+            yield self.mesure
+        finally:
+            self.secondes += perf_counter() - debut
+            self.nb_resolutions += 1
+            _conversions_comptees.reset(jeton)
+            if self.rappel is not None:
+                self.rappel(self)
+
+    def vers_dict(self) -> Dict[str, Any]:
+        """Renvoie les mesures sous forme de dictionnaire, sérialisable en JSON."""
+        return {
+            "nb_resolutions": self.nb_resolutions,
+            "secondes": self.secondes,
+            "phases": {
+                phase.nom: {"appels": phase.appels, "secondes": phase.secondes}
+                for phase in self.phases
+            },
+            "conversions": dict(self.conversions),
+        }
+
+    def _genere_table(self) -> "Table":
+        """Retourne une table rich."""
+        from rich.table import Table
+
+        resultat = Table(title="Instrumentation de la résolution")
+        resultat.add_column("Phase")
+        resultat.add_column("Appels", justify="right")
+        resultat.add_column("Secondes", justify="right")
+        resultat.add_column("Part", justify="right")
+        for phase in self.phases:
+            part = phase.secondes / self.secondes if self.secondes else 0.0
+            resultat.add_row(
+                phase.nom, str(phase.appels), f"{phase.secondes:.6f}", f"{part:.1%}"
+            )
+        for sens, nombre in self.conversions.items():
+            resultat.add_row(f"Conversions {sens}", str(nombre), "", "")
+        return resultat
+
+    def affiche(self):
+        """Affiche les mesures en tableau."""
+        from rich import print
+
+        print(self._genere_table())
@@ -0,0 +1,227 @@
+#! /usr/bin/env python
+# -*- coding: utf-8 -*-
+"""Description.
+
+Contient l'analyse des marges : dates au plus tard, marges totale et libre, chemins critiques.
+
+La passe arrière se fait sur les successeurs précalculés du Reseau, en O(n+m).
+Comme la passe avant, elle respecte les prérequis de type "fin" et "debut" et leurs latences.
+La fin du projet est la plus tardive des fins au plus tôt.
+"""
+import numpy as np
+from dataclasses import dataclass
+from typing import Dict, Generator, List, Optional, Union, TYPE_CHECKING
+from .probleme import Nom, Probleme, Tache, Duree
+from .reseau import Reseau, TYPE_FIN
+from .algorithme import _durees_effectives, _verifie_conditions_EDT
+
+if TYPE_CHECKING:
+    from rich.table import Table
+
+
+def _message_marge(marge: Duree, brute: bool) -> str:
+    """Décrit une marge, nulle ou non."""
+    if marge._secondes == 0:
+        return "Aucune"
+    return marge._choisi_brute(brute)
+
+
+@dataclass(slots=True)
+class Marge:
+    """Dates au plus tôt et au plus tard d'une tâche, et ses marges.
+
+    La marge totale est le retard possible sans retarder la fin du projet.
+    La marge libre est le retard possible sans retarder le début au plus tôt d'aucun successeur,
+    ni la fin du projet (cas d'une tâche qui n'a que des successeurs de type "debut").
+    """
+
+    tache: Tache
+    debut_tot: Duree
+    fin_tot: Duree
+    debut_tard: Duree
+    fin_tard: Duree
+    marge_totale: Duree
+    marge_libre: Duree
+
+    @property
+    def est_critique(self) -> bool:
+        """Indique si la tâche n'a aucune marge totale."""
+        return self.marge_totale._secondes == 0
+
+
+class Marges:
+    """Résultat de l'analyse des marges d'un problème.
+
+        >>> marges = analyse_marges(mon_probleme)
+
+        >>> marges["B"].debut_tard
+    Duree(annees=3, semaines=2, jours=2, heures=3)
+
+        >>> marges["C"].marge_totale
+    Duree(Aucune durée)
+
+        >>> marges.chemins_critiques()
+    [['A', 'B', 'C', 'D', 'E']]
+
+        >>> marges.affiche()
+    """
+
+    def __init__(
+        self,
+        probleme: Probleme,
+        reseau: Reseau,
+        durees: np.ndarray,
+        debuts_tot: np.ndarray,
+        debuts_tard: np.ndarray,
+    ):
+        """Calcule les marges à partir des passes avant et arrière du réseau."""
+        self.probleme = probleme
+        self.reseau = reseau
+        self.durees = durees
+        self.debuts_tot = debuts_tot
+        self.debuts_tard = debuts_tard
+        self.fins_tot = debuts_tot + durees
+        self.fins_tard = debuts_tard + durees
+        self.marges_totales = debuts_tard - debuts_tot
+        self.fin_projet = int(self.fins_tot.max()) if len(reseau) else 0
+        ## Écart de chaque prérequis entre la contrainte et le début au plus tôt de la tâche.
+        ecarts = debuts_tot[reseau.destinations] - (
+            debuts_tot[reseau.sources]
+            + reseau.latences
+            + durees[reseau.sources] * (reseau.types == TYPE_FIN)
+        )
+        self.marges_libres = self.fin_projet - self.fins_tot
+        sortants = np.diff(reseau.successeurs_indptr)
+        avec_successeurs = sortants > 0
+        if avec_successeurs.any():
+            self.marges_libres[avec_successeurs] = np.minimum(
+                self.marges_libres[avec_successeurs],
+                np.minimum.reduceat(
+                    ecarts[reseau.successeurs_aretes],
+                    reseau.successeurs_indptr[:-1][avec_successeurs],
+                ),
+            )
+        self._aretes_critiques = (
+            (self.marges_totales[reseau.sources] == 0)
+            & (self.marges_totales[reseau.destinations] == 0)
+            & (ecarts == 0)
+        )
+
+    def __len__(self) -> int:
+        """Nombre de tâches."""
+        return len(self.reseau)
+
+    def __repr__(self) -> str:
+        """Représentation."""
+        return f"Marges(taches={len(self)}, critiques={len(self.critiques)})"
+
+    def __getitem__(self, nom: Nom) -> Marge:
+        """Accède aux marges d'une tâche par son nom."""
+        try:
+            indice = self.reseau.indices[nom]
+        except KeyError:
+            raise ValueError("Pas de tâche avec ce nom.")
+        return self._marge(indice)
+
+    def _marge(self, indice: int) -> Marge:
+        """Construit la Marge de la tâche d'indice donné."""
+        return Marge(
+            tache=self.probleme[self.reseau.noms[indice]],
+            debut_tot=Duree._depuis_secondes(int(self.debuts_tot[indice])),
+            fin_tot=Duree._depuis_secondes(int(self.fins_tot[indice])),
+            debut_tard=Duree._depuis_secondes(int(self.debuts_tard[indice])),
+            fin_tard=Duree._depuis_secondes(int(self.fins_tard[indice])),
+            marge_totale=Duree._depuis_secondes(int(self.marges_totales[indice])),
+            marge_libre=Duree._depuis_secondes(int(self.marges_libres[indice])),
+        )
+
+    @property
+    def marges(self) -> Generator[Marge, None, None]:
+        """Itère sur les marges des tâches, dans l'ordre du problème."""
+        for indice in range(len(self.reseau)):
+            yield self._marge(indice)
+
+    @property
+    def critiques(self) -> List[Nom]:
+        """Noms des tâches sans marge totale, dans l'ordre du problème."""
+        return [self.reseau.noms[i] for i in np.flatnonzero(self.marges_totales == 0)]
+
+    def chemins_critiques(self) -> List[List[Nom]]:
+        """Renvoie les chemins critiques, chacun sous forme de liste ordonnée de noms.
+
+        Un chemin critique suit des prérequis serrés entre tâches critiques,
+        d'une tâche critique sans prérequis serré jusqu'à une tâche critique sans successeur serré.
+        Attention, le nombre de chemins peut croître très vite si les chemins critiques se croisent.
+        """
+        reseau = self.reseau
+        suivants: Dict[int, List[int]] = dict()
+        ont_precedent = set()
+        for arete in np.flatnonzero(self._aretes_critiques).tolist():
+            source = int(reseau.sources[arete])
+            destination = int(reseau.destinations[arete])
+            suivants.setdefault(source, list()).append(destination)
+            ont_precedent.add(destination)
+        resultat = list()
+        for depart in np.flatnonzero(self.marges_totales == 0).tolist():
+            if depart in ont_precedent:
+                continue
+            pile = [[depart]]
+            while pile:
+                chemin = pile.pop()
+                while chemin[-1] in suivants:
+                    autres = suivants[chemin[-1]]
+                    for autre in reversed(autres[1:]):
+                        pile.append(chemin + [autre])
+                    chemin.append(autres[0])
+                resultat.append([reseau.noms[i] for i in chemin])
+        return resultat
+
+    def _genere_table(self, brute: bool) -> "Table":
+        """Retourne une table rich."""
+        from rich.table import Table
+
+        resultat = Table(title="Analyse des marges")
+        resultat.add_column("Tâche")
+        resultat.add_column("Début au plus tôt")
+        resultat.add_column("Début au plus tard")
+        resultat.add_column("Marge totale")
+        resultat.add_column("Marge libre")
+        for marge in self.marges:
+            resultat.add_row(
+                marge.tache.nom,
+                marge.debut_tot._choisi_brute(brute),
+                marge.debut_tard._choisi_brute(brute),
+                _message_marge(marge.marge_totale, brute),
+                _message_marge(marge.marge_libre, brute),
+                style="bold" if marge.est_critique else None,
+            )
+        return resultat
+
+    def affiche(self, brute: Optional[bool] = False):
+        """Affiche les marges, les tâches critiques en gras.
+
+        [optionnel] brute est un argument qui re-travaille ou non les durées.
+        """
+        from rich import print
+
+        print(self._genere_table(brute=brute))
+
+
+def analyse_marges(
+    probleme: Probleme,
+    duree_max_journalier: Optional[Union[float, int]] = None,
+    nb_jours_repos: Optional[Union[float, int]] = None,
+) -> Marges:
+    """Renvoie les dates au plus tard, les marges et les chemins critiques du problème.
+
+        Mêmes arguments que resous_EDT.
+
+        >>> marges = analyse_marges(mon_probleme)
+        >>> marges.critiques
+    ['A', 'B', 'C', 'D', 'E']
+    """
+    _verifie_conditions_EDT(duree_max_journalier, nb_jours_repos)
+    reseau = Reseau.par_probleme(probleme)
+    durees = _durees_effectives(reseau.durees, duree_max_journalier, nb_jours_repos)
+    debuts = reseau.passe_avant(durees=durees)
+    return Marges(probleme, reseau, durees, debuts, reseau.passe_arriere(debuts, durees=durees))
@@ -0,0 +1,252 @@
+#! /usr/bin/env python
+# -*- coding: utf-8 -*-
+"""Description.
+
+Contient la classe CalendrierOuvre, index du temps ouvré pour l'arithmétique des dates.
+
+Le temps ouvré est défini par une plage horaire d'exécution, des jours de repos hebdomadaires,
+avec les mêmes conventions que resous_Calendrier, et d'éventuels JoursFeries. Les plages ouvrées de chaque jour de l'horizon
+sont précalculées avec le cumul des secondes ouvrées qui les précèdent : ajouter une durée ouvrée
+à une date est alors une recherche dichotomique, et non une boucle jour par jour.
+L'horizon s'étend de lui-même si un calcul le dépasse.
+"""
+import calendar
+import datetime
+import numpy as np
+from bisect import bisect_left, bisect_right
+from typing import List, Optional, Tuple, Union, TYPE_CHECKING
+from .probleme import Duree
+from .calendrier import Date
+
+if TYPE_CHECKING:
+    from .feries import JoursFeries
+
+_SECONDES_PAR_JOUR = 86400
+
+## Numéros des jours de la semaine, lundi valant 0 comme datetime.date.weekday.
+_JOURS_SEMAINE = {
+    "lundi": 0,
+    "mardi": 1,
+    "mercredi": 2,
+    "jeudi": 3,
+    "vendredi": 4,
+    "samedi": 5,
+    "dimanche": 6,
+}
+
+
+def _plages_journalieres(heures_execution: Optional[str]) -> List[Tuple[int, int]]:
+    """Plages ouvrées d'une journée, en secondes depuis minuit.
+
+    Une plage comme "22-6" qui passe minuit donne deux plages dans la journée.
+    """
+    if heures_execution is None:
+        return [(0, _SECONDES_PAR_JOUR)]
+    try:
+        inf, sup = (float(heure) for heure in heures_execution.split("-"))
+    except ValueError:
+        raise ValueError(
+            "La condition sur les heures journalières d'éxécution sont invalide"
+        )
+    if not 0 <= inf <= 24 or not 0 <= sup <= 24 or inf == sup:
+        raise ValueError(
+            "La condition sur les heures journalières d'éxécution sont invalide"
+        )
+    ouverture, fermeture = round(inf * 3600), round(sup * 3600)
+    if ouverture < fermeture:
+        return [(ouverture, fermeture)]
+    return [(0, fermeture), (ouverture, _SECONDES_PAR_JOUR)]
+
+
+def _jours_repos(jours_repos: Optional[str]) -> List[int]:
+    """Numéros des jours de repos hebdomadaires."""
+    if jours_repos is None:
+        return []
+    resultat = list()
+    for jour in jours_repos.split():
+        if jour.lower() not in _JOURS_SEMAINE:
+            raise ValueError(f"{jour} n'est pas un jour de la semaine.")
+        if _JOURS_SEMAINE[jour.lower()] in resultat:
+            raise ValueError("Une journée est présente plusieurs fois.")
+        resultat.append(_JOURS_SEMAINE[jour.lower()])
+    if len(resultat) > 6:
+        raise ValueError(
+            "Vous ne pouvez prendre toutes les journées de la semaines en repos."
+        )
+    return resultat
+
+
+class CalendrierOuvre:
+    """Index du temps ouvré à partir d'une date de commencement.
+
+        >>> ouvre = CalendrierOuvre("23/12/1998", heures_execution="9-17", jours_repos="Samedi Dimanche")
+
+        >>> ouvre.ajoute(Date.par_str("23/12/1998/16:00"), Duree(heures=10))
+    Date(jours=25, mois=12, annees=1998, heures=10, minutes=0, secondes=0)
+
+        >>> ouvre.debut_ouvre(Date.par_str("26/12/1998"))
+    Date(jours=28, mois=12, annees=1998, heures=9, minutes=0, secondes=0)
+
+        >>> ouvre.duree_ouvree(Date.par_str("24/12/1998"), Date.par_str("29/12/1998"))
+    Duree(jours=1)
+
+    Les durées sont comptées en temps ouvré : Duree(heures=16) avec heures_execution="9-17"
+    représente deux journées de travail. Comme avec Pendulum, les mois et les années d'une durée
+    sont calendaires : ils valent le nombre de jours qui séparent la date de départ du même jour
+    les mois suivants.
+    """
+
+    def __init__(
+        self,
+        date_commencement: Union[Date, str],
+        heures_execution: Optional[str] = None,
+        jours_repos: Optional[str] = None,
+        nb_jours: int = 366,
+        jours_feries: Optional["JoursFeries"] = None,
+    ):
+        """Précalcule l'index sur nb_jours à partir de date_commencement.
+
+        [optionnel] heures_execution et jours_repos
+        Mêmes formats que pour resous_Calendrier, par exemple "9-17.5" et "Samedi Dimanche".
+
+        [optionnel] jours_feries
+        Jours non ouvrés en plus des jours de repos hebdomadaires.
+
+        [optionnel] nb_jours
+        Horizon initial de l'index, étendu automatiquement au besoin.
+        """
+        if type(date_commencement) == str:
+            date_commencement = Date.par_str(date_commencement)
+        self.date_commencement = date_commencement
+        self.heures_execution = heures_execution
+        self.jours_repos = jours_repos
+        self.jours_feries = jours_feries
+        self._origine = datetime.date(
+            date_commencement.annees, date_commencement.mois, date_commencement.jours
+        ).toordinal()
+        plages = np.asarray(_plages_journalieres(heures_execution), dtype=np.int64)
+        self._ouvertures = plages[:, 0]
+        self._fermetures = plages[:, 1]
+        self._repos = np.asarray(_jours_repos(jours_repos), dtype=np.int64)
+        self._nb_jours = 0
+        self._debuts: List[int] = list()
+        self._fins: List[int] = list()
+        self._cumuls: List[int] = list()
+        self._cumuls_fin: List[int] = list()
+        self._etend(max(nb_jours, 7))
+
+    def __repr__(self) -> str:
+        """Représentation."""
+        return (
+            f"CalendrierOuvre(date_commencement={self.date_commencement}, "
+            f"heures_execution={self.heures_execution!r}, jours_repos={self.jours_repos!r}, "
+            f"jours_feries={self.jours_feries!r}, nb_jours={self._nb_jours})"
+        )
+
+    def _jours_ouvres(self, jours: np.ndarray) -> np.ndarray:
+        """Masque des jours ouvrés parmi des jours comptés depuis l'origine."""
+        ouvres = ~np.isin((self._origine + jours + 6) % 7, self._repos)
+        if self.jours_feries is not None:
+            ouvres &= ~self.jours_feries.masque(self._origine + jours)
+        return ouvres
+
+    def _etend(self, nb_jours: int):
+        """Ajoute nb_jours jours à l'horizon de l'index."""
+        jours = np.arange(self._nb_jours, self._nb_jours + nb_jours, dtype=np.int64)
+        jours = jours[self._jours_ouvres(jours)]
+        debuts = (jours[:, np.newaxis] * _SECONDES_PAR_JOUR + self._ouvertures).ravel()
+        fins = (jours[:, np.newaxis] * _SECONDES_PAR_JOUR + self._fermetures).ravel()
+        longueurs = fins - debuts
+        precedent = self._cumuls_fin[-1] if self._cumuls_fin else 0
+        cumuls_fin = precedent + np.cumsum(longueurs)
+        self._debuts.extend(debuts.tolist())
+        self._fins.extend(fins.tolist())
+        self._cumuls.extend((cumuls_fin - longueurs).tolist())
+        self._cumuls_fin.extend(cumuls_fin.tolist())
+        self._nb_jours += nb_jours
+
+    def _couvre_instant(self, instant: int):
+        """Étend l'horizon jusqu'au lendemain de l'instant."""
+        while instant >= (self._nb_jours - 1) * _SECONDES_PAR_JOUR:
+            self._etend(self._nb_jours)
+
+    def _couvre_position(self, position: int):
+        """Étend l'horizon jusqu'à contenir position secondes ouvrées."""
+        while not self._cumuls_fin or self._cumuls_fin[-1] < position:
+            self._etend(self._nb_jours)
+
+    def _en_secondes(self, date: Date) -> int:
+        """Secondes écoulées entre l'origine de l'index et une date."""
+        jour = datetime.date(date.annees, date.mois, date.jours).toordinal() - self._origine
+        if jour < 0:
+            raise ValueError("La date précède la date de commencement du calendrier ouvré.")
+        return (
+            jour * _SECONDES_PAR_JOUR + date.heures * 3600 + date.minutes * 60 + date.secondes
+        )
+
+    def _en_date(self, instant: int) -> Date:
+        """Date située instant secondes après l'origine de l'index."""
+        jour, reste = divmod(instant, _SECONDES_PAR_JOUR)
+        date = datetime.date.fromordinal(self._origine + jour)
+        heures, reste = divmod(reste, 3600)
+        minutes, secondes = divmod(reste, 60)
+        return Date(
+            jours=date.day,
+            mois=date.month,
+            annees=date.year,
+            heures=heures,
+            minutes=minutes,
+            secondes=secondes,
+        )
+
+    def _decale(self, instant: int, duree: Duree) -> int:
+        """Instant décalé de duree en temps calendaire, les mois et années suivant le calendrier."""
+        if not duree.mois and not duree.annees:
+            return instant + duree._secondes
+        jour, reste = divmod(instant, _SECONDES_PAR_JOUR)
+        date = datetime.date.fromordinal(self._origine + jour)
+        annees, mois = divmod(date.month - 1 + duree.mois + 12 * duree.annees, 12)
+        annees, mois = date.year + annees, mois + 1
+        jours = min(date.day, calendar.monthrange(annees, mois)[1])
+        jour = datetime.date(annees, mois, jours).toordinal() - self._origine
+        fixes = duree._secondes - (30 * duree.mois + 365 * duree.annees) * _SECONDES_PAR_JOUR
+        return jour * _SECONDES_PAR_JOUR + reste + fixes
+
+    def _position(self, instant: int) -> int:
+        """Secondes ouvrées écoulées entre l'origine et instant."""
+        self._couvre_instant(instant)
+        k = bisect_right(self._debuts, instant) - 1
+        if k < 0:
+            return 0
+        return self._cumuls[k] + min(instant, self._fins[k]) - self._debuts[k]
+
+    def _debut(self, instant: int) -> int:
+        """Premier instant ouvré à partir de instant."""
+        position = self._position(instant)
+        self._couvre_position(position + 1)
+        k = bisect_right(self._cumuls_fin, position)
+        return max(instant, self._debuts[k] + position - self._cumuls[k])
+
+    def _fin(self, instant: int, duree: Duree) -> int:
+        """Instant où duree s'est écoulée en temps ouvré depuis instant."""
+        position = self._position(instant) + self._decale(instant, duree) - instant
+        self._couvre_position(position)
+        k = bisect_left(self._cumuls_fin, position)
+        return max(instant, self._fins[k] - (self._cumuls_fin[k] - position))
+
+    def debut_ouvre(self, date: Date) -> Date:
+        """Renvoie la date elle-même si elle est ouvrée, sinon le début de la plage ouvrée suivante."""
+        return self._en_date(self._debut(self._en_secondes(date)))
+
+    def ajoute(self, date: Date, duree: Duree) -> Date:
+        """Renvoie la date de fin d'un travail de durée ouvrée duree commencé à date."""
+        return self._en_date(self._fin(self._en_secondes(date), duree))
+
+    def duree_ouvree(self, debut: Date, fin: Date) -> Duree:
+        """Renvoie le temps ouvré entre deux dates."""
+        ecart = self._position(self._en_secondes(fin)) - self._position(
+            self._en_secondes(debut)
+        )
+        if ecart < 0:
+            raise ValueError("La date de fin précède la date de début.")
+        return Duree._depuis_secondes(ecart)
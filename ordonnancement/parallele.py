@@ -0,0 +1,143 @@
+#! /usr/bin/env python
+# -*- coding: utf-8 -*-
+"""Description.
+
+Lecture d'un problème réparti sur plusieurs processus.
+
+Les lignes sont découpées en blocs analysés par un groupe de processus. Chaque processus
+renvoie les tâches de son bloc en colonnes (noms, composantes des durées, prérequis) plutôt
+qu'en objets Tache, bien moins coûteux à transmettre. Le processus principal reconstruit
+les tâches sans refaire leurs contrôles, puis vérifie en une fois les noms en double
+et les prérequis manquants, comme Probleme.par_lignes.
+
+Seuls quelques blocs sont en cours d'analyse à la fois : la mémoire ne dépend pas
+de la taille du fichier lu.
+"""
+import itertools
+import sys
+from collections import deque
+from concurrent.futures import Executor, ProcessPoolExecutor
+from typing import Any, Dict, Generator, Iterable, List, Tuple
+import numpy as np
+from .probleme import Probleme, Tache, Prerequis
+from .binaire import (
+    _FACTEURS,
+    _TYPES,
+    _composantes,
+    _construit_durees,
+    _sans_controle,
+    _sans_ramasse_miettes,
+)
+
+LIGNES_PAR_BLOC = 20000
+
+## Tâches d'un bloc en colonnes.
+Bloc = Dict[str, Any]
+
+
+def _decoupe(
+    lignes: Iterable[str], taille: int
+) -> Generator[Tuple[int, List[str]], None, None]:
+    """Découpe les lignes en blocs, avec le numéro de leur première ligne."""
+    iterateur = iter(lignes)
+    premiere = 1
+    while True:
+        bloc = list(itertools.islice(iterateur, taille))
+        if not bloc:
+            return
+        yield premiere, bloc
+        premiere += len(bloc)
+
+
+def _analyse(bloc: Tuple[int, List[str]]) -> Bloc:
+    """Analyse un bloc de lignes et renvoie ses tâches en colonnes."""
+    premiere, lignes = bloc
+    with _sans_ramasse_miettes():
+        numerotees = list(Probleme._lit(lignes, premiere))
+    taches = [tache for _, tache in numerotees]
+    prerequis = [prerequis for tache in taches for prerequis in tache.prerequis]
+    return {
+        "numeros": np.asarray([numero for numero, _ in numerotees], dtype=np.int64),
+        "noms": "\n".join(tache.nom for tache in taches),
+        "correspondances": "\n".join(tache.correspondance for tache in taches),
+        "durees": _composantes([tache.duree for tache in taches]),
+        "nb_prerequis": np.asarray([len(tache.prerequis) for tache in taches], dtype=np.int64),
+        "prerequis": "\n".join(prerequis.nom for prerequis in prerequis),
+        "types": np.asarray(
+            [_TYPES.index(prerequis.typ) for prerequis in prerequis], dtype=np.uint8
+        ),
+        "latences": _composantes([prerequis.latence for prerequis in prerequis]),
+    }
+
+
+def _reconstruit(bloc: Bloc) -> Generator[Tuple[int, Tache], None, None]:
+    """Tâches d'un bloc analysé, avec le numéro de leur ligne."""
+    numeros = bloc["numeros"].tolist()
+    if not numeros:
+        return
+    noms = [sys.intern(nom) for nom in bloc["noms"].split("\n")]
+    correspondances = bloc["correspondances"].split("\n")
+    durees = _construit_durees(bloc["durees"], bloc["durees"] @ _FACTEURS)
+    latences = _construit_durees(bloc["latences"], bloc["latences"] @ _FACTEURS)
+    noms_prerequis = (
+        [sys.intern(nom) for nom in bloc["prerequis"].split("\n")] if latences else []
+    )
+    typs = [_TYPES[typ] for typ in bloc["types"].tolist()]
+    debut = 0
+    for i, nombre in enumerate(bloc["nb_prerequis"].tolist()):
+        prerequis = [
+            _sans_controle(
+                Prerequis,
+                nom=noms_prerequis[k],
+                typ=typs[k],
+                latence=latences[k],
+            )
+            for k in range(debut, debut + nombre)
+        ]
+        debut += nombre
+        yield numeros[i], _sans_controle(
+            Tache,
+            nom=noms[i],
+            duree=durees[i],
+            prerequis=prerequis,
+            correspondance=correspondances[i],
+            estimation=None,
+        )
+
+
+def _analyse_blocs(
+    groupe: Executor, blocs: Iterable[Tuple[int, List[str]]], en_cours: int
+) -> Generator[Bloc, None, None]:
+    """Analyse les blocs dans l'ordre, avec au plus en_cours blocs soumis à la fois."""
+    attente = deque()
+    for bloc in blocs:
+        attente.append(groupe.submit(_analyse, bloc))
+        if len(attente) >= en_cours:
+            yield attente.popleft().result()
+    while attente:
+        yield attente.popleft().result()
+
+
+def par_lignes_paralleles(
+    lignes: Iterable[str], processus: int, lignes_par_bloc: int = LIGNES_PAR_BLOC
+) -> Probleme:
+    """Équivalent de Probleme.par_lignes dont l'analyse est répartie sur plusieurs processus.
+
+        >>> with open("export.txt", encoding="utf-8") as fichier:
+        ...     probleme = par_lignes_paralleles(fichier, processus=8)
+
+    Une erreur d'analyse indique le numéro de sa ligne, comme en lecture séquentielle.
+    """
+    if processus < 1:
+        raise ValueError("Le nombre de processus doit être strictement positif.")
+    if lignes_par_bloc < 1:
+        raise ValueError("Le nombre de lignes par bloc doit être strictement positif.")
+    groupe = ProcessPoolExecutor(processus)
+    try:
+        blocs = _analyse_blocs(groupe, _decoupe(lignes, lignes_par_bloc), 2 * processus)
+        with _sans_ramasse_miettes():
+            return Probleme._assemble(
+                numerotee for bloc in blocs for numerotee in _reconstruit(bloc)
+            )
+    finally:
+        groupe.shutdown(cancel_futures=True)
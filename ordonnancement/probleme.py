@@ -5,18 +5,80 @@
 Classes Tache, Duree, Prerequis et Probleme permettant de décrire le problème d'ordonnancement.
 
 """
-from typing import Any, Dict, List, Union, Generator, Tuple, Optional
-from dataclasses import dataclass
-from rich.table import Table
-from pendulum import duration
+from typing import Any, Dict, List, Union, Generator, Iterable, Tuple, Optional, TYPE_CHECKING
+from dataclasses import dataclass, field
+from contextvars import ContextVar
 import functools
+import gzip
+import sys
+
+if TYPE_CHECKING:
+    from rich.table import Table
+    from pendulum import Duration
 
 Nom = str
 Typ = str
 Correspondance = str
 
+## Conversion en secondes, mêmes conventions que Pendulum.
+_SECONDES_PAR_MINUTE = 60
+_SECONDES_PAR_HEURE = 3600
+_SECONDES_PAR_JOUR = 86400
+_JOURS_PAR_SEMAINE = 7
+_JOURS_PAR_MOIS = 30
+_JOURS_PAR_ANNEE = 365
+
+_TEMPORALITES = frozenset(
+    ("secondes", "minutes", "heures", "jours", "semaines", "mois", "annees")
+)
+
+## Compteurs de conversions Pendulum de l'instrumentation active dans ce contexte, None sinon.
+_conversions_comptees: ContextVar[Optional[Dict[str, int]]] = ContextVar(
+    "conversions_comptees", default=None
+)
+
+## Nombre maximal de durées partagées ; au-delà, les nouvelles valeurs ne sont plus retenues.
+_TAILLE_MAX_INTERNEES = 4096
+
+## Nombre de textes de durée ou de date dont l'analyse est conservée.
+_TAILLE_CACHE_ANALYSES = 4096
+
+## Rang de chaque unité dans les composantes d'une durée, des secondes aux années.
+_UNITES = {
+    "seconde": 0,
+    "secondes": 0,
+    "minute": 1,
+    "minutes": 1,
+    "heure": 2,
+    "heures": 2,
+    "jour": 3,
+    "jours": 3,
+    "semaine": 4,
+    "semaines": 4,
+    "mois": 5,
+    "an": 6,
+    "ans": 6,
+    "annee": 6,
+    "annees": 6,
+}
+
+
+def _en_secondes(secondes, minutes, heures, jours, semaines, mois, annees):
+    """Calcule la durée totale en secondes."""
+    return (
+        secondes
+        + minutes * _SECONDES_PAR_MINUTE
+        + heures * _SECONDES_PAR_HEURE
+        + (
+            jours
+            + semaines * _JOURS_PAR_SEMAINE
+            + mois * _JOURS_PAR_MOIS
+            + annees * _JOURS_PAR_ANNEE
+        )
+        * _SECONDES_PAR_JOUR
+    )
+
 
-@dataclass
 class Duree:
     """Représente une durée
         >>> ma_duree_bis=Duree.par_str("56 annees + 23 jours + 34 semaines + 32 secondes")
@@ -30,38 +92,131 @@ class Duree:
         >>> ma_duree-ma_duree_bis
     Duree(Aucune durée)
         >>> ma_duree["secondes"]
-    32"""
-
-    def __init__(
-        self, secondes=0, minutes=0, heures=0, jours=0, semaines=0, mois=0, annees=0
+    32
+
+    La durée totale en secondes est calculée une seule fois à la construction,
+    avec les mêmes conventions que Pendulum (un mois vaut 30 jours, une année 365 jours).
+    Les comparaisons et le hachage se font sur cette valeur entière.
+
+    Une durée est immuable. Le constructeur et par_str renvoient la même instance
+    pour les mêmes composantes, dans la limite de _TAILLE_MAX_INTERNEES valeurs :
+        >>> Duree(jours=1) is Duree.par_str("1 jour")
+    True"""
+
+    __slots__ = (
+        "secondes",
+        "minutes",
+        "heures",
+        "jours",
+        "semaines",
+        "mois",
+        "annees",
+        "_secondes",
+    )
+
+    ## Durées partagées, par composantes.
+    _internees: Dict[Tuple[int, ...], "Duree"] = dict()
+
+    def __new__(
+        cls, secondes=0, minutes=0, heures=0, jours=0, semaines=0, mois=0, annees=0
     ):
 
-        ## Construction de l'objet.
-        self.secondes = secondes
-        self.minutes = minutes
-        self.heures = heures
-        self.jours = jours
-        self.semaines = semaines
-        self.mois = mois
-        self.annees = annees
-
-        ## Dict sur les temps.
-        self._temps = dict()
-        self._temps["secondes"] = self.secondes
-        self._temps["minutes"] = self.minutes
-        self._temps["heures"] = self.heures
-        self._temps["jours"] = self.jours
-        self._temps["semaines"] = self.semaines
-        self._temps["mois"] = self.mois
-        self._temps["annees"] = self.annees
-
         ## Verification si les valeurs ne sont pas négatifs.
-        for clefs in self._temps.keys():
-            if self._temps[clefs] < 0:
-                raise ValueError("Vous devez indiquer des durées positifs.")
+        if (
+            secondes < 0
+            or minutes < 0
+            or heures < 0
+            or jours < 0
+            or semaines < 0
+            or mois < 0
+            or annees < 0
+        ):
+            raise ValueError("Vous devez indiquer des durées positifs.")
+        return cls._interne(secondes, minutes, heures, jours, semaines, mois, annees)
+
+    @classmethod
+    def _interne(cls, secondes, minutes, heures, jours, semaines, mois, annees) -> "Duree":
+        """Renvoie l'instance partagée de ces composantes, créée au besoin."""
+        cle = (secondes, minutes, heures, jours, semaines, mois, annees)
+        try:
+            return cls._internees[cle]
+        except KeyError:
+            pass
+        ## Valeur canonique servant aux comparaisons.
+        duree = cls._construit(
+            secondes,
+            minutes,
+            heures,
+            jours,
+            semaines,
+            mois,
+            annees,
+            _en_secondes(secondes, minutes, heures, jours, semaines, mois, annees),
+        )
+        if len(cls._internees) < _TAILLE_MAX_INTERNEES:
+            cls._internees[cle] = duree
+        return duree
 
-    def _convertit_duration(self) -> duration:
+    @classmethod
+    def _construit(
+        cls, secondes, minutes, heures, jours, semaines, mois, annees, total
+    ) -> "Duree":
+        """Construit une durée déjà vérifiée sans refaire les contrôles ni la partager."""
+        duree = object.__new__(cls)
+        _ecrit_secondes(duree, secondes)
+        _ecrit_minutes(duree, minutes)
+        _ecrit_heures(duree, heures)
+        _ecrit_jours(duree, jours)
+        _ecrit_semaines(duree, semaines)
+        _ecrit_mois(duree, mois)
+        _ecrit_annees(duree, annees)
+        _ecrit_total(duree, total)
+        return duree
+
+    def __setattr__(self, nom: str, valeur: Any):
+        """Une durée est immuable."""
+        raise AttributeError("Une durée ne peut pas être modifiée.")
+
+    def __delattr__(self, nom: str):
+        """Une durée est immuable."""
+        raise AttributeError("Une durée ne peut pas être modifiée.")
+
+    def __reduce__(self):
+        """Sérialisation par pickle et copy, qui ne passe pas par __setattr__."""
+        return (
+            Duree._interne,
+            (
+                self.secondes,
+                self.minutes,
+                self.heures,
+                self.jours,
+                self.semaines,
+                self.mois,
+                self.annees,
+            ),
+        )
+
+    @classmethod
+    def _depuis_secondes(cls, total: int) -> "Duree":
+        """Décompose une durée en secondes, de l'année à la seconde."""
+        annees, reste = divmod(total, _JOURS_PAR_ANNEE * _SECONDES_PAR_JOUR)
+        mois, reste = divmod(reste, _JOURS_PAR_MOIS * _SECONDES_PAR_JOUR)
+        semaines, reste = divmod(reste, _JOURS_PAR_SEMAINE * _SECONDES_PAR_JOUR)
+        jours, reste = divmod(reste, _SECONDES_PAR_JOUR)
+        heures, reste = divmod(reste, _SECONDES_PAR_HEURE)
+        minutes, secondes = divmod(reste, _SECONDES_PAR_MINUTE)
+        return cls._construit(
+            secondes, minutes, heures, jours, semaines, mois, annees, total
+        )
+
+    def _convertit_duration(self) -> "Duration":
         """Renvoie le temps sous forme d'objet Duration"""
+        from pendulum import duration
+
+        compteur = _conversions_comptees.get()
+        if compteur is not None:
+            compteur["Duree vers Duration"] += 1
+
         return duration(
             days=self.jours,
             seconds=self.secondes,
@@ -73,7 +228,7 @@ class Duree:
         )
 
     @classmethod
-    def _convertit_duree(cls, duration: duration) -> "Duree":
+    def _convertit_duree(cls, duration: "Duration") -> "Duree":
         """Convertit un objet duration en objet Duree."""
         return Duree(
             secondes=duration.seconds,
@@ -92,7 +247,7 @@ class Duree:
 
     def _retourne_temps_calculee(self) -> str:
         """Retourne la durée re-travaillée sous forme de message."""
-        if self == Duree():
+        if not self._secondes:
             return "Débute au temps 0"
         else:
             temps_brut = self._convertit_duration()
@@ -100,7 +255,7 @@ class Duree:
 
     def _retourne_temps_brut(self) -> str:
         "Retourne la durée brute sous forme de message"
-        if self == Duree():
+        if not self._secondes:
             return "0"
         else:
             message = ""
@@ -110,14 +265,19 @@ class Duree:
 
     def add(self, autre: Any) -> "Duree":
         """Additionne les durées de deux objets Duree"""
-        return Duree(
-            secondes=self.secondes + autre.secondes,
-            minutes=self.minutes + autre.minutes,
-            heures=self.heures + autre.heures,
-            jours=self.jours + autre.jours,
-            semaines=self.semaines + autre.semaines,
-            mois=self.mois + autre.mois,
-            annees=self.annees + autre.annees,
+        if not autre._secondes:
+            return self
+        if not self._secondes:
+            return autre
+        return Duree._construit(
+            self.secondes + autre.secondes,
+            self.minutes + autre.minutes,
+            self.heures + autre.heures,
+            self.jours + autre.jours,
+            self.semaines + autre.semaines,
+            self.mois + autre.mois,
+            self.annees + autre.annees,
+            self._secondes + autre._secondes,
         )
 
     def temps(self) -> Dict:
@@ -145,7 +305,7 @@ class Duree:
             raise ValueError(
                 "Vous ne pouvez comparer l'égalité entre des types d'objets différents"
             )
-        return self._convertit_duration() == autre._convertit_duration()
+        return self._secondes == autre._secondes
 
     def __ne__(self, autre: Any) -> bool:
         """Inégalite."""
@@ -153,7 +313,7 @@ class Duree:
             raise ValueError(
                 "Vous ne pouvez comparer l'inégalité entre des types d'objets différents"
             )
-        return self._convertit_duration() != autre._convertit_duration()
+        return self._secondes != autre._secondes
 
     def __ge__(self, autre: Any) -> bool:
         """Supériorité"""
@@ -161,7 +321,7 @@ class Duree:
             raise ValueError(
                 "Vous ne pouvez comparer la supériorité entre des types d'objets différents"
             )
-        return self._convertit_duration() >= autre._convertit_duration()
+        return self._secondes >= autre._secondes
 
     def __gt__(self, autre: Any) -> bool:
         """Supériorité stricte"""
@@ -169,7 +329,7 @@ class Duree:
             raise ValueError(
                 "Vous ne pouvez comparer la supériorité stricte entre des types d'objets différents"
             )
-        return self._convertit_duration() > autre._convertit_duration()
+        return self._secondes > autre._secondes
 
     def __le__(self, autre: Any) -> bool:
         """Infériorité"""
@@ -177,7 +337,7 @@ class Duree:
             raise ValueError(
                 "Vous ne pouvez comparer l'infériorité entre des types d'objets différents"
             )
-        return self._convertit_duration() <= autre._convertit_duration()
+        return self._secondes <= autre._secondes
 
     def __lt__(self, autre: Any) -> bool:
         """Infériorité stricte"""
@@ -185,29 +345,28 @@ class Duree:
             raise ValueError(
                 "Vous ne pouvez comparer l'infériorité stricte entre des types d'objets différents"
             )
-        return self._convertit_duration() < autre._convertit_duration()
+        return self._secondes < autre._secondes
+
+    def __hash__(self) -> int:
+        """Hachage cohérent avec l'égalité."""
+        return hash(self._secondes)
 
     def __add__(self, autre: Any) -> "Duree":
         """Additionne deux durées."""
         return self.add(autre)
 
     def __sub__(self, autre: Any) -> "Duree":
-        """Soustrait deux durées."""
-        return Duree(
-            secondes=self.secondes - autre.secondes,
-            minutes=self.minutes - autre.minutes,
-            heures=self.heures - autre.heures,
-            jours=self.jours - autre.jours,
-            semaines=self.semaines - autre.semaines,
-            mois=self.mois - autre.mois,
-            annees=self.annees - autre.annees,
-        )
+        """Soustrait deux durées, sur leurs totaux en secondes."""
+        total = self._secondes - autre._secondes
+        if total < 0:
+            raise ValueError("Vous devez indiquer des durées positifs.")
+        return Duree._depuis_secondes(total)
 
     def __repr__(self) -> str:
         """Renvoie la liste de construction."""
         i = 0
         message = ""
-        if self == Duree():
+        if not self._secondes:
             message = "Aucune durée"
         else:
             for temps in self.temps():
@@ -220,50 +379,55 @@ class Duree:
 
     def __getitem__(self, temps: str) -> int:
         """Accès aux valeurs des temporalités."""
-        return self._temps[temps]
+        if temps not in _TEMPORALITES:
+            raise KeyError(temps)
+        return getattr(self, temps)
 
     @classmethod
     def par_str(cls, message: str) -> "Duree":
-        """Constructeur alternatif pour la classe Duree."""
-        duree = Duree()
-        for temps in message.split("+"):
-            valeur, type_temps = temps.split()
-            try:
-                valeur_valide = int(valeur)
-            except ValueError:
-                raise ValueError(f"La valeur {valeur} n'est pas numérique")
-            duree = duree.add(cls._traite_methode(valeur_valide, type_temps.strip()))
-        return duree
-
-    @staticmethod
-    def _traite_methode(valeur: int, type_temps: str) -> "Duree":
-        """Aide au constructeur alternatif"""
-        if type_temps == "secondes" or type_temps == "seconde":
-            return Duree(secondes=valeur)
-        if type_temps == "minutes" or type_temps == "minute":
-            return Duree(minutes=valeur)
-        if type_temps == "heures" or type_temps == "heure":
-            return Duree(heures=valeur)
-        if type_temps == "jours" or type_temps == "jour":
-            return Duree(jours=valeur)
-        if type_temps == "semaines" or type_temps == "semaine":
-            return Duree(semaines=valeur)
-        if type_temps == "mois":
-            return Duree(mois=valeur)
-        if (
-            type_temps == "annee"
-            or type_temps == "annees"
-            or type_temps == "ans"
-            or type_temps == "an"
-        ):
-            return Duree(annees=valeur)
-        else:
+        """Constructeur alternatif pour la classe Duree.
+
+        Les analyses des derniers textes lus sont conservées : un texte déjà rencontré
+        renvoie directement la durée partagée correspondante."""
+        return _analyse_duree(message)
+
+
+@functools.lru_cache(maxsize=_TAILLE_CACHE_ANALYSES)
+def _analyse_duree(message: str) -> Duree:
+    """Analyse un texte de durée en une passe, sans durée intermédiaire par terme."""
+    composantes = [0] * 7
+    for temps in message.split("+"):
+        valeur, type_temps = temps.split()
+        try:
+            valeur_valide = int(valeur)
+        except ValueError:
+            raise ValueError(f"La valeur {valeur} n'est pas numérique")
+        rang = _UNITES.get(type_temps)
+        if rang is None:
             raise ValueError(f"Le type de temps {type_temps} n'est pas valide.")
+        if valeur_valide < 0:
+            raise ValueError("Vous devez indiquer des durées positifs.")
+        composantes[rang] += valeur_valide
+    return Duree._interne(*composantes)
+
+
+## Écriture directe des champs, Duree.__setattr__ interdisant toute modification.
+_ecrit_secondes = Duree.secondes.__set__
+_ecrit_minutes = Duree.minutes.__set__
+_ecrit_heures = Duree.heures.__set__
+_ecrit_jours = Duree.jours.__set__
+_ecrit_semaines = Duree.semaines.__set__
+_ecrit_mois = Duree.mois.__set__
+_ecrit_annees = Duree.annees.__set__
+_ecrit_total = Duree._secondes.__set__
 
+## Durée nulle, partagée.
+DUREE_NULLE = Duree()
 
-@dataclass
+
+@dataclass(slots=True)
 class Prerequis:
-    """Représente un prérequis"""
+    """Représente un prérequis."""
 
     nom: Nom
     typ: Typ
@@ -289,30 +453,39 @@ class Prerequis:
         if len(message.split("(")) == 2:
             typage, duree = message.split("(")
             typage = typage.strip()
-            for valeur in duree.split(")"):
-                if valeur.strip():
-                    duree_valide = Duree.par_str(valeur)
+            latence, _, suite = duree.partition(")")
+            if not latence.strip() or suite.strip():
+                raise ValueError(
+                    f"La latence du prérequis {message.strip()} est vide ou mal écrite."
+                )
+            duree_valide = Duree.par_str(latence)
         ## Accepte le fait qu'il n'y ait rien remplis pour la durée. La durée sera égale à 0.
         elif len(message.split("(")) == 1:
             typage = message.strip()
-            duree_valide = Duree()
+            duree_valide = DUREE_NULLE
+        else:
+            raise ValueError(f"Le prérequis {message.strip()} contient plusieurs latences.")
         nom_valide, typ_valide = typage.strip().split(" ")
-        return Prerequis(nom=nom_valide, typ=typ_valide, latence=duree_valide)
+        return Prerequis(nom=sys.intern(nom_valide), typ=typ_valide, latence=duree_valide)
 
 
-@dataclass
+@dataclass(slots=True)
 class Tache:
-    """Représente une tâche."""
+    """Représente une tâche.
+
+    [optionnel] estimation décrit l'incertitude sur la durée pour l'analyse de risque,
+    par exemple TroisPoints(optimiste, probable, pessimiste)."""
 
     nom: Nom
     duree: Duree
     prerequis: List[Prerequis]
     correspondance: Optional[Correspondance] = " "
+    estimation: Optional[Any] = field(default=None, repr=False)
 
     def __post_init__(self):
         """Vérifie que la durée d'une tâche est positive."""
         liste_verification = list()
-        if self.duree._convertit_duration() == duration(0):
+        if self.duree._secondes == 0:
             raise ValueError("Veuillez indiquer une durée non nul")
         for prerequis in self.prerequis:
             if prerequis.nom in liste_verification:
@@ -345,7 +518,7 @@ class Tache:
         """Décrit un prérequis sous forme de texte. Les durées sont en format re-calculé"""
         message = ""
         if i == 0:
-            if prerequis.latence == Duree():
+            if not prerequis.latence._secondes:
                 message = prerequis.typ + " de " + prerequis.nom
             else:
                 message = (
@@ -356,7 +529,7 @@ class Tache:
                     + prerequis.latence._retourne_temps_calculee()
                 )
         elif i < borne - 1:
-            if prerequis.latence == Duree():
+            if not prerequis.latence._secondes:
                 message += ", " + prerequis.typ + " de " + prerequis.nom
             else:
                 message += (
@@ -368,7 +541,7 @@ class Tache:
                     + prerequis.latence._retourne_temps_calculee()
                 )
         else:
-            if prerequis.latence == Duree():
+            if not prerequis.latence._secondes:
                 message += " et " + prerequis.typ + " de " + prerequis.nom
             else:
                 message += (
@@ -388,7 +561,7 @@ class Tache:
 
         ## Commencement du message
         if i == 0:
-            if prerequis.latence == Duree():
+            if not prerequis.latence._secondes:
                 message = prerequis.typ + " de " + prerequis.nom
                 i = i + 1
             else:
@@ -402,7 +575,7 @@ class Tache:
                 i = i + 1
         ## Suite du message
         elif i < borne - 1:
-            if prerequis.latence == Duree():
+            if not prerequis.latence._secondes:
                 message += ", " + prerequis.typ + " de " + prerequis.nom
                 i = i + 1
             else:
@@ -417,7 +590,7 @@ class Tache:
                 i = i + 1
         ## Fin de message
         else:
-            if prerequis.latence == Duree():
+            if not prerequis.latence._secondes:
                 message += " et " + prerequis.typ + " de " + prerequis.nom
                 i = i + 1
             else:
@@ -433,6 +606,64 @@ class Tache:
         return message
 
 
+class Registre:
+    """Table des noms de tâches, numérotés de 0 à n - 1 dans l'ordre d'ajout.
+
+    Chaque problème en construit un ; les algorithmes travaillent sur ces identifiants
+    et ne manipulent les noms qu'en entrée et en sortie.
+
+        >>> registre = Registre(["A", "B"])
+        >>> registre["B"]
+    1
+        >>> registre.nom(1)
+    'B'
+    """
+
+    __slots__ = ("_noms", "_indices")
+
+    def __init__(self, noms: Iterable[Nom] = ()):
+        """Numérote les noms donnés."""
+        self._noms: List[Nom] = list()
+        self._indices: Dict[Nom, int] = dict()
+        for nom in noms:
+            self.ajoute(nom)
+
+    def __len__(self) -> int:
+        """Nombre de noms."""
+        return len(self._noms)
+
+    def __contains__(self, nom: Nom) -> bool:
+        """Indique si le nom est enregistré."""
+        return nom in self._indices
+
+    def __iter__(self) -> Generator[Nom, None, None]:
+        """Itère sur les noms, dans l'ordre des identifiants."""
+        yield from self._noms
+
+    def __repr__(self) -> str:
+        """Représentation."""
+        return f"Registre(noms={self._noms!r})"
+
+    def __getitem__(self, nom: Nom) -> int:
+        """Identifiant d'un nom."""
+        try:
+            return self._indices[nom]
+        except KeyError:
+            raise ValueError(f"{nom} n'est pas une tâche existante.")
+
+    def nom(self, indice: int) -> Nom:
+        """Nom d'un identifiant."""
+        return self._noms[indice]
+
+    def ajoute(self, nom: Nom) -> int:
+        """Enregistre un nouveau nom et renvoie son identifiant."""
+        if nom in self._indices:
+            raise ValueError(f"Le nom de tâche {nom} est présent plusieurs fois.")
+        self._indices[nom] = len(self._noms)
+        self._noms.append(nom)
+        return self._indices[nom]
+
+
 class Probleme:
     """Représente un problème d'ordonnancement
 
@@ -507,25 +738,31 @@ class Probleme:
         """Stocke la liste des tâches sous forme de dictionnaire."""
         self._taches: Dict[Nom, Tache] = dict()
         self._correspondances: Dict[Nom, Correspondance] = dict()
+        self._registre = Registre()
         for tache in taches:
-            if tache.nom in self._taches:
-                raise ValueError(
-                    f"Le nom de tâche {tache.nom} est présent plusieurs fois."
-                )
-            self._taches[tache.nom] = tache
-            if tache.correspondance in self._correspondances.keys():
-                raise ValueError(
-                    f"La correspondance {tache.correspondances} est utilisée plusieurs fois."
-                )
-            self._correspondances[tache.nom] = tache.correspondance
+            self._ajoute(tache)
         self._est_valide()
 
+    def _ajoute(self, tache: Tache):
+        """Rajoute une tâche, sans vérifier ses prérequis."""
+        if tache.nom in self._taches:
+            raise ValueError(
+                f"Le nom de tâche {tache.nom} est présent plusieurs fois."
+            )
+        self._taches[tache.nom] = tache
+        self._registre.ajoute(tache.nom)
+        if tache.correspondance in self._correspondances.keys():
+            raise ValueError(
+                f"La correspondance {tache.correspondances} est utilisée plusieurs fois."
+            )
+        self._correspondances[tache.nom] = tache.correspondance
+
     @staticmethod
     def _encode(ligne) -> Tache:
         """Encode une ligne en tâche."""
         prerequis_valide = list()
         nom, duree, prerequis, correspondance = ligne.split("/")
-        nom_valide = nom.strip()
+        nom_valide = sys.intern(nom.strip())
         correspondance_valide = correspondance.strip()
         if duree.strip():
             duree_valide = Duree.par_str(duree)
@@ -550,6 +787,86 @@ class Probleme:
 
         return cls(taches)
 
+    @classmethod
+    def _lit(
+        cls, lignes: Iterable[str], premiere: int = 1
+    ) -> Generator[Tuple[int, Tache], None, None]:
+        """Encode les lignes non vides une à une, avec leur numéro."""
+        for numero, ligne in enumerate(lignes, start=premiere):
+            if not ligne.strip():
+                continue
+            try:
+                yield numero, cls._encode(ligne)
+            except ValueError as erreur:
+                raise ValueError(f"Ligne {numero} : {erreur}") from None
+
+    @classmethod
+    def lit_taches(cls, lignes: Iterable[str]) -> Generator[Tache, None, None]:
+        """Itère sur les tâches décrites par des lignes au format de par_str.
+
+        Les lignes sont lues au fur et à mesure ; une erreur indique le numéro de la ligne.
+        Les prérequis ne sont pas vérifiés."""
+        for _, tache in cls._lit(lignes):
+            yield tache
+
+    @classmethod
+    def par_lignes(cls, lignes: Iterable[str]) -> "Probleme":
+        """Constructeur alternatif à partir de lignes lues au fur et à mesure.
+
+        Un prérequis peut désigner une tâche décrite plus loin : seuls les noms
+        pas encore rencontrés sont gardés en attente jusqu'à la fin."""
+        return cls._assemble(cls._lit(lignes))
+
+    @classmethod
+    def _assemble(cls, taches: Iterable[Tuple[int, Tache]]) -> "Probleme":
+        """Rassemble des tâches numérotées par ligne en vérifiant les noms et les prérequis."""
+        resultat = cls([])
+        en_attente: Dict[Nom, int] = dict()
+        for numero, tache in taches:
+            try:
+                resultat._ajoute(tache)
+            except ValueError as erreur:
+                raise ValueError(f"Ligne {numero} : {erreur}") from None
+            en_attente.pop(tache.nom, None)
+            for prerequis in tache.prerequis:
+                if prerequis.nom not in resultat._taches:
+                    en_attente.setdefault(prerequis.nom, numero)
+        if en_attente:
+            nom, numero = min(en_attente.items(), key=lambda attente: attente[1])
+            raise ValueError(f"Ligne {numero} : {nom} n'est pas une tâche existante.")
+        resultat._est_valide()
+        return resultat
+
+    @classmethod
+    def depuis_fichier(cls, chemin: str, processus: Optional[int] = None) -> "Probleme":
+        """Lit un fichier au format de par_str, ligne par ligne, compressé ou non par gzip.
+
+        [optionnel] processus
+        Nombre de processus analysant en parallèle des blocs de lignes.
+        """
+        with open(chemin, "rb") as fichier:
+            compresse = fichier.read(2) == b"\x1f\x8b"
+        ouvre = gzip.open if compresse else open
+        with ouvre(chemin, "rt", encoding="utf-8") as fichier:
+            if processus is None:
+                return cls.par_lignes(fichier)
+            from .parallele import par_lignes_paralleles
+
+            return par_lignes_paralleles(fichier, processus)
+
+    def vers_binaire(self) -> bytes:
+        """Encode le problème au format binaire du module binaire."""
+        from .binaire import vers_binaire
+
+        return vers_binaire(self)
+
+    @classmethod
+    def par_binaire(cls, donnees: Any) -> "Probleme":
+        """Constructeur alternatif à partir de données écrites par vers_binaire."""
+        from .binaire import depuis_binaire
+
+        return depuis_binaire(donnees, cls)
+
     @property
     def taches(self) -> Generator[Tache, None, None]:
         """Itére sur les tâches."""
@@ -565,12 +882,17 @@ class Probleme:
         """Itére sur les correspondances des tâches"""
         yield from self._correspondances.values()
 
+    @property
+    def registre(self) -> Registre:
+        """Identifiants des tâches, dans l'ordre du problème."""
+        return self._registre
+
     def _est_valide(self):
         """Vérifie que toutes les tâches dans les prérequis existent.
         Vérifie si le type de prérequis est fin ou début."""
         for tache in self.taches:
             for prerequis in tache.prerequis:
-                if prerequis.nom not in self._taches:
+                if prerequis.nom not in self._registre:
                     raise ValueError(f"{prerequis.nom} n'est pas une tâche existante.")
                 if prerequis.typ != "fin" and prerequis.typ != "debut":
                     raise ValueError(
@@ -595,8 +917,10 @@ class Probleme:
         """Accès aux tâches par leurs noms."""
         return self._taches[nom]
 
-    def _genere_table_probleme(self, entier: bool, brute: bool) -> Table:
+    def _genere_table_probleme(self, entier: bool, brute: bool) -> "Table":
         """Renvoie une table rich."""
+        from rich.table import Table
+
         if entier:
             resultat = Table(title="Problème d'ordonnancement")
             resultat.add_column("Tâche")
@@ -645,7 +969,9 @@ class Probleme:
         """Renvoie un dict des correspondances"""
         return self._correspondances
 
-    def _genere_table_correspondance(self) -> Table:
+    def _genere_table_correspondance(self) -> "Table":
+        from rich.table import Table
+
         dictionnaire = self.get_correspondance()
         clefs = dictionnaire.keys()
         resultat = Table(title="Correspondances")
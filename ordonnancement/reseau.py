@@ -0,0 +1,415 @@
+#! /usr/bin/env python
+# -*- coding: utf-8 -*-
+"""Description.
+
+Contient la classe Reseau, forme compilée d'un problème d'ordonnancement.
+
+Les tâches y sont numérotées par des entiers et les prérequis rangés dans des
+tableaux NumPy au format CSR (pour chaque tâche, la plage de ses prérequis).
+Les durées et les latences sont exprimées en secondes.
+La passe avant se fait niveau par niveau de l'ordre topologique, sans objet Python par tâche.
+"""
+import numpy as np
+from typing import Dict, List, Optional, Generator, Tuple
+from .probleme import Nom, Probleme, Duree
+from .edt import Activite, EDT
+from .dag import diagnostique_cycles
+
+TYPE_FIN = 0
+TYPE_DEBUT = 1
+
+## En dessous de cette largeur moyenne de niveau, la boucle scalaire est plus rapide.
+_LARGEUR_MIN_VECTORISEE = 32
+
+## Tableaux qui suffisent à reconstruire un Reseau sans recompiler le graphe.
+_TABLEAUX = (
+    "durees",
+    "indptr",
+    "sources",
+    "types",
+    "latences",
+    "destinations",
+    "successeurs_aretes",
+    "successeurs_indptr",
+    "niveau",
+    "ordre",
+    "ordre_kahn",
+    "position",
+    "niveaux_indptr",
+    "aretes_avant",
+    "sources_avant",
+    "est_fin_avant",
+    "indptr_avant",
+    "aretes_arriere",
+    "sources_arriere",
+    "destinations_arriere",
+    "est_fin_arriere",
+    "degres_sortants",
+    "indptr_arriere",
+)
+
+
+class Reseau:
+    """Problème compilé sous forme de tableaux.
+
+        >>> reseau = Reseau.par_probleme(mon_probleme)
+
+        >>> reseau.noms
+    ['A', 'B', 'C', 'D', 'E']
+
+        >>> reseau.passe_avant()
+    array([        0,  96001200,  96184800, 122113380, 216721380])
+    """
+
+    def __init__(
+        self,
+        noms: List[Nom],
+        durees: np.ndarray,
+        indptr: np.ndarray,
+        sources: np.ndarray,
+        types: np.ndarray,
+        latences: np.ndarray,
+    ):
+        """Compile le graphe à partir des prérequis de chaque tâche.
+
+        Les prérequis de la tâche i sont sources[indptr[i]:indptr[i + 1]].
+        """
+        self.noms: List[Nom] = list(noms)
+        self.indices: Dict[Nom, int] = {nom: i for i, nom in enumerate(self.noms)}
+        self.durees = np.asarray(durees, dtype=np.int64)
+        self.indptr = np.asarray(indptr, dtype=np.int64)
+        self.sources = np.asarray(sources, dtype=np.int64)
+        self.types = np.asarray(types, dtype=np.int8)
+        self.latences = np.asarray(latences, dtype=np.int64)
+        self.destinations = np.repeat(
+            np.arange(len(self.noms), dtype=np.int64), np.diff(self.indptr)
+        )
+        self._genere_successeurs()
+        self._genere_niveaux()
+        self._genere_aretes_avant()
+        self._genere_aretes_arriere()
+
+    def __len__(self) -> int:
+        """Nombre de tâches."""
+        return len(self.noms)
+
+    def __repr__(self) -> str:
+        """Représentation."""
+        return f"Reseau(taches={len(self.noms)}, prerequis={len(self.sources)}, niveaux={self.nb_niveaux})"
+
+    @classmethod
+    def par_probleme(cls, probleme: Probleme) -> "Reseau":
+        """Constructeur alternatif à partir d'un problème."""
+        noms = list(probleme.noms)
+        registre = probleme.registre
+        durees = list()
+        indptr = [0]
+        sources = list()
+        types = list()
+        latences = list()
+        for tache in probleme.taches:
+            durees.append(tache.duree._secondes)
+            for prerequis in tache.prerequis:
+                sources.append(registre[prerequis.nom])
+                types.append(TYPE_FIN if prerequis.typ == "fin" else TYPE_DEBUT)
+                latences.append(prerequis.latence._secondes)
+            indptr.append(len(sources))
+        return cls(noms, durees, indptr, sources, types, latences)
+
+    @classmethod
+    def _depuis_tableaux(cls, noms: List[Nom], tableaux: Dict[str, np.ndarray]) -> "Reseau":
+        """Reconstruit un réseau déjà compilé à partir de ses tableaux, sans les copier."""
+        resultat = cls.__new__(cls)
+        resultat.noms = list(noms)
+        resultat.indices = {nom: i for i, nom in enumerate(resultat.noms)}
+        for nom in _TABLEAUX:
+            setattr(resultat, nom, tableaux[nom])
+        return resultat
+
+    @property
+    def tableaux(self) -> Dict[str, np.ndarray]:
+        """Tableaux du réseau compilé, par nom d'attribut."""
+        return {nom: getattr(self, nom) for nom in _TABLEAUX}
+
+    @property
+    def nb_niveaux(self) -> int:
+        """Nombre de niveaux de l'ordre topologique."""
+        return len(self.niveaux_indptr) - 1
+
+    @property
+    def aretes(self) -> Generator[Tuple[Nom, Nom], None, None]:
+        """Itére sur les prérequis sous forme (prérequis, tâche), dans l'ordre des latences."""
+        for source, destination in zip(self.sources.tolist(), self.destinations.tolist()):
+            yield self.noms[source], self.noms[destination]
+
+    def _genere_successeurs(self):
+        """Range les prérequis par tâche source."""
+        n = len(self.noms)
+        self.successeurs_aretes = np.argsort(self.sources, kind="stable")
+        self.successeurs_indptr = np.zeros(n + 1, dtype=np.int64)
+        np.cumsum(
+            np.bincount(self.sources, minlength=n), out=self.successeurs_indptr[1:]
+        )
+
+    def _genere_niveaux(self):
+        """Algorithme de Kahn : calcule le niveau de chaque tâche et détecte les cycles."""
+        n = len(self.noms)
+        restants = np.diff(self.indptr).tolist()
+        niveau = [0] * n
+        successeurs_indptr = self.successeurs_indptr.tolist()
+        successeurs = self.destinations[self.successeurs_aretes].tolist()
+        file = [i for i in range(n) if restants[i] == 0]
+        for courant in file:
+            suivant = niveau[courant] + 1
+            for k in range(successeurs_indptr[courant], successeurs_indptr[courant + 1]):
+                successeur = successeurs[k]
+                if niveau[successeur] < suivant:
+                    niveau[successeur] = suivant
+                restants[successeur] -= 1
+                if restants[successeur] == 0:
+                    file.append(successeur)
+        if len(file) < n:
+            raise diagnostique_cycles(
+                self.noms,
+                [
+                    successeurs[successeurs_indptr[i] : successeurs_indptr[i + 1]]
+                    for i in range(n)
+                ],
+                [i for i in range(n) if restants[i] > 0],
+            )
+        self.niveau = np.asarray(niveau, dtype=np.int64)
+        ## Ordre de sortie de la file, le même que celui de Graphe et de resous_EDT.
+        self.ordre_kahn = np.asarray(file, dtype=np.int64)
+        self.ordre = np.argsort(self.niveau, kind="stable")
+        self.position = np.empty(n, dtype=np.int64)
+        self.position[self.ordre] = np.arange(n, dtype=np.int64)
+        nb_niveaux = int(self.niveau.max()) + 1 if n else 0
+        self.niveaux_indptr = np.searchsorted(
+            self.niveau[self.ordre], np.arange(nb_niveaux + 1)
+        )
+
+    def _genere_aretes_avant(self):
+        """Range les prérequis dans l'ordre topologique de leur tâche destination."""
+        self.aretes_avant = np.argsort(self.position[self.destinations], kind="stable")
+        self.sources_avant = self.sources[self.aretes_avant]
+        self.est_fin_avant = self.types[self.aretes_avant] == TYPE_FIN
+        degres = np.diff(self.indptr)[self.ordre]
+        self.indptr_avant = np.zeros(len(self.noms) + 1, dtype=np.int64)
+        np.cumsum(degres, out=self.indptr_avant[1:])
+
+    def _genere_aretes_arriere(self):
+        """Range les prérequis dans l'ordre topologique de leur tâche source."""
+        self.aretes_arriere = np.argsort(self.position[self.sources], kind="stable")
+        self.sources_arriere = self.sources[self.aretes_arriere]
+        self.destinations_arriere = self.destinations[self.aretes_arriere]
+        self.est_fin_arriere = self.types[self.aretes_arriere] == TYPE_FIN
+        self.degres_sortants = np.diff(self.successeurs_indptr)[self.ordre]
+        self.indptr_arriere = np.zeros(len(self.noms) + 1, dtype=np.int64)
+        np.cumsum(self.degres_sortants, out=self.indptr_arriere[1:])
+
+    def _est_etroit(self) -> bool:
+        """Indique si les niveaux sont trop étroits pour être vectorisés."""
+        return len(self.noms) < _LARGEUR_MIN_VECTORISEE * max(self.nb_niveaux, 1)
+
+    def passe_avant(
+        self,
+        durees: Optional[np.ndarray] = None,
+        latences: Optional[np.ndarray] = None,
+    ) -> np.ndarray:
+        """Renvoie les débuts au plus tôt de chaque tâche, en secondes.
+
+        [optionnel] durees remplace les durées des tâches, indexées comme noms.
+
+        [optionnel] latences remplace les latences, indexées comme aretes.
+
+        Les deux tableaux peuvent porter des dimensions supplémentaires en tête,
+        par exemple un tirage par ligne ; le résultat a alors ces mêmes dimensions.
+        """
+        durees = self.durees if durees is None else np.asarray(durees, dtype=np.int64)
+        latences = (
+            self.latences if latences is None else np.asarray(latences, dtype=np.int64)
+        )
+        if durees.ndim == 1 and latences.ndim == 1 and self._est_etroit():
+            return self._passe_avant_scalaire(durees, latences)
+        return self._passe_avant_vectorisee(durees, latences)
+
+    def _passe_avant_scalaire(self, durees: np.ndarray, latences: np.ndarray) -> np.ndarray:
+        """Passe avant sur des listes d'entiers, pour les réseaux en longues chaînes."""
+        debuts = [0] * len(self.noms)
+        durees = durees.tolist()
+        latences = latences[self.aretes_avant].tolist()
+        sources = self.sources_avant.tolist()
+        est_fin = self.est_fin_avant.tolist()
+        indptr = self.indptr_avant.tolist()
+        for rang, courant in enumerate(self.ordre.tolist()):
+            demarrage = 0
+            for k in range(indptr[rang], indptr[rang + 1]):
+                source = sources[k]
+                candidat = debuts[source] + latences[k]
+                if est_fin[k]:
+                    candidat += durees[source]
+                if candidat > demarrage:
+                    demarrage = candidat
+            debuts[courant] = demarrage
+        return np.asarray(debuts, dtype=np.int64)
+
+    def _passe_avant_vectorisee(self, durees: np.ndarray, latences: np.ndarray) -> np.ndarray:
+        """Passe avant niveau par niveau."""
+        forme = np.broadcast_shapes(durees.shape[:-1], latences.shape[:-1])
+        debuts = np.zeros(forme + (len(self.noms),), dtype=np.int64)
+        latences = latences[..., self.aretes_avant]
+        for niveau in range(1, self.nb_niveaux):
+            premier, dernier = self.niveaux_indptr[niveau], self.niveaux_indptr[niveau + 1]
+            debut_aretes = self.indptr_avant[premier]
+            fin_aretes = self.indptr_avant[dernier]
+            sources = self.sources_avant[debut_aretes:fin_aretes]
+            candidats = (
+                debuts[..., sources]
+                + latences[..., debut_aretes:fin_aretes]
+                + durees[..., sources] * self.est_fin_avant[debut_aretes:fin_aretes]
+            )
+            debuts[..., self.ordre[premier:dernier]] = np.maximum.reduceat(
+                candidats,
+                self.indptr_avant[premier:dernier] - debut_aretes,
+                axis=-1,
+            )
+        return debuts
+
+    def passe_arriere(
+        self,
+        debuts: np.ndarray,
+        durees: Optional[np.ndarray] = None,
+        latences: Optional[np.ndarray] = None,
+    ) -> np.ndarray:
+        """Renvoie les débuts au plus tard de chaque tâche, en secondes.
+
+        debuts sont les débuts au plus tôt renvoyés par passe_avant pour les mêmes durées et latences.
+        La fin du projet est la plus tardive des fins au plus tôt.
+        Mêmes dimensions supplémentaires que passe_avant.
+        """
+        durees = self.durees if durees is None else np.asarray(durees, dtype=np.int64)
+        latences = (
+            self.latences if latences is None else np.asarray(latences, dtype=np.int64)
+        )
+        debuts = np.asarray(debuts, dtype=np.int64)
+        if debuts.ndim == 1 and self._est_etroit():
+            return self._passe_arriere_scalaire(debuts, durees, latences)
+        return self._passe_arriere_vectorisee(debuts, durees, latences)
+
+    def _passe_arriere_scalaire(
+        self, debuts: np.ndarray, durees: np.ndarray, latences: np.ndarray
+    ) -> np.ndarray:
+        """Passe arrière sur des listes d'entiers."""
+        if not len(self.noms):
+            return debuts.copy()
+        fin_projet = int((debuts + durees).max())
+        durees = durees.tolist()
+        tard = [fin_projet - duree for duree in durees]
+        latences = latences[self.aretes_arriere].tolist()
+        destinations = self.destinations_arriere.tolist()
+        est_fin = self.est_fin_arriere.tolist()
+        indptr = self.indptr_arriere.tolist()
+        ordre = self.ordre.tolist()
+        for rang in range(len(ordre) - 1, -1, -1):
+            courant = ordre[rang]
+            limite = tard[courant]
+            for k in range(indptr[rang], indptr[rang + 1]):
+                candidat = tard[destinations[k]] - latences[k]
+                if est_fin[k]:
+                    candidat -= durees[courant]
+                if candidat < limite:
+                    limite = candidat
+            tard[courant] = limite
+        return np.asarray(tard, dtype=np.int64)
+
+    def _passe_arriere_vectorisee(
+        self, debuts: np.ndarray, durees: np.ndarray, latences: np.ndarray
+    ) -> np.ndarray:
+        """Passe arrière niveau par niveau, du dernier au premier."""
+        if not len(self.noms):
+            return debuts.copy()
+        fins = debuts + durees
+        tard = fins.max(axis=-1, keepdims=True) - durees
+        tard = np.broadcast_to(tard, fins.shape).copy()
+        latences = latences[..., self.aretes_arriere]
+        for niveau in range(self.nb_niveaux - 1, -1, -1):
+            premier, dernier = self.niveaux_indptr[niveau], self.niveaux_indptr[niveau + 1]
+            debut_aretes = self.indptr_arriere[premier]
+            fin_aretes = self.indptr_arriere[dernier]
+            if debut_aretes == fin_aretes:
+                continue
+            candidats = (
+                tard[..., self.destinations_arriere[debut_aretes:fin_aretes]]
+                - latences[..., debut_aretes:fin_aretes]
+                - durees[..., self.sources_arriere[debut_aretes:fin_aretes]]
+                * self.est_fin_arriere[debut_aretes:fin_aretes]
+            )
+            avec_successeurs = self.degres_sortants[premier:dernier] > 0
+            noeuds = self.ordre[premier:dernier][avec_successeurs]
+            tard[..., noeuds] = np.minimum(
+                tard[..., noeuds],
+                np.minimum.reduceat(
+                    candidats,
+                    (self.indptr_arriere[premier:dernier] - debut_aretes)[
+                        avec_successeurs
+                    ],
+                    axis=-1,
+                ),
+            )
+        return tard
+
+
+class VueEDT:
+    """Emploi du temps en colonnes, sans objet Activite par tâche.
+
+        >>> vue = resous_EDT_vectoriel(mon_probleme, colonnes=True)
+
+        >>> vue["B"]
+    Activite(tache=Tache(nom='B', ...), debut=Duree(annees=3, semaines=2, jours=2, heures=3), fin=Duree(annees=3, mois=1, jours=4, heures=3))
+
+        >>> vue.vers_EDT() == resous_EDT_vectoriel(mon_probleme)
+    True
+    """
+
+    def __init__(
+        self, probleme: Probleme, reseau: Reseau, debuts: np.ndarray, fins: np.ndarray
+    ):
+        """Stocke les débuts et fins en secondes, indexés comme les noms du réseau."""
+        self.probleme = probleme
+        self.reseau = reseau
+        self.debuts = debuts
+        self.fins = fins
+
+    def __len__(self) -> int:
+        """Nombre d'activités."""
+        return len(self.reseau)
+
+    def __repr__(self) -> str:
+        """Représentation."""
+        return f"VueEDT(activites={len(self)})"
+
+    @property
+    def noms(self) -> Generator[Nom, None, None]:
+        """Itére sur les noms dans l'ordre topologique de resous_EDT."""
+        for indice in self.reseau.ordre_kahn.tolist():
+            yield self.reseau.noms[indice]
+
+    def __getitem__(self, nom: Nom) -> Activite:
+        """Accède à une activité par son nom de tâche."""
+        try:
+            indice = self.reseau.indices[nom]
+        except KeyError:
+            raise ValueError("Pas d'activité avec ce nom de tâche.")
+        return self._activite(indice)
+
+    def _activite(self, indice: int) -> Activite:
+        """Construit l'activité d'une tâche."""
+        return Activite(
+            tache=self.probleme[self.reseau.noms[indice]],
+            debut=Duree._depuis_secondes(int(self.debuts[indice])),
+            fin=Duree._depuis_secondes(int(self.fins[indice])),
+        )
+
+    def vers_EDT(self) -> EDT:
+        """Construit l'emploi du temps complet, dans l'ordre de resous_EDT."""
+        return EDT(activites=[self._activite(i) for i in self.reseau.ordre_kahn.tolist()])
@@ -0,0 +1,689 @@
+#! /usr/bin/env python
+# -*- coding: utf-8 -*-
+"""Description.
+
+Contient l'analyse de risque par tirages de Monte-Carlo (méthode PERT).
+
+Chaque tâche peut porter une estimation de sa durée :
+    - TroisPoints : durées optimiste, probable et pessimiste, tirées selon une loi PERT ou triangulaire.
+    - Loi : n'importe quelle loi du générateur NumPy, avec des paramètres en Duree ou en nombres.
+Les tâches sans estimation gardent leur durée.
+
+Les tirages sont faits par blocs, sous forme de matrice (tirages x tâches),
+et les passes avant et arrière du Reseau traitent tous les tirages d'un bloc à la fois.
+Les fins de chaque tâche sont résumées dans un histogramme par tâche,
+ce qui donne des centiles à la largeur d'une classe près quel que soit le nombre de tirages.
+Les classes couvrent l'étendue des fins, obtenue par des passes avant
+sur les durées minimales et maximales des estimations. Cette étendue est exacte
+pour TroisPoints ; pour une Loi, qui peut ne pas être bornée, elle est estimée
+par des tirages pilotes. Deux classes ouvertes reçoivent les fins qui en sortent
+et s'étendent jusqu'aux fins extrêmes effectivement tirées.
+
+Les blocs peuvent être répartis entre plusieurs processus. Les tableaux du réseau
+et des estimations sont alors placés en mémoire partagée plutôt que copiés dans
+chaque processus, et chaque bloc garde sa propre graine : le résultat ne dépend
+pas du nombre de processus.
+"""
+import numpy as np
+from abc import ABC, abstractmethod
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import shared_memory
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Mapping, Optional, Sequence, Tuple, Union, TYPE_CHECKING
+from .probleme import Nom, Probleme, Duree
+from .calendrier import Date
+from .reseau import Reseau
+
+if TYPE_CHECKING:
+    from rich.table import Table
+
+## Nombre maximal de cases d'une matrice de tirages (tirages x tâches) par bloc.
+_CASES_PAR_BLOC = 1 << 22
+
+## Nombre de tirages pilotes qui estiment l'étendue d'une loi non bornée.
+_TIRAGES_PILOTES = 10000
+
+
+class Estimation(ABC):
+    """Estimation de la durée d'une tâche."""
+
+    @abstractmethod
+    def tire(self, generateur: np.random.Generator, nombre: int) -> np.ndarray:
+        """Renvoie nombre durées tirées, en secondes."""
+
+    @abstractmethod
+    def etendue(self) -> Tuple[int, int]:
+        """Durées minimale et maximale attendues des tirages, en secondes."""
+
+
+@dataclass
+class TroisPoints(Estimation):
+    """Estimation à trois points.
+
+        >>> TroisPoints(Duree(jours=2), Duree(jours=3), Duree(jours=6))
+    TroisPoints(optimiste=Duree(jours=2), probable=Duree(jours=3), pessimiste=Duree(jours=6), loi='pert')
+
+    loi vaut "pert" (loi bêta-PERT) ou "triangulaire".
+    """
+
+    optimiste: Duree
+    probable: Duree
+    pessimiste: Duree
+    loi: str = "pert"
+
+    def __post_init__(self):
+        """Vérifie l'ordre des durées et la loi."""
+        if not self.optimiste <= self.probable <= self.pessimiste:
+            raise ValueError(
+                "Les durées doivent respecter optimiste <= probable <= pessimiste."
+            )
+        if self.loi != "pert" and self.loi != "triangulaire":
+            raise ValueError("La loi doit-être 'pert' ou 'triangulaire'")
+
+    @property
+    def bornes(self) -> Tuple[int, int, int]:
+        """Durées optimiste, probable et pessimiste en secondes."""
+        return self.optimiste._secondes, self.probable._secondes, self.pessimiste._secondes
+
+    def etendue(self) -> Tuple[int, int]:
+        """Durées optimiste et pessimiste en secondes, bornes exactes des tirages."""
+        return self.optimiste._secondes, self.pessimiste._secondes
+
+    def tire(self, generateur: np.random.Generator, nombre: int) -> np.ndarray:
+        """Renvoie nombre durées tirées, en secondes."""
+        if self.optimiste == self.pessimiste:
+            return np.full(nombre, self.optimiste._secondes, dtype=np.int64)
+        return _tire_trois_points(
+            generateur, nombre, self.loi, *(np.array([borne]) for borne in self.bornes)
+        )[:, 0]
+
+
+@dataclass
+class Loi(Estimation):
+    """Estimation par une loi du générateur NumPy.
+
+        >>> Loi("normal", loc=Duree(jours=3), scale=Duree(heures=6))
+
+    Les paramètres Duree sont convertis en secondes, les autres sont passés tels quels.
+    Les durées négatives sont ramenées à zéro.
+    """
+
+    nom: str
+    parametres: Dict[str, Any] = field(default_factory=dict)
+
+    def __init__(self, nom: str, **parametres: Any):
+        """Mémorise la loi et ses paramètres."""
+        if not hasattr(np.random.Generator, nom):
+            raise ValueError(f"La loi {nom} n'existe pas.")
+        self.nom = nom
+        self.parametres = parametres
+
+    def etendue(self) -> Tuple[int, int]:
+        """Étendue de tirages pilotes élargie de moitié de part et d'autre, en secondes.
+
+        La loi peut ne pas être bornée : des tirages peuvent sortir de cette étendue."""
+        tirages = self.tire(np.random.default_rng(0), _TIRAGES_PILOTES)
+        minimum, maximum = int(tirages.min()), int(tirages.max())
+        marge = (maximum - minimum) // 2 + 1
+        return max(minimum - marge, 0), maximum + marge
+
+    def tire(self, generateur: np.random.Generator, nombre: int) -> np.ndarray:
+        """Renvoie nombre durées tirées, en secondes."""
+        parametres = {
+            clef: valeur._secondes if isinstance(valeur, Duree) else valeur
+            for clef, valeur in self.parametres.items()
+        }
+        tirages = getattr(generateur, self.nom)(size=nombre, **parametres)
+        return np.rint(np.maximum(tirages, 0)).astype(np.int64)
+
+
+def _tire_trois_points(
+    generateur: np.random.Generator,
+    nombre: int,
+    loi: str,
+    optimiste: np.ndarray,
+    probable: np.ndarray,
+    pessimiste: np.ndarray,
+) -> np.ndarray:
+    """Tire une matrice (nombre x tâches) de durées à trois points, en secondes."""
+    etendue = pessimiste - optimiste
+    if loi == "triangulaire":
+        tirages = generateur.triangular(
+            optimiste, probable, pessimiste, size=(nombre, len(optimiste))
+        )
+    else:
+        alpha = 1 + 4 * (probable - optimiste) / etendue
+        beta = 1 + 4 * (pessimiste - probable) / etendue
+        tirages = optimiste + etendue * generateur.beta(
+            alpha, beta, size=(nombre, len(optimiste))
+        )
+    return np.rint(tirages).astype(np.int64)
+
+
+class _Tirage:
+    """Tire les durées d'un bloc à partir des estimations des tâches.
+
+    Les estimations à trois points sont regroupées par loi pour être tirées en une fois.
+    """
+
+    def __init__(self, reseau: Reseau, estimations: Mapping[int, Estimation]):
+        """Range les estimations par type."""
+        self.durees = reseau.durees.copy()
+        self.trois_points: Dict[str, Tuple[np.ndarray, np.ndarray]] = dict()
+        self.autres: List[Tuple[int, Estimation]] = list()
+        groupes: Dict[str, List[Tuple[int, int, int, int]]] = dict()
+        for indice, estimation in sorted(estimations.items()):
+            if isinstance(estimation, TroisPoints):
+                optimiste, probable, pessimiste = estimation.bornes
+                if optimiste == pessimiste:
+                    self.durees[indice] = optimiste
+                    continue
+                groupes.setdefault(estimation.loi, list()).append(
+                    (indice, optimiste, probable, pessimiste)
+                )
+            else:
+                self.autres.append((indice, estimation))
+        for loi, valeurs in groupes.items():
+            tableau = np.asarray(valeurs, dtype=np.int64)
+            self.trois_points[loi] = (tableau[:, 0], tableau[:, 1:].T.astype(np.float64))
+
+    @classmethod
+    def _depuis_tableaux(
+        cls, tableaux: Dict[str, np.ndarray], autres: List[Tuple[int, Estimation]]
+    ) -> "_Tirage":
+        """Reconstruit un tirage à partir de ses tableaux, sans les copier."""
+        resultat = cls.__new__(cls)
+        resultat.durees = tableaux["durees"]
+        resultat.trois_points = {
+            loi: (tableaux[f"{loi}_indices"], tableaux[f"{loi}_bornes"])
+            for loi in ("pert", "triangulaire")
+            if f"{loi}_indices" in tableaux
+        }
+        resultat.autres = autres
+        return resultat
+
+    @property
+    def tableaux(self) -> Dict[str, np.ndarray]:
+        """Tableaux du tirage, par nom."""
+        resultat = {"durees": self.durees}
+        for loi, (indices, bornes) in self.trois_points.items():
+            resultat[f"{loi}_indices"] = indices
+            resultat[f"{loi}_bornes"] = bornes
+        return resultat
+
+    def tire(self, generateur: np.random.Generator, nombre: int) -> np.ndarray:
+        """Renvoie la matrice (nombre x tâches) des durées, en secondes."""
+        durees = np.repeat(self.durees[np.newaxis, :], nombre, axis=0)
+        for loi in sorted(self.trois_points):
+            indices, bornes = self.trois_points[loi]
+            durees[:, indices] = _tire_trois_points(generateur, nombre, loi, *bornes)
+        for indice, estimation in self.autres:
+            durees[:, indice] = estimation.tire(generateur, nombre)
+        return durees
+
+
+class _Accumulateur:
+    """Résumé fusionnable des tirages : histogramme des fins par tâche et comptes de criticité.
+
+    La dernière ligne des histogrammes est la fin du projet.
+    Les classes couvrent les fins minimales à maximales de chaque ligne, encadrées
+    par deux classes ouvertes pour les fins qui en sortent ; extremes garde la plus
+    petite et la plus grande fin tirée de chaque ligne.
+    """
+
+    def __init__(self, minimums: np.ndarray, maximums: np.ndarray, nb_classes: int):
+        """Fixe les classes de chaque colonne, de son minimum à son maximum compris."""
+        self.nb_classes = nb_classes
+        self.origines = minimums.astype(np.float64)
+        self.largeurs = np.maximum((maximums - minimums + 1) / nb_classes, 1.0)
+        self.histogrammes = np.zeros((len(minimums), nb_classes + 2), dtype=np.int64)
+        self.critiques = np.zeros(len(minimums) - 1, dtype=np.int64)
+        self.extremes = _extremes_vides(len(minimums))
+        self.nb_tirages = 0
+
+    @classmethod
+    def _par_classes(
+        cls, origines: np.ndarray, largeurs: np.ndarray, histogrammes: np.ndarray
+    ) -> "_Accumulateur":
+        """Accumulateur vide sur des classes déjà fixées, qui remplit histogrammes sur place."""
+        resultat = cls.__new__(cls)
+        resultat.nb_classes = histogrammes.shape[1] - 2
+        resultat.origines = origines
+        resultat.largeurs = largeurs
+        resultat.histogrammes = histogrammes
+        resultat.critiques = np.zeros(len(origines) - 1, dtype=np.int64)
+        resultat.extremes = _extremes_vides(len(origines))
+        resultat.nb_tirages = 0
+        return resultat
+
+    def ajoute(self, fins: np.ndarray, critiques: np.ndarray):
+        """Ajoute un bloc de tirages."""
+        colonnes = np.concatenate([fins, fins.max(axis=1, keepdims=True)], axis=1)
+        classes = np.floor((colonnes - self.origines) / self.largeurs).astype(np.int64) + 1
+        np.clip(classes, 0, self.nb_classes + 1, out=classes)
+        classes += np.arange(colonnes.shape[1]) * (self.nb_classes + 2)
+        self.histogrammes += np.bincount(
+            classes.ravel(), minlength=self.histogrammes.size
+        ).reshape(self.histogrammes.shape)
+        self.critiques += critiques.sum(axis=0)
+        np.minimum(self.extremes[0], colonnes.min(axis=0), out=self.extremes[0])
+        np.maximum(self.extremes[1], colonnes.max(axis=0), out=self.extremes[1])
+        self.nb_tirages += len(fins)
+
+    def fusionne(self, autre: "_Accumulateur"):
+        """Ajoute les tirages d'un autre accumulateur ayant les mêmes classes."""
+        self.histogrammes += autre.histogrammes
+        self.critiques += autre.critiques
+        np.minimum(self.extremes[0], autre.extremes[0], out=self.extremes[0])
+        np.maximum(self.extremes[1], autre.extremes[1], out=self.extremes[1])
+        self.nb_tirages += autre.nb_tirages
+
+    def centiles(self, centiles: Sequence[float]) -> np.ndarray:
+        """Renvoie la matrice (colonnes x centiles), en secondes, par interpolation dans les classes.
+
+        Les classes ouvertes sont interpolées jusqu'aux fins extrêmes tirées."""
+        cumul = np.cumsum(self.histogrammes, axis=1)
+        resultat = np.empty((len(self.histogrammes), len(centiles)), dtype=np.int64)
+        lignes = np.arange(len(self.histogrammes))
+        for k, centile in enumerate(centiles):
+            rang = centile / 100 * self.nb_tirages
+            classe = np.minimum(
+                (cumul < rang).sum(axis=1), self.nb_classes + 1
+            )
+            avant = np.where(classe > 0, cumul[lignes, classe - 1], 0)
+            effectif = np.maximum(self.histogrammes[lignes, classe], 1)
+            fraction = np.clip((rang - avant) / effectif, 0, 1)
+            ## Plus petite et plus grande valeur de la classe ;
+            ## une classe de largeur 1 ne contient qu'une valeur entière : pas d'interpolation.
+            bas = np.where(
+                classe == 0, self.extremes[0], self.origines + self.largeurs * (classe - 1)
+            )
+            haut = np.where(
+                classe == 0,
+                self.origines - 1,
+                np.where(
+                    classe == self.nb_classes + 1, self.extremes[1], bas + self.largeurs - 1
+                ),
+            )
+            resultat[:, k] = np.rint(bas + (haut - bas) * fraction)
+        return resultat
+
+
+def _extremes_vides(nb_colonnes: int) -> np.ndarray:
+    """Fins minimales (première ligne) et maximales (seconde ligne) avant tout tirage."""
+    limites = np.iinfo(np.int64)
+    return np.array([[limites.max], [limites.min]], dtype=np.int64).repeat(nb_colonnes, axis=1)
+
+
+def _evalue_bloc(
+    reseau: Reseau,
+    tirage: _Tirage,
+    graine: np.random.SeedSequence,
+    nombre: int,
+) -> Tuple[np.ndarray, np.ndarray]:
+    """Tire un bloc de durées et renvoie les fins et les tâches critiques de chaque tirage."""
+    durees = tirage.tire(np.random.default_rng(graine), nombre)
+    debuts = reseau.passe_avant(durees=durees)
+    tard = reseau.passe_arriere(debuts, durees=durees)
+    return debuts + durees, tard == debuts
+
+
+def _decoupe(nb_tirages: int, taille_bloc: int) -> List[int]:
+    """Découpe le nombre de tirages en tailles de blocs."""
+    tailles = [taille_bloc] * (nb_tirages // taille_bloc)
+    if nb_tirages % taille_bloc:
+        tailles.append(nb_tirages % taille_bloc)
+    return tailles
+
+
+## État d'un processus de calcul, fixé par _initialise_processus.
+_PROCESSUS: Dict[str, Any] = dict()
+
+Description = List[Tuple[str, str, Tuple[int, ...], int]]
+
+
+def _partage(
+    formes: Mapping[str, Tuple[Tuple[int, ...], np.dtype]]
+) -> Tuple[shared_memory.SharedMemory, Description]:
+    """Crée un segment de mémoire partagée pour des tableaux de formes et types donnés.
+
+    Renvoie le segment et sa description (nom, type, forme, décalage) pour chaque tableau.
+    """
+    description = list()
+    taille = 0
+    for nom, (forme, type_) in formes.items():
+        type_ = np.dtype(type_)
+        taille = -(-taille // 8) * 8
+        description.append((nom, type_.str, tuple(forme), taille))
+        taille += int(np.prod(forme, dtype=np.int64)) * type_.itemsize
+    return shared_memory.SharedMemory(create=True, size=max(taille, 1)), description
+
+
+def _vues(segment: shared_memory.SharedMemory, description: Description) -> Dict[str, np.ndarray]:
+    """Tableaux NumPy lus directement dans le segment partagé."""
+    return {
+        nom: np.ndarray(forme, dtype=type_, buffer=segment.buf, offset=decalage)
+        for nom, type_, forme, decalage in description
+    }
+
+
+def _sous_tableaux(vues: Mapping[str, np.ndarray], prefixe: str) -> Dict[str, np.ndarray]:
+    """Tableaux dont le nom commence par prefixe, sans le préfixe."""
+    return {
+        nom[len(prefixe):]: vue for nom, vue in vues.items() if nom.startswith(prefixe)
+    }
+
+
+def _initialise_processus(
+    nom_segment: str,
+    description: Description,
+    noms: List[Nom],
+    autres: List[Tuple[int, Estimation]],
+):
+    """Rattache un processus de calcul au segment partagé."""
+    segment = shared_memory.SharedMemory(name=nom_segment)
+    vues = _vues(segment, description)
+    _PROCESSUS.update(
+        segment=segment,
+        reseau=Reseau._depuis_tableaux(noms, _sous_tableaux(vues, "reseau.")),
+        tirage=_Tirage._depuis_tableaux(_sous_tableaux(vues, "tirage."), autres),
+        origines=vues["origines"],
+        largeurs=vues["largeurs"],
+        histogrammes=vues["histogrammes"],
+    )
+
+
+def _evalue_partie(
+    partie: int, graines: List[np.random.SeedSequence], tailles: List[int]
+) -> Tuple[np.ndarray, np.ndarray, int]:
+    """Évalue des blocs dans un processus de calcul.
+
+    Les histogrammes sont remplis dans la ligne partie du segment partagé ;
+    seuls les comptes de criticité, les fins extrêmes et le nombre de tirages sont renvoyés.
+    """
+    accumulateur = _Accumulateur._par_classes(
+        _PROCESSUS["origines"],
+        _PROCESSUS["largeurs"],
+        _PROCESSUS["histogrammes"][partie],
+    )
+    for graine, taille in zip(graines, tailles):
+        accumulateur.ajoute(
+            *_evalue_bloc(_PROCESSUS["reseau"], _PROCESSUS["tirage"], graine, taille)
+        )
+    return accumulateur.critiques, accumulateur.extremes, accumulateur.nb_tirages
+
+
+def _evalue_en_parallele(
+    reseau: Reseau,
+    tirage: _Tirage,
+    accumulateur: _Accumulateur,
+    graines: List[np.random.SeedSequence],
+    tailles: List[int],
+    processus: int,
+):
+    """Répartit les blocs entre des processus et fusionne leurs résultats dans accumulateur."""
+    parties = min(processus, len(tailles))
+    tableaux = {f"reseau.{nom}": tableau for nom, tableau in reseau.tableaux.items()}
+    tableaux.update({f"tirage.{nom}": tableau for nom, tableau in tirage.tableaux.items()})
+    tableaux["origines"] = accumulateur.origines
+    tableaux["largeurs"] = accumulateur.largeurs
+    formes = {nom: (tableau.shape, tableau.dtype) for nom, tableau in tableaux.items()}
+    formes["histogrammes"] = ((parties,) + accumulateur.histogrammes.shape, np.int64)
+    segment, description = _partage(formes)
+    vues = _vues(segment, description)
+    try:
+        for nom, tableau in tableaux.items():
+            vues[nom][...] = tableau
+        vues["histogrammes"].fill(0)
+        with ProcessPoolExecutor(
+            max_workers=parties,
+            initializer=_initialise_processus,
+            initargs=(segment.name, description, reseau.noms, tirage.autres),
+        ) as executeur:
+            resultats = [
+                executeur.submit(
+                    _evalue_partie, partie, graines[partie::parties], tailles[partie::parties]
+                )
+                for partie in range(parties)
+            ]
+            for partie, resultat in enumerate(resultats):
+                partielle = _Accumulateur._par_classes(
+                    accumulateur.origines,
+                    accumulateur.largeurs,
+                    vues["histogrammes"][partie],
+                )
+                (
+                    partielle.critiques,
+                    partielle.extremes,
+                    partielle.nb_tirages,
+                ) = resultat.result()
+                accumulateur.fusionne(partielle)
+                del partielle
+    finally:
+        vues.clear()
+        segment.close()
+        segment.unlink()
+
+
+class RapportRisque:
+    """Résultat d'une analyse de risque.
+
+        >>> rapport = analyse_risque(mon_probleme, nb_tirages=10000, graine=1)
+
+        >>> rapport.fin_projet(90)
+    Duree(jours=6, heures=7, minutes=42, secondes=51)
+
+        >>> rapport.probabilite_critique("A")
+    1.0
+
+        >>> rapport.affiche()
+    """
+
+    def __init__(
+        self,
+        noms: List[Nom],
+        centiles: Sequence[float],
+        accumulateur: _Accumulateur,
+        date_commencement: Optional[Date] = None,
+    ):
+        """Calcule les centiles et les probabilités de criticité."""
+        self.noms = noms
+        self.centiles = tuple(centiles)
+        self.nb_tirages = accumulateur.nb_tirages
+        valeurs = accumulateur.centiles(self.centiles)
+        self.centiles_fins = valeurs[:-1]
+        self.centiles_projet = valeurs[-1]
+        self.probabilites_critiques = accumulateur.critiques / max(self.nb_tirages, 1)
+        self.date_commencement = date_commencement
+        self._indices = {nom: i for i, nom in enumerate(noms)}
+
+    def __repr__(self) -> str:
+        """Représentation."""
+        return f"RapportRisque(taches={len(self.noms)}, tirages={self.nb_tirages}, centiles={self.centiles})"
+
+    def _indice(self, nom: Nom) -> int:
+        """Indice d'une tâche."""
+        try:
+            return self._indices[nom]
+        except KeyError:
+            raise ValueError(f"{nom} n'est pas une tâche existante.")
+
+    def _colonne(self, centile: float) -> int:
+        """Colonne d'un centile calculé."""
+        if centile not in self.centiles:
+            raise ValueError(
+                f"Le centile {centile} n'a pas été calculé, centiles disponibles : {self.centiles}"
+            )
+        return self.centiles.index(centile)
+
+    def fin(self, nom: Nom, centile: float) -> Duree:
+        """Fin de la tâche au centile donné."""
+        return Duree._depuis_secondes(
+            int(self.centiles_fins[self._indice(nom), self._colonne(centile)])
+        )
+
+    def fin_projet(self, centile: float) -> Duree:
+        """Fin du projet au centile donné."""
+        return Duree._depuis_secondes(int(self.centiles_projet[self._colonne(centile)]))
+
+    def date_fin(self, nom: Nom, centile: float) -> Date:
+        """Date de fin de la tâche au centile donné."""
+        return self._date(self.fin(nom, centile))
+
+    def date_fin_projet(self, centile: float) -> Date:
+        """Date de fin du projet au centile donné."""
+        return self._date(self.fin_projet(centile))
+
+    def _date(self, duree: Duree) -> Date:
+        """Ajoute une durée à la date de commencement."""
+        if self.date_commencement is None:
+            raise ValueError("L'analyse a été faite sans date de commencement.")
+        return self.date_commencement.add(duree)
+
+    def probabilite_critique(self, nom: Nom) -> float:
+        """Probabilité que la tâche soit sur un chemin critique."""
+        return float(self.probabilites_critiques[self._indice(nom)])
+
+    def _message(self, secondes: int) -> str:
+        """Décrit une fin sous forme de durée ou de date."""
+        duree = Duree._depuis_secondes(int(secondes))
+        if self.date_commencement is None:
+            return duree._retourne_temps_calculee()
+        return self.date_commencement.add(duree)._retourne_date_heure()
+
+    def _genere_table(self) -> "Table":
+        """Retourne une table rich."""
+        from rich.table import Table
+
+        resultat = Table(title="Analyse de risque")
+        resultat.add_column("Tâche")
+        for centile in self.centiles:
+            resultat.add_column(f"Fin P{centile:g}")
+        resultat.add_column("Criticité")
+        for indice, nom in enumerate(self.noms):
+            resultat.add_row(
+                nom,
+                *(self._message(valeur) for valeur in self.centiles_fins[indice]),
+                f"{self.probabilites_critiques[indice]:.0%}",
+            )
+        resultat.add_row(
+            "Projet", *(self._message(valeur) for valeur in self.centiles_projet), ""
+        )
+        return resultat
+
+    def affiche(self):
+        """Affiche le rapport en tableau."""
+        from rich import print
+
+        print(self._genere_table())
+
+
+def _etendue_fins(
+    reseau: Reseau, estimations: Mapping[int, Estimation]
+) -> Tuple[np.ndarray, np.ndarray]:
+    """Fins minimales et maximales de chaque tâche, puis du projet, en secondes.
+
+    Les fins croissent avec les durées : les passes avant sur les durées minimales
+    et maximales de chaque estimation en donnent les bornes."""
+    minimums = reseau.durees.copy()
+    maximums = reseau.durees.copy()
+    for indice, estimation in estimations.items():
+        minimums[indice], maximums[indice] = estimation.etendue()
+    fins_min = reseau.passe_avant(durees=minimums) + minimums
+    fins_max = reseau.passe_avant(durees=maximums) + maximums
+    return (
+        np.append(fins_min, fins_min.max(initial=0)),
+        np.append(fins_max, fins_max.max(initial=0)),
+    )
+
+
+def _prepare(
+    probleme: Probleme,
+    estimations: Optional[Mapping[Nom, Estimation]],
+    nb_classes: int,
+) -> Tuple[Reseau, _Tirage, _Accumulateur]:
+    """Compile le réseau, regroupe les estimations des tâches et fixe les classes des fins."""
+    reseau = Reseau.par_probleme(probleme)
+    par_indice = {
+        reseau.indices[tache.nom]: tache.estimation
+        for tache in probleme.taches
+        if tache.estimation is not None
+    }
+    for nom, estimation in (estimations or dict()).items():
+        if nom not in reseau.indices:
+            raise ValueError(f"{nom} n'est pas une tâche existante.")
+        par_indice[reseau.indices[nom]] = estimation
+    for estimation in par_indice.values():
+        if not isinstance(estimation, Estimation):
+            raise ValueError("Une estimation doit-être un objet TroisPoints ou Loi")
+    accumulateur = _Accumulateur(*_etendue_fins(reseau, par_indice), nb_classes)
+    return reseau, _Tirage(reseau, par_indice), accumulateur
+
+
+def analyse_risque(
+    probleme: Probleme,
+    nb_tirages: int = 1000,
+    graine: Optional[int] = None,
+    centiles: Sequence[float] = (10, 50, 90),
+    estimations: Optional[Mapping[Nom, Estimation]] = None,
+    date_commencement: Optional[Union[Date, str]] = None,
+    taille_bloc: Optional[int] = None,
+    nb_classes: int = 1000,
+    processus: Optional[int] = None,
+) -> RapportRisque:
+    """Analyse de risque par tirages de Monte-Carlo.
+
+        [optionnel] nb_tirages
+        Nombre de tirages des durées.
+
+        [optionnel] graine
+        Graine du générateur, pour des résultats reproductibles.
+
+        [optionnel] centiles
+        Centiles des fins à calculer.
+
+        [optionnel] estimations
+        Dictionnaire {nom: Estimation} qui complète ou remplace les estimations portées par les tâches.
+
+        [optionnel] date_commencement
+        Permet d'obtenir les fins sous forme de dates.
+
+        [optionnel] taille_bloc
+        Nombre de tirages évalués à la fois. Par défaut, borné pour limiter la mémoire.
+
+        [optionnel] nb_classes
+        Nombre de classes des histogrammes des fins. Les centiles sont précis à
+        (étendue des fins / nb_classes) près, sauf ceux qui tombent dans une classe
+        ouverte, au-delà de l'étendue estimée d'une Loi.
+
+        [optionnel] processus
+        Nombre de processus entre lesquels répartir les blocs, par exemple os.cpu_count().
+        Par défaut, tout est calculé dans le processus courant.
+        Pour une même graine, le résultat est identique quel que soit le nombre de processus.
+
+        >>> mon_probleme = Probleme([
+        Tache(nom='A', duree=Duree(jours=3), prerequis=[],
+              estimation=TroisPoints(Duree(jours=2), Duree(jours=3), Duree(jours=6))),
+        Tache(nom='B', duree=Duree(jours=2), prerequis=[Prerequis(nom='A', typ='fin', latence=Duree())])])
+
+        >>> rapport = analyse_risque(mon_probleme, nb_tirages=10000, graine=1)
+        >>> rapport.fin("B", 50)
+    Duree(jours=5, heures=6, minutes=18, secondes=50)
+    """
+    if nb_tirages <= 0:
+        raise ValueError("Le nombre de tirages doit-être strictement positif.")
+    if processus is not None and processus <= 0:
+        raise ValueError("Le nombre de processus doit-être strictement positif.")
+    if type(date_commencement) == str:
+        date_commencement = Date.par_str(date_commencement)
+    reseau, tirage, accumulateur = _prepare(probleme, estimations, nb_classes)
+    if taille_bloc is None:
+        taille_bloc = max(1, _CASES_PAR_BLOC // max(len(reseau), 1))
+    tailles = _decoupe(nb_tirages, taille_bloc)
+    graines = np.random.SeedSequence(graine).spawn(len(tailles))
+    if processus is not None and processus > 1 and len(tailles) > 1:
+        _evalue_en_parallele(reseau, tirage, accumulateur, graines, tailles, processus)
+    else:
+        for graine_bloc, taille in zip(graines, tailles):
+            accumulateur.ajoute(*_evalue_bloc(reseau, tirage, graine_bloc, taille))
+    return RapportRisque(reseau.noms, centiles, accumulateur, date_commencement)
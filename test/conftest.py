@@ -0,0 +1,60 @@
+#! /usr/bin/env python
+# -*- coding: utf-8 -*-
+"""Description
+
+Problèmes partagés par les tests.
+"""
+import random
+import pytest
+from ordonnancement import Probleme, Tache, Prerequis, Duree
+
+TEXTE = """
+A / 3 ans + 2 semaines / / Decryptage du probleme
+B / 2 semaine + 4 jours / A fin (2 jours + 3 heures) / Developpement du projet
+C / 2 heures + 23 minutes / B debut (2 jours + 3 heures) / Envoyer la requête à l'agence
+D / 3 ans / A fin | C fin (10 mois) / Developpement de la plateforme publique
+E / 1 seconde / D fin / Ouverture du projet
+"""
+
+
+def _probleme_aleatoire(nb_taches, graine):
+    """Génère un problème acyclique aléatoire avec des prérequis fin et debut."""
+    generateur = random.Random(graine)
+    taches = list()
+    for i in range(nb_taches):
+        prerequis = list()
+        for j in generateur.sample(range(i), min(i, generateur.randint(0, 3))):
+            prerequis.append(
+                Prerequis(
+                    nom=f"T{j:04d}",
+                    typ=generateur.choice(["fin", "debut"]),
+                    latence=Duree(heures=generateur.randint(0, 5)),
+                )
+            )
+        taches.append(
+            Tache(
+                nom=f"T{i:04d}",
+                duree=Duree(heures=generateur.randint(1, 48)),
+                prerequis=prerequis,
+                correspondance=f"Tache {i}",
+            )
+        )
+    return Probleme(taches)
+
+
+@pytest.fixture
+def texte():
+    """Texte du problème de référence à cinq tâches."""
+    return TEXTE
+
+
+@pytest.fixture
+def probleme(texte):
+    """Problème de référence à cinq tâches."""
+    return Probleme.par_str(texte)
+
+
+@pytest.fixture
+def probleme_aleatoire():
+    """Fabrique de problèmes aléatoires : probleme_aleatoire(nb_taches, graine)."""
+    return _probleme_aleatoire
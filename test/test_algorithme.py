@@ -183,8 +183,12 @@ def test_calcule_demarrage(probleme):
                         )
     attendu = Duree(annees=22)
     non_attendu = Duree(annees=9)
-    assert ordo.algorithme._calcule_demarrage(nouvelle_tache, edt)==attendu
-    assert not ordo.algorithme._calcule_demarrage(nouvelle_tache, edt)!=non_attendu
+    noms = [activite.tache.nom for activite in edt.activites]
+    sources = [noms.index("B"), noms.index("A")]
+    debuts = [activite.debut for activite in edt.activites]
+    fins = [activite.fin for activite in edt.activites]
+    assert ordo.algorithme._calcule_demarrage(nouvelle_tache, sources, debuts, fins)==attendu
+    assert not ordo.algorithme._calcule_demarrage(nouvelle_tache, sources, debuts, fins)!=non_attendu
     
 
 def test_calcule_demarrage_commencement(probleme):
@@ -195,7 +199,7 @@ def test_calcule_demarrage_commencement(probleme):
                          prerequis=[],
                          correspondance="cD"
                         )
-    assert ordo.algorithme._calcule_demarrage(nouvelle_tache, edt)==Duree()
+    assert ordo.algorithme._calcule_demarrage(nouvelle_tache, [], [], [])==Duree()
     
 def test_calcule_demarrage2_commencement():
     """Teste sur quel prérequis doit-t'il commencer. Ici l'emploi du temps est vide, il commencera donc à la date de commencement."""
@@ -205,7 +209,7 @@ def test_calcule_demarrage2_commencement():
                          prerequis=[],
                          correspondance="cD"
                         )
-    assert ordo.algorithme._calcule_demarrage2(nouvelle_tache, calendrier, date_commencement=Date(annees=1998, mois=12, jours=23))==Date(jours=23, mois=12, annees=1998)
+    assert ordo.algorithme._calcule_demarrage2(nouvelle_tache, [], [], [], date_commencement=Date(annees=1998, mois=12, jours=23))==Date(jours=23, mois=12, annees=1998)
 
 def test_calcule_demarrage(probleme):
     """Teste sur quel prérequis doit-t'il commencer."""
@@ -229,5 +233,22 @@ def test_calcule_demarrage(probleme):
     
     attendu = Date(jours=23, mois=12, annees=2020)
     non_attendu = Date(jours=23, mois=12, annees=2007)
-    assert ordo.algorithme._calcule_demarrage2(nouvelle_tache, calendrier, date_commencement=Date(annees=1998, mois=12, jours=23))==attendu
-    assert not ordo.algorithme._calcule_demarrage2(nouvelle_tache, calendrier, date_commencement=Date(annees=1998, mois=12, jours=23))==non_attendu
\ No newline at end of file
+    noms = [datation.tache.nom for datation in calendrier.dates]
+    sources = [noms.index("B"), noms.index("A")]
+    debuts = [datation.date_debut for datation in calendrier.dates]
+    fins = [datation.date_fin for datation in calendrier.dates]
+    assert ordo.algorithme._calcule_demarrage2(nouvelle_tache, sources, debuts, fins, date_commencement=Date(annees=1998, mois=12, jours=23))==attendu
+    assert not ordo.algorithme._calcule_demarrage2(nouvelle_tache, sources, debuts, fins, date_commencement=Date(annees=1998, mois=12, jours=23))==non_attendu
+
+
+def test_taches_partagees(probleme):
+    """Des problèmes qui partagent leurs tâches se résolvent en même temps sans se gêner."""
+    from concurrent.futures import ThreadPoolExecutor
+
+    autres = [Tache(nom=f"X{i}", duree=Duree(jours=i + 1), prerequis=[]) for i in range(50)]
+    etendu = Probleme(autres + list(probleme.taches))
+    attendus = {id(probleme): resous_EDT(probleme), id(etendu): resous_EDT(etendu)}
+    with ThreadPoolExecutor(2) as groupe:
+        resultats = list(groupe.map(lambda p: (p, resous_EDT(p)), [probleme, etendu] * 30))
+    for resolu, edt in resultats:
+        assert edt == attendus[id(resolu)]
@@ -0,0 +1,139 @@
+#! /usr/bin/env python
+# -*- coding: utf-8 -*-
+"""Description
+
+Tests sur le module binaire.
+"""
+import numpy as np
+import pytest
+from ordonnancement import (
+    Probleme,
+    Tache,
+    Prerequis,
+    Duree,
+    EDT,
+    Calendrier,
+    Reseau,
+    resous_EDT,
+    resous_Calendrier,
+    vers_binaire,
+    depuis_binaire,
+)
+from ordonnancement.binaire import lit_tableaux, reseau_binaire, sauvegarde, charge
+
+
+def _composantes(duree):
+    """Composantes d'une durée, pour les comparer exactement."""
+    return (
+        duree.secondes,
+        duree.minutes,
+        duree.heures,
+        duree.jours,
+        duree.semaines,
+        duree.mois,
+        duree.annees,
+    )
+
+
+def test_probleme():
+    """Un problème relu est égal à l'original, composantes des durées comprises."""
+    probleme = Probleme(
+        [
+            Tache("A", Duree(heures=30), [], None),
+            Tache("B", Duree(minutes=90, jours=1), [Prerequis("A", "debut", Duree(jours=8))]),
+            Tache("C", Duree(semaines=1), [Prerequis("B", "fin", Duree())], "Étape é"),
+        ]
+    )
+    relu = Probleme.par_binaire(probleme.vers_binaire())
+    assert relu == probleme
+    assert relu.get_correspondance() == probleme.get_correspondance()
+    assert list(relu.registre) == ["A", "B", "C"]
+    for tache, originale in zip(relu.taches, probleme.taches):
+        assert _composantes(tache.duree) == _composantes(originale.duree)
+        for prerequis, original in zip(tache.prerequis, originale.prerequis):
+            assert _composantes(prerequis.latence) == _composantes(original.latence)
+
+
+def test_solutions(texte):
+    """Les emplois du temps et calendriers relus sont égaux aux originaux."""
+    probleme = Probleme.par_str(texte)
+    edt = resous_EDT(probleme, 8, 2)
+    assert EDT.par_binaire(edt.vers_binaire()) == edt
+    calendrier = resous_Calendrier(probleme, "23/12/1998", "9-17")
+    relu = Calendrier.par_binaire(calendrier.vers_binaire())
+    assert relu == calendrier
+    assert relu["E"].date_fin.temps_total() == calendrier["E"].date_fin.temps_total()
+
+
+def test_tableaux(texte):
+    """Les tableaux sont des vues sur les données, sans copie."""
+    donnees = vers_binaire(Probleme.par_str(texte))
+    nature, tableaux = lit_tableaux(donnees)
+    assert nature == "probleme"
+    assert tableaux["durees"].tolist() == [
+        tache.duree._secondes for tache in Probleme.par_str(texte).taches
+    ]
+    assert tableaux["prerequis_indptr"].tolist() == [0, 0, 1, 2, 4, 5]
+    assert tableaux["prerequis"].tolist() == [0, 1, 0, 2, 3]
+    assert not tableaux["durees"].flags.owndata
+    assert not tableaux["durees"].flags.writeable
+
+
+def test_reseau(texte):
+    """Le réseau compilé depuis les tableaux est celui du problème."""
+    probleme = Probleme.par_str(texte)
+    reseau = reseau_binaire(probleme.vers_binaire())
+    attendu = Reseau.par_probleme(probleme)
+    assert reseau.noms == attendu.noms
+    for nom, tableau in attendu.tableaux.items():
+        assert np.array_equal(reseau.tableaux[nom], tableau)
+
+
+def test_fichier(tmp_path, texte):
+    """Un fichier est relu par projection en mémoire."""
+    chemin = str(tmp_path / "probleme.ordo")
+    calendrier = resous_Calendrier(Probleme.par_str(texte), "23/12/1998")
+    sauvegarde(calendrier, chemin)
+    assert charge(chemin) == calendrier
+
+
+def test_erreurs(texte):
+    """Les données invalides sont refusées."""
+    donnees = vers_binaire(Probleme.par_str(texte))
+    with pytest.raises(ValueError):
+        depuis_binaire(b"PASBIN\0\0" + donnees[8:])
+    with pytest.raises(ValueError):
+        depuis_binaire(donnees[:8] + b"\x02\x00" + donnees[10:])
+    with pytest.raises(ValueError):
+        depuis_binaire(donnees[:-8])
+    with pytest.raises(ValueError):
+        EDT.par_binaire(donnees)
+    with pytest.raises(ValueError):
+        vers_binaire("A / 1 jour / / A")
+    with pytest.raises(ValueError):
+        depuis_binaire(_corrompt(donnees, "prerequis", 0, (7).to_bytes(4, "little")))
+    with pytest.raises(ValueError, match="même nom"):
+        depuis_binaire(_corrompt(donnees, "prerequis", 0, (1).to_bytes(4, "little")))
+
+
+def _corrompt(donnees, nom, rang, octets):
+    """Remplace les octets de l'élément rang du tableau nom."""
+    _, tableaux = lit_tableaux(donnees)
+    tableau = tableaux[nom]
+    position = (
+        tableau.__array_interface__["data"][0]
+        - np.frombuffer(donnees, dtype=np.uint8).__array_interface__["data"][0]
+        + rang * tableau.itemsize
+    )
+    corrompu = bytearray(donnees)
+    corrompu[position : position + len(octets)] = octets
+    return bytes(corrompu)
+
+
+def test_fichier_invalide(tmp_path, texte):
+    """Une erreur de décodage d'un fichier remonte telle quelle."""
+    chemin = tmp_path / "probleme.ordo"
+    donnees = vers_binaire(Probleme.par_str(texte))
+    chemin.write_bytes(_corrompt(donnees, "durees", 0, (0).to_bytes(8, "little")))
+    with pytest.raises(ValueError, match="durée non nul"):
+        charge(str(chemin))
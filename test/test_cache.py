@@ -0,0 +1,232 @@
+#! /usr/bin/env python
+# -*- coding: utf-8 -*-
+"""Description
+
+Tests sur le module cache.
+"""
+import multiprocessing
+import os
+import time
+import pytest
+from ordonnancement import (
+    Probleme,
+    Duree,
+    Date,
+    CacheSolutions,
+    CacheDisque,
+    resous_EDT,
+    resous_Calendrier,
+)
+from ordonnancement.cache import empreinte
+
+
+def test_empreinte(texte):
+    """L'empreinte dépend de la structure et des options, pas de l'objet."""
+    probleme = Probleme.par_str(texte)
+    cle = empreinte(probleme, "resous_EDT", duree_max_journalier=8)
+    assert cle == empreinte(Probleme.par_str(texte), "resous_EDT", duree_max_journalier=8)
+    assert cle != empreinte(probleme, "resous_EDT", duree_max_journalier=9)
+    assert cle != empreinte(probleme, "resous_Calendrier", duree_max_journalier=8)
+    modifie = Probleme.par_str(texte.replace("1 seconde", "2 secondes"))
+    assert cle != empreinte(modifie, "resous_EDT", duree_max_journalier=8)
+    modifie = Probleme.par_str(texte.replace("A fin (2 jours", "A debut (2 jours"))
+    assert cle != empreinte(modifie, "resous_EDT", duree_max_journalier=8)
+    assert empreinte(
+        probleme, "resous_Calendrier", date_commencement="23/12/1998"
+    ) == empreinte(
+        probleme,
+        "resous_Calendrier",
+        date_commencement=Date(jours=23, mois=12, annees=1998),
+    )
+
+
+def test_succes(texte):
+    """Une répétition est servie par le cache, avec la même solution."""
+    cache = CacheSolutions()
+    premier = cache.resous_EDT(Probleme.par_str(texte), 8, 2)
+    second = cache.resous_EDT(Probleme.par_str(texte), 8, 2)
+    assert premier == second == resous_EDT(Probleme.par_str(texte), 8, 2)
+    calendrier = cache.resous_Calendrier(Probleme.par_str(texte), "23/12/1998", "9-17")
+    assert calendrier == cache.resous_Calendrier(
+        Probleme.par_str(texte), Date(jours=23, mois=12, annees=1998), "9-17"
+    )
+    assert calendrier == resous_Calendrier(Probleme.par_str(texte), "23/12/1998", "9-17")
+    statistiques = cache.statistiques
+    assert (statistiques.succes, statistiques.echecs) == (2, 2)
+    assert statistiques.taux_succes == 0.5
+    assert statistiques.solutions == len(cache) == 2
+    assert statistiques.octets > 0
+
+
+def test_copie(texte):
+    """Modifier une solution ne modifie pas le cache."""
+    cache = CacheSolutions()
+    premier = cache.resous_EDT(Probleme.par_str(texte))
+    premier["A"].fin = Duree(secondes=1)
+    second = cache.resous_EDT(Probleme.par_str(texte))
+    assert second["A"].fin == Duree(annees=3, semaines=2)
+    second["B"].debut = Duree(secondes=1)
+    troisieme = cache.resous_EDT(Probleme.par_str(texte))
+    assert troisieme["B"].debut != Duree(secondes=1)
+    assert second is not troisieme
+
+
+def test_eviction_nombre(texte):
+    """La solution la moins récemment utilisée est évincée."""
+    cache = CacheSolutions(taille_max=2)
+    probleme = Probleme.par_str(texte)
+    cache.resous_EDT(probleme, 8)
+    cache.resous_EDT(probleme, 9)
+    cache.resous_EDT(probleme, 8)
+    cache.resous_EDT(probleme, 10)
+    assert len(cache) == 2
+    options = dict(nb_jours_repos=None)
+    assert empreinte(probleme, "resous_EDT", duree_max_journalier=8, **options) in cache
+    assert empreinte(probleme, "resous_EDT", duree_max_journalier=9, **options) not in cache
+    assert cache.statistiques.evictions == 1
+
+
+def test_eviction_octets(texte):
+    """Le cache reste sous sa taille maximale en octets."""
+    probleme = Probleme.par_str(texte)
+    taille = CacheSolutions()
+    taille.resous_EDT(probleme)
+    octets = taille.statistiques.octets
+    cache = CacheSolutions(octets_max=2 * octets + octets // 2)
+    for heures in range(1, 6):
+        cache.resous_EDT(probleme, heures)
+        assert cache.statistiques.octets <= cache.octets_max
+    assert len(cache) == 2
+    trop_petit = CacheSolutions(octets_max=octets // 2)
+    trop_petit.resous_EDT(probleme)
+    assert len(trop_petit) == 0
+    cache.vide()
+    assert len(cache) == 0 and cache.statistiques.octets == 0
+
+
+def test_arguments_invalides():
+    """Les limites doivent être positives."""
+    with pytest.raises(ValueError):
+        CacheSolutions(taille_max=0)
+    with pytest.raises(ValueError):
+        CacheSolutions(octets_max=0)
+
+
+def _remplit(repertoire, texte, heures):
+    """Résout dans un autre processus, avec un cache disque partagé."""
+    disque = CacheDisque(repertoire)
+    for _ in range(5):
+        for h in heures:
+            disque.resous_EDT(Probleme.par_str(texte), h)
+    return disque.statistiques.succes
+
+
+def test_disque(tmp_path, texte):
+    """Un second cache sur le même répertoire retrouve les solutions."""
+    repertoire = str(tmp_path / "cache")
+    premier = CacheDisque(repertoire)
+    edt = premier.resous_EDT(Probleme.par_str(texte), 8)
+    second = CacheDisque(repertoire)
+    assert second.resous_EDT(Probleme.par_str(texte), 8) == edt
+    assert (second.statistiques.succes, second.statistiques.echecs) == (1, 0)
+    assert len(second) == 1
+    calendrier = second.resous_Calendrier(Probleme.par_str(texte), "23/12/1998")
+    assert premier.resous_Calendrier(Probleme.par_str(texte), "23/12/1998") == calendrier
+    assert [nom for nom in os.listdir(repertoire) if nom.endswith(".tmp")] == []
+    premier.vide()
+    assert len(second) == 0
+
+
+def test_disque_corrompu(tmp_path, texte):
+    """Un fichier illisible est traité comme absent et remplacé."""
+    disque = CacheDisque(str(tmp_path))
+    probleme = Probleme.par_str(texte)
+    edt = disque.resous_EDT(probleme)
+    cle = empreinte(probleme, "resous_EDT", duree_max_journalier=None, nb_jours_repos=None)
+    with open(disque._chemin(cle), "wb") as fichier:
+        fichier.write(b"ORDOSOL1 tronque")
+    assert disque.resous_EDT(probleme) == edt
+    assert disque.statistiques.echecs == 2
+    assert disque.resous_EDT(probleme) == edt
+    assert disque.statistiques.succes == 1
+
+
+_PIEGES = list()
+
+
+def _declenche():
+    """Appelée au dépicklage d'un _Piege."""
+    _PIEGES.append(1)
+
+
+class _Piege:
+    """Objet dont le dépicklage laisse une trace."""
+
+    def __reduce__(self):
+        return (_declenche, ())
+
+
+def test_disque_sans_pickle(tmp_path, texte):
+    """Un fichier du répertoire n'est jamais dépicklé ; le répertoire est privé."""
+    import pickle
+    import zlib
+
+    repertoire = tmp_path / "cache"
+    disque = CacheDisque(str(repertoire))
+    assert os.stat(repertoire).st_mode & 0o777 == 0o700
+    probleme = Probleme.par_str(texte)
+    cle = empreinte(probleme, "resous_EDT", duree_max_journalier=None, nb_jours_repos=None)
+    with open(disque._chemin(cle), "wb") as fichier:
+        fichier.write(b"ORDOSOL2" + zlib.compress(pickle.dumps(_Piege())))
+    assert disque.resous_EDT(probleme) == resous_EDT(probleme)
+    assert _PIEGES == []
+    assert disque.resous_EDT(probleme) == resous_EDT(probleme)
+
+
+def test_disque_eviction(tmp_path, texte):
+    """Les solutions les moins récemment utilisées sont supprimées."""
+    probleme = Probleme.par_str(texte)
+    disque = CacheDisque(str(tmp_path))
+    disque.resous_EDT(probleme, 1)
+    octets = disque.statistiques.octets
+    disque = CacheDisque(str(tmp_path), octets_max=3 * octets)
+    for heures, age in zip([1, 2, 3], [300, 200, 100]):
+        disque.resous_EDT(probleme, heures)
+        cle = empreinte(probleme, "resous_EDT", duree_max_journalier=heures, nb_jours_repos=None)
+        os.utime(disque._chemin(cle), (time.time() - age, time.time() - age))
+    disque.resous_EDT(probleme, 1)
+    disque.resous_EDT(probleme, 4)
+    assert disque.statistiques.octets <= 3 * octets
+    cles = {
+        heures: empreinte(probleme, "resous_EDT", duree_max_journalier=heures, nb_jours_repos=None)
+        for heures in [1, 2, 3, 4]
+    }
+    assert cles[1] in disque and cles[4] in disque
+    assert cles[2] not in disque
+    assert disque.statistiques.evictions >= 1
+
+
+def test_deux_niveaux(tmp_path, texte):
+    """La mémoire est consultée d'abord, puis le disque, qui reçoit les nouvelles solutions."""
+    disque = CacheDisque(str(tmp_path))
+    CacheSolutions(disque=disque).resous_EDT(Probleme.par_str(texte))
+    cache = CacheSolutions(disque=disque)
+    cache.resous_EDT(Probleme.par_str(texte))
+    cache.resous_EDT(Probleme.par_str(texte))
+    assert (cache.statistiques.succes, cache.statistiques.echecs) == (1, 1)
+    assert disque.statistiques.succes == 1
+
+
+def test_disque_processus(tmp_path, texte):
+    """Plusieurs processus lisent et écrivent le même répertoire."""
+    repertoire = str(tmp_path)
+    contexte = multiprocessing.get_context("spawn")
+    with contexte.Pool(3) as pool:
+        succes = pool.starmap(_remplit, [(repertoire, texte, [1, 2, 3, 4])] * 3)
+    assert sum(succes) >= 3 * 4 * 4
+    disque = CacheDisque(repertoire)
+    for heures in [1, 2, 3, 4]:
+        assert disque.resous_EDT(Probleme.par_str(texte), heures) == resous_EDT(
+            Probleme.par_str(texte), heures
+        )
+    assert disque.statistiques.succes == 4
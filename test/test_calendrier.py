@@ -227,6 +227,19 @@ def test_get_item(date):
     assert entree["jours"] == 23
     assert entree["mois"] == 12
     assert entree["annees"] == 1998
+    with pytest.raises(KeyError):
+        entree["semaines"]
+
+
+def test_slots(date):
+    """La date ne duplique pas ses champs dans un dictionnaire."""
+    assert not hasattr(date, "__dict__")
+    datation = Datation(
+        tache=Tache(nom="A", duree=Duree(jours=1), prerequis=[]),
+        date_debut=date,
+        date_fin=date + Duree(jours=1),
+    )
+    assert not hasattr(datation, "__dict__")
 
 
 def test_par_str():
@@ -243,6 +256,21 @@ def test_par_str():
     assert date3 == Date(
         jours=23, mois=12, annees=1998, heures=23, minutes=19, secondes=1
     )
+    assert Date.par_str("23/12/1998/14") == Date(jours=23, mois=12, annees=1998, heures=14)
+
+
+def test_par_str_memorise():
+    """Teste qu'une analyse conservée renvoie une nouvelle date et les mêmes erreurs"""
+    date1 = Date.par_str("24/12/1998/10:30")
+    date2 = Date.par_str("24/12/1998/10:30")
+    assert date1 == date2 and date1 is not date2
+    date1.heures = 11
+    assert Date.par_str("24/12/1998/10:30").heures == 10
+    for _ in range(2):
+        with pytest.raises(ValueError, match="La valeur x n'est pas numérique"):
+            Date.par_str("x/12/1998")
+        with pytest.raises(ValueError, match="mal rempli l'heure"):
+            Date.par_str("23/12/1998/1:2:3:4")
 
 
 ### Test sur la classe datation
@@ -357,6 +385,13 @@ def test_acces(datations):
     assert calendrier["A"] == datations[0]
 
 
+def test_acces_absent(datations):
+    """Test de [] sur une tâche absente."""
+    calendrier = Calendrier(datations)
+    with pytest.raises(ValueError):
+        calendrier["Z"]
+
+
 def test_ajoute():
     """Mutation du calendrier."""
     calendrier = Calendrier(dates=[])
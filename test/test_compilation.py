@@ -0,0 +1,145 @@
+#! /usr/bin/env python
+# -*- coding: utf-8 -*-
+"""Description
+
+Tests sur le module compilation.
+"""
+import dataclasses
+import random
+import numpy as np
+import pytest
+from ordonnancement import Probleme, Duree, ProblemeCompile, SessionEDT, resous_EDT
+
+
+@pytest.fixture
+def probleme_modifie(texte):
+    """Même réseau, avec la durée de A et la latence de C vers D modifiées."""
+    return Probleme.par_str(
+        texte.replace("3 ans + 2 semaines", "1 an").replace("C fin (10 mois)", "C fin (1 jour)")
+    )
+
+
+def test_resous_sans_modification(probleme):
+    """Retrouve resous_EDT."""
+    compile = ProblemeCompile(probleme)
+    assert compile.resous() == resous_EDT(probleme)
+    assert compile.resous(duree_max_journalier=8, nb_jours_repos=2) == resous_EDT(
+        probleme, duree_max_journalier=8, nb_jours_repos=2
+    )
+
+
+def test_resous_dictionnaires(probleme, probleme_modifie):
+    """Modifications données par nom de tâche et par prérequis."""
+    compile = ProblemeCompile(probleme)
+    obtenu = compile.resous(
+        durees={"A": Duree(annees=1)}, latences={("C", "D"): Duree(jours=1)}
+    )
+    assert obtenu == resous_EDT(probleme_modifie)
+
+
+def test_resous_vecteurs(probleme, probleme_modifie):
+    """Modifications données en secondes."""
+    compile = ProblemeCompile(probleme)
+    durees = np.array([Duree(annees=1)._secondes, *compile.reseau.durees[1:]])
+    latences = compile.reseau.latences.copy()
+    latences[compile.aretes.index(("C", "D"))] = Duree(jours=1)._secondes
+    assert compile.resous(durees=durees, latences=latences) == resous_EDT(
+        probleme_modifie
+    )
+
+
+def test_graphe_non_modifie(probleme):
+    """Le graphe compilé n'est pas reconstruit."""
+    compile = ProblemeCompile(probleme)
+    graphe = compile.graphe
+    compile.resous(durees={"B": Duree(jours=1)})
+    assert compile.graphe is graphe
+    assert compile.resous() == resous_EDT(probleme)
+
+
+def test_erreurs(probleme):
+    """Vecteurs ou noms invalides."""
+    compile = ProblemeCompile(probleme)
+    with pytest.raises(ValueError):
+        compile.resous(durees={"Z": Duree(jours=1)})
+    with pytest.raises(ValueError):
+        compile.resous(latences={("E", "A"): Duree(jours=1)})
+    with pytest.raises(ValueError):
+        compile.resous(durees=[1, 2])
+    with pytest.raises(ValueError):
+        compile.resous(durees=np.zeros(5))
+
+
+def test_cycle():
+    """Un problème cyclique ne se compile pas."""
+    probleme = Probleme.par_str(
+        """
+A / 1 jour / B fin / A
+B / 1 jour / A fin / B
+"""
+    )
+    with pytest.raises(ValueError):
+        ProblemeCompile(probleme)
+
+
+def test_session(probleme, probleme_modifie):
+    """Modifications successives d'une session."""
+    session = SessionEDT(probleme)
+    assert session.vers_EDT() == resous_EDT(probleme)
+    assert session.modifie_duree("A", Duree(annees=1)) == ["A", "B", "C", "D", "E"]
+    assert session.modifie_latence("C", "D", Duree(jours=1)) == ["D", "E"]
+    assert session.vers_EDT() == resous_EDT(probleme_modifie)
+    assert session.modifie_duree("E", Duree(secondes=1)) == []
+    assert session.modifie_latence("A", "B", Duree(jours=2, heures=3)) == []
+
+
+def test_session_arret(probleme):
+    """La propagation s'arrête quand un début ne change pas."""
+    session = SessionEDT(probleme)
+    assert session.modifie_duree("B", Duree(jours=1)) == ["B"]
+    assert session.modifie_latence("A", "D", Duree(jours=1)) == []
+    assert session["E"] == resous_EDT(probleme)["E"]
+
+
+def test_session_aleatoire(probleme_aleatoire):
+    """Une session suit resous_EDT sur des modifications aléatoires."""
+    generateur = random.Random(3)
+    probleme = probleme_aleatoire(200, 3)
+    session = SessionEDT(probleme, duree_max_journalier=8, nb_jours_repos=2)
+    taches = {tache.nom: tache for tache in probleme.taches}
+    aretes = session.compile.aretes
+    for _ in range(30):
+        if generateur.random() < 0.5:
+            nom = generateur.choice(list(taches))
+            duree = Duree(heures=generateur.randint(1, 48))
+            taches[nom] = dataclasses.replace(taches[nom], duree=duree)
+            session.modifie_duree(nom, duree)
+        else:
+            source, nom = generateur.choice(aretes)
+            latence = Duree(heures=generateur.randint(0, 5))
+            taches[nom] = dataclasses.replace(
+                taches[nom],
+                prerequis=[
+                    dataclasses.replace(prerequis, latence=latence)
+                    if prerequis.nom == source
+                    else prerequis
+                    for prerequis in taches[nom].prerequis
+                ],
+            )
+            session.modifie_latence(source, nom, latence)
+    attendu = resous_EDT(
+        Probleme(list(taches.values())), duree_max_journalier=8, nb_jours_repos=2
+    )
+    assert session.vers_EDT() == attendu
+
+
+def test_session_erreurs(probleme):
+    """Noms ou durées invalides."""
+    session = SessionEDT(probleme)
+    with pytest.raises(ValueError):
+        session.modifie_duree("Z", Duree(jours=1))
+    with pytest.raises(ValueError):
+        session.modifie_duree("A", Duree())
+    with pytest.raises(ValueError):
+        session.modifie_latence("E", "A", Duree(jours=1))
+    assert session.vers_EDT() == resous_EDT(probleme)
@@ -0,0 +1,119 @@
+#! /usr/bin/env python
+# -*- coding: utf-8 -*-
+"""Description
+
+Tests sur le module dag.
+"""
+import pytest
+from ordonnancement import (
+    Probleme,
+    Tache,
+    Prerequis,
+    Duree,
+    Graphe,
+    ErreurCycle,
+    ProblemeCompile,
+    genere_graphe,
+    resous_EDT,
+    resous_EDT_vectoriel,
+    resous_Calendrier,
+)
+
+
+@pytest.fixture
+def probleme(texte):
+    return Probleme.par_str(
+        texte
+        + """F / 1 jour / / Tache isolee
+"""
+    )
+
+
+def test_graphe(probleme):
+    """Toutes les tâches sont présentes, dans un ordre topologique."""
+    graphe = genere_graphe(probleme)
+    assert isinstance(graphe, Graphe)
+    assert len(graphe) == 6
+    assert graphe.nb_aretes == 5
+    assert graphe.est_acyclique
+    ordre = graphe.ordre_topologique()
+    assert sorted(ordre) == ["A", "B", "C", "D", "E", "F"]
+    for source, destination in graphe.aretes:
+        assert ordre.index(source) < ordre.index(destination)
+
+
+def test_tache_isolee(probleme):
+    """Une tâche sans prérequis ni successeur est résolue."""
+    assert resous_EDT(probleme)["F"].fin._secondes == 86400
+    assert resous_Calendrier(probleme, date_commencement="23/12/1998")["F"]
+
+
+def test_cycle():
+    """Un cycle est détecté."""
+    probleme = Probleme.par_str(
+        """
+A / 1 jour / / A
+B / 1 jour / A fin | C fin / B
+C / 1 jour / B fin / C
+"""
+    )
+    graphe = genere_graphe(probleme)
+    assert not graphe.est_acyclique
+    with pytest.raises(ValueError):
+        graphe.ordre_topologique()
+    with pytest.raises(ValueError):
+        resous_EDT(probleme)
+
+
+def test_vers_networkx(probleme):
+    """Export optionnel vers networkx."""
+    nx = pytest.importorskip("networkx")
+    graphe = genere_graphe(probleme).vers_networkx()
+    assert set(graphe.nodes) == {"A", "B", "C", "D", "E", "F"}
+    assert graphe.edges["C", "D"]["typ"] == "fin"
+    assert nx.is_directed_acyclic_graph(graphe)
+
+
+def test_erreur_cycle():
+    """Chaque cycle est décrit, sans les tâches qui en dépendent seulement."""
+    probleme = Probleme.par_str(
+        """
+A / 1 jour / / A
+B / 1 jour / A fin | D fin / B
+C / 1 jour / B fin / C
+D / 1 jour / C debut / D
+E / 1 jour / D fin / E
+F / 1 jour / G fin / F
+G / 1 jour / F fin | E fin / G
+"""
+    )
+    for resolution in (resous_EDT, resous_EDT_vectoriel, ProblemeCompile):
+        with pytest.raises(ErreurCycle) as erreur:
+            resolution(probleme)
+        assert erreur.value.composantes == [["B", "C", "D"], ["F", "G"]]
+        assert erreur.value.cycles == [["B", "C", "D"], ["F", "G"]]
+        assert erreur.value.aretes == [
+            [("B", "C"), ("C", "D"), ("D", "B")],
+            [("F", "G"), ("G", "F")],
+        ]
+        assert "B -> C -> D -> B" in str(erreur.value)
+    with pytest.raises(ValueError):
+        resous_Calendrier(probleme, date_commencement="23/12/1998")
+
+
+def test_long_cycle():
+    """Un long cycle est analysé sans récursion."""
+    nb = 5000
+    taches = [
+        Tache(
+            nom=f"T{i:04d}",
+            duree=Duree(heures=1),
+            prerequis=[Prerequis(nom=f"T{(i - 1) % nb:04d}", typ="fin", latence=Duree())],
+        )
+        for i in range(nb)
+    ]
+    with pytest.raises(ErreurCycle) as erreur:
+        genere_graphe(Probleme(taches)).verifie_acyclique()
+    assert len(erreur.value.cycles) == 1
+    assert len(erreur.value.cycles[0]) == nb
+    assert len(erreur.value.aretes[0]) == nb
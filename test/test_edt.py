@@ -63,6 +63,11 @@ def test_verification_activite():
         Activite(tache=a, debut=Duree(), fin=Duree(jours=1))
 
 
+def test_slots(activites):
+    """Les activités ne portent pas de dictionnaire d'attributs."""
+    assert not hasattr(activites[0], "__dict__")
+
+
 def test_instanciation(activites):
     """Création."""
     edt = EDT(activites=activites)
@@ -104,6 +109,13 @@ def test_acces(activites):
     assert edt["A"] == activites[0]
 
 
+def test_acces_absent(activites):
+    """Test de get item sur une tâche absente."""
+    edt = EDT(activites)
+    with pytest.raises(ValueError):
+        edt["Z"]
+
+
 def test_ajoute():
     """Mutation de l'EDT."""
     edt = EDT(activites=[])
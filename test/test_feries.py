@@ -0,0 +1,111 @@
+#! /usr/bin/env python
+# -*- coding: utf-8 -*-
+"""Description
+
+Tests sur le module feries.
+"""
+import numpy as np
+import pytest
+from ordonnancement import (
+    Probleme,
+    Duree,
+    Date,
+    JoursFeries,
+    CalendrierOuvre,
+    resous_Calendrier,
+)
+
+
+def test_construction():
+    """Dates et périodes, fins incluses."""
+    feries = JoursFeries(["25/12/2024", "1/1/2025", ("1/8/2025", "15/8/2025")])
+    assert len(feries) == 17
+    assert "25/12/2024" in feries
+    assert Date.par_str("15/8/2025") in feries
+    assert Date.par_str("16/8/2025") not in feries
+    assert Date.par_str("24/12/2024") not in feries
+    assert "1/1/1990" not in feries
+    assert len(JoursFeries()) == 0
+    assert "1/1/2025" not in JoursFeries()
+    with pytest.raises(ValueError):
+        JoursFeries([("15/8/2025", "1/8/2025")])
+
+
+def test_par_str():
+    """Format texte, commentaires et lignes vides."""
+    feries = JoursFeries.par_str(
+        """
+# Jours fériés
+25/12/2024
+1/8/2025 - 3/8/2025  # fermeture de l'usine
+
+1/8/2025
+"""
+    )
+    assert len(feries) == 4
+    with pytest.raises(ValueError, match="Ligne 2"):
+        JoursFeries.par_str("1/1/2025\n32/13/2025")
+
+
+def test_fichiers(tmp_path):
+    """Lecture d'un fichier texte, sauvegarde puis projection en mémoire."""
+    texte = tmp_path / "feries.txt"
+    texte.write_text("14/7/2025\n1/11/2025 - 2/11/2025\n", encoding="utf-8")
+    feries = JoursFeries.par_fichier(str(texte))
+    binaire = tmp_path / "feries.bin"
+    feries.sauvegarde(str(binaire))
+    charge = JoursFeries.charge(str(binaire))
+    assert isinstance(charge._jours, np.memmap)
+    assert len(charge) == 3
+    assert "2/11/2025" in charge
+    JoursFeries().sauvegarde(str(binaire))
+    assert len(JoursFeries.charge(str(binaire))) == 0
+    with pytest.raises(ValueError):
+        JoursFeries.charge(str(texte))
+
+
+def test_reunion():
+    """La réunion contient les jours des deux ensembles."""
+    feries = JoursFeries(["1/1/2025"]) | JoursFeries([("30/12/2024", "31/12/2024"), "5/1/2025"])
+    assert len(feries) == 4
+    for date in ["30/12/2024", "31/12/2024", "1/1/2025", "5/1/2025"]:
+        assert date in feries
+    assert "2/1/2025" not in feries
+    assert len(feries | JoursFeries()) == 4
+
+
+def test_calendrier_ouvre():
+    """Les jours fériés s'ajoutent aux jours de repos hebdomadaires."""
+    ouvre = CalendrierOuvre(
+        "23/12/2024",
+        heures_execution="9-17",
+        jours_repos="Samedi Dimanche",
+        jours_feries=JoursFeries(["25/12/2024", ("26/12/2024", "27/12/2024")]),
+    )
+    assert ouvre.ajoute(Date.par_str("24/12/2024/16:00"), Duree(heures=2)) == Date(
+        jours=30, mois=12, annees=2024, heures=10
+    )
+    assert ouvre.duree_ouvree(
+        Date.par_str("23/12/2024"), Date.par_str("1/1/2025")
+    ) == Duree(heures=32)
+
+
+def test_resous_Calendrier():
+    """resous_Calendrier saute les jours fériés."""
+    probleme = Probleme.par_str(
+        "A / 2 jours / / Premiere tache\nB / 1 jour / A fin / Seconde tache"
+    )
+    feries = JoursFeries([("2/1/2025", "3/1/2025")])
+    calendrier = resous_Calendrier(
+        probleme, "1/1/2025", heures_execution="0-24", jours_feries=feries
+    )
+    assert calendrier["A"].date_fin == Date(jours=5, mois=1, annees=2025)
+    assert calendrier["B"].date_debut == Date(jours=5, mois=1, annees=2025)
+    assert calendrier["B"].date_fin == Date(jours=6, mois=1, annees=2025)
+    with pytest.raises(ValueError):
+        resous_Calendrier(
+            probleme,
+            "1/1/2025",
+            calendrier_ouvre=CalendrierOuvre("1/1/2025"),
+            jours_feries=feries,
+        )
@@ -0,0 +1,55 @@
+#! /usr/bin/env python
+# -*- coding: utf-8 -*-
+"""Description
+
+Tests sur le temps d'import du paquet, mesuré dans un nouvel interpréteur.
+"""
+import subprocess
+import sys
+from pathlib import Path
+
+## Budget de temps d'import de ordonnancement, en secondes (matplotlib seul en prend plus).
+BUDGET_IMPORT = 0.25
+
+DEPENDANCES_LOURDES = ["matplotlib", "rich", "networkx", "pendulum", "numpy"]
+
+
+def execute(code):
+    """Exécute du code dans un nouvel interpréteur, depuis la racine du dépôt."""
+    return subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", code],
+        capture_output=True,
+        text=True,
+        check=True,
+        cwd=Path(__file__).resolve().parent.parent,
+    )
+
+
+def test_dependances_non_importees():
+    """Importer le paquet et résoudre un EDT ne charge aucune dépendance lourde."""
+    resultat = execute(
+        "import sys, ordonnancement as o\n"
+        "o.resous_EDT(o.Probleme.par_str('A / 1 jour / / a\\nB / 2 jours / A fin / b'))\n"
+        f"print([m for m in {DEPENDANCES_LOURDES!r} if m in sys.modules])"
+    )
+    assert resultat.stdout.strip() == "[]"
+
+
+def test_import_differe():
+    """Les objets NumPy restent accessibles depuis le paquet."""
+    resultat = execute(
+        "import sys, ordonnancement as o\n"
+        "print(o.Reseau.__module__, 'numpy' in sys.modules, 'Reseau' in dir(o))"
+    )
+    assert resultat.stdout.split() == ["ordonnancement.reseau", "True", "True"]
+
+
+def test_budget_import():
+    """Le temps d'import cumulé du paquet respecte le budget."""
+    resultat = execute("import ordonnancement")
+    for ligne in resultat.stderr.splitlines():
+        colonnes = ligne.split("|")
+        if len(colonnes) == 3 and colonnes[2].strip() == "ordonnancement":
+            assert int(colonnes[1]) / 1e6 < BUDGET_IMPORT
+            return
+    raise AssertionError("Temps d'import de ordonnancement introuvable.")
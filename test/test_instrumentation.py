@@ -0,0 +1,124 @@
+#! /usr/bin/env python
+# -*- coding: utf-8 -*-
+"""Description
+
+Tests sur le module instrumentation.
+"""
+import json
+import pytest
+from ordonnancement import (
+    Probleme,
+    Duree,
+    Date,
+    Instrumentation,
+    ErreurCycle,
+    CalendrierOuvre,
+    resous_EDT,
+    resous_Calendrier,
+)
+from ordonnancement.instrumentation import sans_mesure
+
+
+def test_sans_mesure():
+    """Sans instrumentation, les fonctions ne sont pas enveloppées."""
+    assert sans_mesure("demarrage", resous_EDT) is resous_EDT
+
+
+def test_resous_EDT(probleme):
+    """Chaque phase est comptée, le résultat est inchangé."""
+    instrumentation = Instrumentation()
+    edt = resous_EDT(probleme, 8, 2, instrumentation=instrumentation)
+    assert edt == resous_EDT(probleme, 8, 2)
+    assert instrumentation.nb_resolutions == 1
+    assert [phase.nom for phase in instrumentation.phases] == [
+        "graphe",
+        "tri_topologique",
+        "acyclicite",
+        "demarrage",
+        "temps_ouvre",
+        "insertion",
+    ]
+    for nom in ["demarrage", "temps_ouvre", "insertion"]:
+        assert instrumentation[nom].appels == 5
+    assert instrumentation["graphe"].appels == 1
+    assert instrumentation.conversions["Duree vers Duration"] > 0
+    assert sum(phase.secondes for phase in instrumentation.phases) <= instrumentation.secondes
+    with pytest.raises(ValueError):
+        instrumentation["inconnue"]
+
+
+def test_resous_Calendrier(probleme):
+    """Les conversions Pendulum sont comptées, les mesures s'accumulent."""
+    instrumentation = Instrumentation()
+    calendrier = resous_Calendrier(
+        probleme, "23/12/1998", heures_execution="10-18", instrumentation=instrumentation
+    )
+    assert calendrier == resous_Calendrier(probleme, "23/12/1998", heures_execution="10-18")
+    assert instrumentation.conversions["Date vers DateTime"] > 0
+    assert instrumentation.conversions["DateTime vers Date"] > 0
+    resous_Calendrier(
+        probleme,
+        "23/12/1998",
+        calendrier_ouvre=CalendrierOuvre("23/12/1998"),
+        instrumentation=instrumentation,
+    )
+    assert instrumentation.nb_resolutions == 2
+    assert instrumentation["temps_ouvre"].appels == 10
+    assert json.loads(json.dumps(instrumentation.vers_dict()))["nb_resolutions"] == 2
+
+
+def test_rappel(probleme):
+    """Le rappel reçoit l'instrumentation à la fin de chaque résolution."""
+    recus = list()
+    instrumentation = Instrumentation(rappel=recus.append)
+    resous_EDT(probleme, instrumentation=instrumentation)
+    resous_EDT(probleme, instrumentation=instrumentation)
+    assert recus == [instrumentation, instrumentation]
+
+
+def test_restauration(probleme):
+    """Le comptage cesse à la fin de la résolution, même en cas d'erreur."""
+    convertit_duration = Duree.__dict__["_convertit_duration"]
+    convertit_datetime = Date.__dict__["_convertit_datetime"]
+    instrumentation = Instrumentation()
+    with pytest.raises(ErreurCycle):
+        resous_EDT(
+            Probleme.par_str("A / 1 jour / B fin / A\nB / 1 jour / A fin / B"),
+            instrumentation=instrumentation,
+        )
+    assert Duree.__dict__["_convertit_duration"] is convertit_duration
+    assert Date.__dict__["_convertit_datetime"] is convertit_datetime
+    assert instrumentation["acyclicite"].appels == 1
+    assert instrumentation.nb_resolutions == 1
+    conversions = dict(instrumentation.conversions)
+    resous_Calendrier(probleme, "23/12/1998", heures_execution="10-18")
+    assert instrumentation.conversions == conversions
+
+
+def test_concurrence(probleme):
+    """Des résolutions instrumentées concurrentes comptent chacune leurs conversions."""
+    from concurrent.futures import ThreadPoolExecutor
+
+    convertit_duration = Duree.__dict__["_convertit_duration"]
+    convertit_datetime = Date.__dict__["_convertit_datetime"]
+    convertion = Date.__dict__["_convertion"]
+    seule = Instrumentation()
+    resous_Calendrier(probleme, "23/12/1998", heures_execution="10-18", instrumentation=seule)
+
+    def resous(instrumentation):
+        for _ in range(10):
+            resous_Calendrier(
+                probleme, "23/12/1998", heures_execution="10-18", instrumentation=instrumentation
+            )
+        return instrumentation
+
+    with ThreadPoolExecutor(4) as groupe:
+        instrumentations = list(groupe.map(resous, [Instrumentation() for _ in range(4)]))
+    for instrumentation in instrumentations:
+        assert instrumentation.conversions == {
+            sens: 10 * nombre for sens, nombre in seule.conversions.items()
+        }
+        assert instrumentation["tri_topologique"].appels == 10
+    assert Duree.__dict__["_convertit_duration"] is convertit_duration
+    assert Date.__dict__["_convertit_datetime"] is convertit_datetime
+    assert Date.__dict__["_convertion"] is convertion
@@ -0,0 +1,83 @@
+#! /usr/bin/env python
+# -*- coding: utf-8 -*-
+"""Description
+
+Tests sur le module marges.
+"""
+import pytest
+from ordonnancement import Probleme, Duree, analyse_marges, resous_EDT
+
+
+@pytest.fixture
+def probleme(texte):
+    return Probleme.par_str(
+        texte
+        + """F / 1 an / A fin / Tache annexe
+G / 2 jours / B fin | F debut / Suite
+"""
+    )
+
+
+def test_dates_au_plus_tot(probleme):
+    """Les dates au plus tôt sont celles de l'emploi du temps."""
+    marges = analyse_marges(probleme)
+    edt = resous_EDT(probleme)
+    for activite in edt.activites:
+        assert marges[activite.tache.nom].debut_tot == activite.debut
+        assert marges[activite.tache.nom].fin_tot == activite.fin
+
+
+def test_marges(probleme):
+    """Marges d'une tâche suivie par un prérequis debut et d'une tâche finale."""
+    marges = analyse_marges(probleme)
+    fin_projet = marges["E"].fin_tot
+    assert marges["F"].debut_tard == fin_projet - Duree(annees=1)
+    assert marges["F"].marge_libre == Duree(semaines=2, jours=6, heures=3)
+    assert marges["G"].fin_tard == fin_projet
+    assert marges["G"].marge_libre == marges["G"].marge_totale
+    assert not marges["F"].est_critique
+    assert marges["C"].est_critique
+
+
+def test_chemins_critiques(probleme):
+    """Le chemin critique suit le prérequis debut de C vers B."""
+    marges = analyse_marges(probleme)
+    assert marges.critiques == ["A", "B", "C", "D", "E"]
+    assert marges.chemins_critiques() == [["A", "B", "C", "D", "E"]]
+
+
+def test_plusieurs_chemins():
+    """Deux chemins critiques qui se rejoignent."""
+    probleme = Probleme.par_str(
+        """
+A / 2 jours / / A
+B / 1 jour / / B
+C / 1 jour / B fin / C
+D / 1 jour / A fin | C fin / D
+"""
+    )
+    marges = analyse_marges(probleme)
+    assert marges.chemins_critiques() == [["A", "D"], ["B", "C", "D"]]
+
+
+def test_aleatoire(probleme_aleatoire):
+    """Propriétés des marges sur un problème aléatoire."""
+    probleme = probleme_aleatoire(300, 5)
+    marges = analyse_marges(probleme)
+    assert (marges.marges_libres >= 0).all()
+    assert (marges.marges_libres <= marges.marges_totales).all()
+    chemins = marges.chemins_critiques()
+    assert chemins
+    for chemin in chemins:
+        assert marges[chemin[0]].debut_tot == Duree()
+        assert marges[chemin[-1]].fin_tot._secondes == marges.fin_projet
+        assert all(marges[nom].est_critique for nom in chemin)
+
+
+def test_conditions(probleme):
+    """Mêmes conditions que resous_EDT."""
+    marges = analyse_marges(probleme, duree_max_journalier=8, nb_jours_repos=2)
+    edt = resous_EDT(probleme, duree_max_journalier=8, nb_jours_repos=2)
+    assert marges["E"].fin_tot == edt["E"].fin
+    with pytest.raises(ValueError):
+        marges["Z"]
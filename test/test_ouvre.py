@@ -0,0 +1,165 @@
+#! /usr/bin/env python
+# -*- coding: utf-8 -*-
+"""Description
+
+Tests sur le module ouvre.
+"""
+import datetime
+import random
+import pytest
+from ordonnancement import (
+    Duree,
+    Date,
+    CalendrierOuvre,
+    resous_Calendrier,
+)
+
+
+def _en_datetime(date: Date) -> datetime.datetime:
+    return datetime.datetime(
+        date.annees, date.mois, date.jours, date.heures, date.minutes, date.secondes
+    )
+
+
+def _ajoute_reference(
+    depart: datetime.datetime, secondes: int, ouverture: int, fermeture: int, repos
+) -> datetime.datetime:
+    """Ajoute des secondes ouvrées jour par jour, pour une plage qui ne passe pas minuit."""
+    courant = depart
+    while True:
+        debut_jour = datetime.datetime(courant.year, courant.month, courant.day)
+        plage_debut = debut_jour + datetime.timedelta(seconds=ouverture)
+        plage_fin = debut_jour + datetime.timedelta(seconds=fermeture)
+        if courant.weekday() not in repos and courant < plage_fin:
+            courant = max(courant, plage_debut)
+            disponible = int((plage_fin - courant).total_seconds())
+            if secondes <= disponible:
+                return courant + datetime.timedelta(seconds=secondes)
+            secondes -= disponible
+        courant = debut_jour + datetime.timedelta(days=1)
+
+
+def test_exemples():
+    """Exemples de la documentation."""
+    ouvre = CalendrierOuvre(
+        "23/12/1998", heures_execution="9-17", jours_repos="Samedi Dimanche"
+    )
+    assert ouvre.ajoute(Date.par_str("23/12/1998/16:00"), Duree(heures=10)) == Date(
+        jours=25, mois=12, annees=1998, heures=10
+    )
+    assert ouvre.debut_ouvre(Date.par_str("26/12/1998")) == Date(
+        jours=28, mois=12, annees=1998, heures=9
+    )
+    assert ouvre.debut_ouvre(Date.par_str("24/12/1998/10:00")) == Date(
+        jours=24, mois=12, annees=1998, heures=10
+    )
+    assert ouvre.duree_ouvree(
+        Date.par_str("24/12/1998"), Date.par_str("29/12/1998")
+    ) == Duree(jours=1)
+
+
+def test_reference():
+    """Les dates calculées correspondent à un parcours jour par jour."""
+    generateur = random.Random(3)
+    ouvre = CalendrierOuvre(
+        "1/1/2020", heures_execution="8.5-17", jours_repos="Mercredi Dimanche", nb_jours=10
+    )
+    for _ in range(200):
+        depart = datetime.datetime(2020, 1, 1) + datetime.timedelta(
+            seconds=generateur.randrange(400 * 86400)
+        )
+        secondes = generateur.randrange(60 * 86400)
+        date = Date(
+            jours=depart.day,
+            mois=depart.month,
+            annees=depart.year,
+            heures=depart.hour,
+            minutes=depart.minute,
+            secondes=depart.second,
+        )
+        arrivee = ouvre.ajoute(date, Duree(secondes=secondes))
+        assert _en_datetime(arrivee) == _ajoute_reference(
+            depart, secondes, 8 * 3600 + 1800, 17 * 3600, (2, 6)
+        )
+        assert ouvre.duree_ouvree(date, arrivee) == Duree._depuis_secondes(secondes)
+
+
+def test_jours_semaine():
+    """Les jours de repos sont ceux du calendrier."""
+    ouvre = CalendrierOuvre("1/3/2024", jours_repos="Lundi Mardi Mercredi Jeudi Vendredi Samedi")
+    for jour in range(1, 20):
+        debut = ouvre.debut_ouvre(Date(jours=jour, mois=3, annees=2024))
+        assert _en_datetime(debut).weekday() == 6
+
+
+def test_nuit():
+    """Une plage qui passe minuit."""
+    ouvre = CalendrierOuvre("1/6/2021", heures_execution="22-6")
+    assert ouvre.ajoute(Date.par_str("1/6/2021/23:00"), Duree(heures=3)) == Date(
+        jours=2, mois=6, annees=2021, heures=2
+    )
+    assert ouvre.ajoute(Date.par_str("1/6/2021/5:00"), Duree(heures=2)) == Date(
+        jours=1, mois=6, annees=2021, heures=23
+    )
+    assert ouvre.debut_ouvre(Date.par_str("1/6/2021/12:00")) == Date(
+        jours=1, mois=6, annees=2021, heures=22
+    )
+
+
+def test_extension():
+    """L'horizon s'étend au besoin."""
+    ouvre = CalendrierOuvre("1/1/2000", heures_execution="9-17", nb_jours=7)
+    arrivee = ouvre.ajoute(Date.par_str("1/1/2000"), Duree(heures=8 * 1000))
+    assert arrivee == Date(jours=26, mois=9, annees=2002, heures=17)
+
+
+def test_erreurs():
+    """Arguments invalides."""
+    with pytest.raises(ValueError):
+        CalendrierOuvre("1/1/2000", heures_execution="9-9")
+    with pytest.raises(ValueError):
+        CalendrierOuvre("1/1/2000", heures_execution="9-25")
+    with pytest.raises(ValueError):
+        CalendrierOuvre("1/1/2000", jours_repos="Lundi Lundi")
+    with pytest.raises(ValueError):
+        CalendrierOuvre("1/1/2000", jours_repos="Lundi Funday")
+    with pytest.raises(ValueError):
+        CalendrierOuvre(
+            "1/1/2000", jours_repos="Lundi Mardi Mercredi Jeudi Vendredi Samedi Dimanche"
+        )
+    ouvre = CalendrierOuvre("1/1/2000")
+    with pytest.raises(ValueError):
+        ouvre.debut_ouvre(Date.par_str("31/12/1999"))
+    with pytest.raises(ValueError):
+        ouvre.duree_ouvree(Date.par_str("2/1/2000"), Date.par_str("1/1/2000"))
+
+
+def test_resous_Calendrier(probleme):
+    """Sans restriction, le calendrier ouvré donne le même calendrier."""
+    attendu = resous_Calendrier(probleme, "23/12/1998")
+    obtenu = resous_Calendrier(
+        probleme, "23/12/1998", calendrier_ouvre=CalendrierOuvre("23/12/1998")
+    )
+    assert list(obtenu.dates) == list(attendu.dates)
+
+
+def test_resous_Calendrier_restreint(probleme):
+    """Avec restrictions, les tâches commencent et finissent en temps ouvré."""
+    ouvre = CalendrierOuvre(
+        "23/12/1998", heures_execution="10-18", jours_repos="Mardi mercredi"
+    )
+    calendrier = resous_Calendrier(probleme, "23/12/1998", calendrier_ouvre=ouvre)
+    for datation in calendrier.dates:
+        for prerequis in datation.tache.prerequis:
+            reference = calendrier[prerequis.nom]
+            reference = reference.date_fin if prerequis.typ == "fin" else reference.date_debut
+            assert datation.date_debut >= reference + prerequis.latence
+        assert ouvre.debut_ouvre(datation.date_debut) == datation.date_debut
+        assert ouvre.duree_ouvree(datation.date_debut, datation.date_fin) == Duree._depuis_secondes(
+            ouvre._decale(ouvre._en_secondes(datation.date_debut), datation.tache.duree)
+            - ouvre._en_secondes(datation.date_debut)
+        )
+    with pytest.raises(ValueError):
+        resous_Calendrier(
+            probleme, "23/12/1998", jours_repos="Mardi", calendrier_ouvre=ouvre
+        )
@@ -0,0 +1,45 @@
+#! /usr/bin/env python
+# -*- coding: utf-8 -*-
+"""Description
+
+Tests sur le module parallele.
+"""
+import pytest
+from ordonnancement import Probleme
+from ordonnancement.parallele import par_lignes_paralleles
+
+@pytest.fixture
+def lignes(texte):
+    """Lignes du problème de référence, E avant D et avec une ligne vide, plus une tâche F."""
+    a, b, c, d, e = texte.strip().splitlines()
+    return [e, a, "", b, c, d, "F / 90 minutes + 1 jour / / Sans prérequis"]
+
+
+def test_equivalence(lignes):
+    """Le problème lu en parallèle est celui de la lecture séquentielle."""
+    attendu = Probleme.par_lignes(lignes)
+    for taille in [1, 2, 100]:
+        probleme = par_lignes_paralleles(lignes, processus=2, lignes_par_bloc=taille)
+        assert probleme == attendu
+        assert list(probleme.noms) == list(attendu.noms)
+        assert probleme["F"].duree.minutes == 90
+        assert probleme["E"].prerequis[0].nom is probleme["D"].nom
+
+
+def test_erreurs(lignes):
+    """Les erreurs indiquent la ligne, qu'elles viennent d'un bloc ou de l'assemblage."""
+    with pytest.raises(ValueError, match="Ligne 3 "):
+        par_lignes_paralleles(["A / 1 jour / / A", "", "B / 1 jaur / / B"], 2, 1)
+    with pytest.raises(ValueError, match="Ligne 3 : Le nom de tâche A"):
+        par_lignes_paralleles(["A / 1 jour / / A", "B / 1 jour / / B", "A / 1 jour / / C"], 2, 1)
+    with pytest.raises(ValueError, match="Ligne 2 : G n'est pas"):
+        par_lignes_paralleles(lignes[:1] + ["F / 1 jour / G fin / F"] + lignes[1:-1], 2, 2)
+    with pytest.raises(ValueError):
+        par_lignes_paralleles(lignes, 0)
+
+
+def test_depuis_fichier(tmp_path, lignes):
+    """Probleme.depuis_fichier lit en parallèle si on lui donne des processus."""
+    chemin = tmp_path / "probleme.txt"
+    chemin.write_text("\n".join(lignes), encoding="utf-8")
+    assert Probleme.depuis_fichier(str(chemin), processus=2) == Probleme.par_lignes(lignes)
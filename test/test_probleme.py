@@ -1,9 +1,12 @@
 """Description.
 Contient les tests du module probleme.
 """
+import copy
+import gzip
+import pickle
 import pytest
 from pendulum import duration, datetime
-from ordonnancement import Probleme, Tache, Prerequis, Duree
+from ordonnancement import Probleme, Tache, Prerequis, Duree, DUREE_NULLE
 
 #### Test sur la classe Duree
 
@@ -31,6 +34,7 @@ def test_convertit_duration():
     entree = duree_A
     attendu = duration(seconds=78, years=1)
     assert entree._convertit_duration() == attendu
+    assert duree_B._convertit_duration() > duree_A._convertit_duration()
 
 
 def test_convertit_duree():
@@ -59,6 +63,10 @@ def test_soustraction():
     entree = Duree(annees=23, secondes=12)
     attendu = Duree(annees=22, secondes=1)
     assert entree - Duree(annees=1, secondes=11) == attendu
+    assert Duree(jours=1) - Duree(heures=1) == Duree(heures=23)
+    assert Duree(jours=1) - Duree(jours=1) == Duree()
+    with pytest.raises(ValueError):
+        Duree(heures=1) - Duree(jours=1)
 
 
 def test_egalite_inegalite():
@@ -87,6 +95,19 @@ def test_par_str():
     assert entree == attendu
 
 
+def test_par_str_memorise():
+    """Teste qu'un texte déjà lu renvoie la même durée et les mêmes erreurs"""
+    assert Duree.par_str("2 jours + 3 heures") is Duree.par_str("2 jours + 3 heures")
+    assert Duree.par_str("1 an+2 mois") == Duree(annees=1, mois=2)
+    for _ in range(2):
+        with pytest.raises(ValueError, match="La valeur x n'est pas numérique"):
+            Duree.par_str("x jours")
+        with pytest.raises(ValueError, match="Le type de temps foo n'est pas valide."):
+            Duree.par_str("3 foo")
+        with pytest.raises(ValueError, match="positifs"):
+            Duree.par_str("-1 jours")
+
+
 def test_get_item():
     """Teste le get_item"""
     entree = Duree(secondes=6788)
@@ -104,6 +125,55 @@ def test_repr_aucune_duree():
     assert repr(Duree()) == "Duree(Aucune durée)"
 
 
+def test_comparaison_conventions_pendulum():
+    """Teste que les comparaisons suivent les conventions de Pendulum"""
+    assert Duree(mois=1) == Duree(jours=30)
+    assert Duree(annees=1) == Duree(jours=365)
+    assert Duree(annees=1) < Duree(mois=13)
+
+
+def test_hash():
+    """Teste que le hachage est cohérent avec l'égalité"""
+    assert hash(Duree(minutes=1)) == hash(Duree(secondes=60))
+    assert len({Duree(heures=24), Duree(jours=1), Duree(jours=2)}) == 2
+
+
+def test_slots():
+    """Teste que la durée ne porte pas de dictionnaire d'attributs"""
+    assert not hasattr(Duree(jours=1), "__dict__")
+
+
+def test_immuable():
+    """Teste qu'une durée ne peut pas être modifiée"""
+    duree = Duree(jours=1)
+    with pytest.raises(AttributeError):
+        duree.jours = 2
+    with pytest.raises(AttributeError):
+        del duree.heures
+    assert duree == Duree(jours=1)
+
+
+def test_partage():
+    """Teste que des durées de mêmes composantes sont une seule instance"""
+    assert Duree(jours=1) is Duree(jours=1)
+    assert Duree.par_str("2 jours + 3 heures") is Duree(heures=3, jours=2)
+    assert Duree() is DUREE_NULLE
+    assert Duree(heures=24) is not Duree(jours=1)
+    assert Duree(jours=1).add(DUREE_NULLE) is Duree(jours=1)
+    duree = Duree(minutes=5)
+    assert pickle.loads(pickle.dumps(duree)) is duree
+    assert copy.deepcopy(duree) is duree
+
+
+def test_slots_tache():
+    """Les tâches et prérequis ne portent pas de dictionnaire d'attributs."""
+    prerequis = Prerequis(nom="A", typ="fin", latence=Duree())
+    tache = Tache(nom="B", duree=Duree(jours=1), prerequis=[prerequis])
+    assert not hasattr(prerequis, "__dict__")
+    assert not hasattr(tache, "__dict__")
+    assert tache.correspondance == " " and tache.estimation is None
+
+
 #### Test sur la classe Prerequis
 
 
@@ -314,3 +384,62 @@ def test_correspondances(taches):
     probleme = Probleme(taches)
     assert "prerequis" not in vars(probleme)
     assert ["Poncer", "Plaquo", "Peinture"] == list(probleme.correspondances)
+
+
+def test_par_lignes(taches):
+    """Lecture ligne à ligne, avec des prérequis décrits plus loin."""
+    lignes = [
+        "C / 34 jours / B debut | A fin (56 secondes) / Peinture\n",
+        "\n",
+        "A / 3 jours // Poncer\n",
+        "B / 67 jours / A debut / Plaquo\n",
+    ]
+    probleme = Probleme.par_lignes(lignes)
+    assert sorted(probleme.noms) == ["A", "B", "C"]
+    assert probleme["C"] == taches[2]
+    assert probleme["C"].prerequis[0].nom is probleme["B"].nom
+    assert [tache.nom for tache in Probleme.lit_taches(lignes)] == ["C", "A", "B"]
+    with pytest.raises(ValueError, match="Ligne 1 : D n'est pas"):
+        Probleme.par_lignes(["A / 1 jour / D fin / A", "B / 1 jour / / B"])
+    with pytest.raises(ValueError, match="Ligne 3 "):
+        Probleme.par_lignes(["A / 1 jour / / A", "", "B / 1 jaur / / B"])
+    with pytest.raises(ValueError, match="Ligne 2 : Le nom de tâche A"):
+        Probleme.par_lignes(["A / 1 jour / / A", "A / 1 jour / / B"])
+    for latence in ["()", "(1 jour) 2 jours", "(1 jour) (2 jours)"]:
+        with pytest.raises(ValueError, match="Ligne 2 : "):
+            Probleme.par_lignes(["B / 1 jour / / b", f"A / 1 jour / B fin {latence} / a"])
+
+
+def test_depuis_fichier(tmp_path):
+    """Les fichiers compressés par gzip sont lus de la même façon."""
+    texte = "A / 3 jours // Poncer\nB / 67 jours / A debut / Plaquo\n"
+    (tmp_path / "probleme.txt").write_text(texte, encoding="utf-8")
+    with gzip.open(tmp_path / "probleme.txt.gz", "wt", encoding="utf-8") as fichier:
+        fichier.write(texte)
+    probleme = Probleme.par_str(texte)
+    assert Probleme.depuis_fichier(str(tmp_path / "probleme.txt")) == probleme
+    assert Probleme.depuis_fichier(str(tmp_path / "probleme.txt.gz")) == probleme
+
+
+def test_registre(taches):
+    """Les tâches sont numérotées dans l'ordre du problème, les prérequis résolus."""
+    probleme = Probleme(taches)
+    registre = probleme.registre
+    assert list(registre) == ["A", "B", "C"]
+    assert (registre["C"], registre.nom(1), len(registre)) == (2, "B", 3)
+    assert "D" not in registre
+    with pytest.raises(ValueError):
+        registre["D"]
+    with pytest.raises(ValueError):
+        registre.ajoute("A")
+    assert [registre[prerequis.nom] for prerequis in probleme["C"].prerequis] == [1, 0]
+
+
+def test_registre_partage(taches):
+    """Des problèmes qui partagent leurs tâches gardent chacun leur numérotation."""
+    a, b, c = taches
+    premier = Probleme([b, a, c])
+    second = Probleme([a, b, c])
+    assert [premier.registre[prerequis.nom] for prerequis in c.prerequis] == [0, 1]
+    assert [second.registre[prerequis.nom] for prerequis in c.prerequis] == [1, 0]
+    assert not hasattr(c.prerequis[0], "indice")
@@ -0,0 +1,133 @@
+#! /usr/bin/env python
+# -*- coding: utf-8 -*-
+"""Description
+
+Tests sur le module reseau.
+"""
+import random
+import numpy as np
+import pytest
+from ordonnancement import (
+    Probleme,
+    Tache,
+    Prerequis,
+    Duree,
+    Reseau,
+    VueEDT,
+    EDT,
+    resous_EDT,
+    resous_EDT_vectoriel,
+)
+
+
+def probleme_aleatoire(nb_taches, graine):
+    """Génère un problème acyclique aléatoire avec des prérequis fin et debut."""
+    generateur = random.Random(graine)
+    taches = list()
+    for i in range(nb_taches):
+        prerequis = list()
+        for j in generateur.sample(range(i), min(i, generateur.randint(0, 3))):
+            prerequis.append(
+                Prerequis(
+                    nom=f"T{j:04d}",
+                    typ=generateur.choice(["fin", "debut"]),
+                    latence=Duree(heures=generateur.randint(0, 5)),
+                )
+            )
+        taches.append(
+            Tache(
+                nom=f"T{i:04d}",
+                duree=Duree(heures=generateur.randint(1, 48)),
+                prerequis=prerequis,
+                correspondance=f"Tache {i}",
+            )
+        )
+    return Probleme(taches)
+
+
+def test_compilation(probleme):
+    """Teste les tableaux du réseau."""
+    reseau = Reseau.par_probleme(probleme)
+    assert reseau.noms == ["A", "B", "C", "D", "E"]
+    assert list(reseau.indptr) == [0, 0, 1, 2, 4, 5]
+    assert list(reseau.aretes) == [
+        ("A", "B"),
+        ("B", "C"),
+        ("A", "D"),
+        ("C", "D"),
+        ("D", "E"),
+    ]
+    assert reseau.nb_niveaux == 5
+
+
+def test_cycle():
+    """Teste la détection d'un cycle."""
+    probleme = Probleme.par_str(
+        """
+A / 1 jour / B fin / A
+B / 1 jour / A fin / B
+"""
+    )
+    with pytest.raises(ValueError):
+        Reseau.par_probleme(probleme)
+
+
+def test_passe_avant_scalaire_vectorisee(probleme_aleatoire):
+    """Teste que les deux passes avant donnent le même résultat."""
+    reseau = Reseau.par_probleme(probleme_aleatoire(300, graine=3))
+    assert np.array_equal(
+        reseau._passe_avant_scalaire(reseau.durees, reseau.latences),
+        reseau._passe_avant_vectorisee(reseau.durees, reseau.latences),
+    )
+
+
+def test_passe_avant_tirages(probleme):
+    """Teste la passe avant sur plusieurs jeux de durées à la fois."""
+    reseau = Reseau.par_probleme(probleme)
+    durees = np.stack([reseau.durees, reseau.durees * 2])
+    debuts = reseau.passe_avant(durees=durees)
+    assert debuts.shape == (2, 5)
+    assert np.array_equal(debuts[0], reseau.passe_avant())
+    assert np.array_equal(debuts[1], reseau.passe_avant(durees=reseau.durees * 2))
+
+
+def test_resous_EDT_vectoriel(probleme):
+    """Teste que le moteur vectoriel retrouve l'emploi du temps de resous_EDT."""
+    assert resous_EDT_vectoriel(probleme) == resous_EDT(probleme)
+    assert resous_EDT_vectoriel(
+        probleme, duree_max_journalier=12, nb_jours_repos=2
+    ) == resous_EDT(probleme, duree_max_journalier=12, nb_jours_repos=2)
+
+
+def test_resous_EDT_vectoriel_aleatoire(probleme_aleatoire):
+    """Compare activité par activité sur un problème aléatoire."""
+    probleme = probleme_aleatoire(200, graine=7)
+    attendu = resous_EDT(probleme)
+    obtenu = resous_EDT_vectoriel(probleme)
+    assert len(list(attendu.activites)) == 200
+    for activite in attendu.activites:
+        assert obtenu[activite.tache.nom] == activite
+
+
+def test_resous_EDT_vectoriel_ordre(probleme_aleatoire):
+    """Les activités sont dans le même ordre que resous_EDT, sur des problèmes aléatoires."""
+    for graine in range(30):
+        taches = list(probleme_aleatoire(60, graine).taches)
+        random.Random(graine).shuffle(taches)
+        probleme = Probleme(taches)
+        assert resous_EDT_vectoriel(probleme) == resous_EDT(probleme)
+        assert list(resous_EDT_vectoriel(probleme, colonnes=True).noms) == [
+            activite.tache.nom for activite in resous_EDT(probleme).activites
+        ]
+
+
+def test_vue(probleme):
+    """Teste la vue en colonnes."""
+    vue = resous_EDT_vectoriel(probleme, colonnes=True)
+    assert isinstance(vue, VueEDT)
+    assert len(vue) == 5
+    assert list(vue.noms) == ["A", "B", "C", "D", "E"]
+    assert vue["B"].debut == Duree(annees=3, semaines=2, jours=2, heures=3)
+    assert isinstance(vue.vers_EDT(), EDT)
+    with pytest.raises(ValueError):
+        vue["Z"]
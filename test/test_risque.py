@@ -0,0 +1,217 @@
+#! /usr/bin/env python
+# -*- coding: utf-8 -*-
+"""Description
+
+Tests sur le module risque.
+"""
+import pytest
+from ordonnancement import (
+    Probleme,
+    Tache,
+    Prerequis,
+    Duree,
+    Date,
+    TroisPoints,
+    Loi,
+    analyse_risque,
+    resous_EDT,
+)
+
+
+@pytest.fixture
+def probleme(texte):
+    return Probleme.par_str(
+        texte
+        + """F / 1 jour / A fin / Tache annexe
+"""
+    )
+
+
+def test_trois_points_invalide():
+    """Teste l'ordre des durées et la loi."""
+    with pytest.raises(ValueError):
+        TroisPoints(Duree(jours=3), Duree(jours=2), Duree(jours=6))
+    with pytest.raises(ValueError):
+        TroisPoints(Duree(jours=2), Duree(jours=3), Duree(jours=6), loi="normale")
+
+
+def test_loi_invalide():
+    """Teste le nom de la loi."""
+    with pytest.raises(ValueError):
+        Loi("inconnue")
+
+
+def test_estimation_abstraite():
+    """Une estimation doit fournir tire et etendue."""
+    from ordonnancement.risque import Estimation
+
+    with pytest.raises(TypeError):
+        Estimation()
+
+
+def test_sans_estimation(probleme):
+    """Sans estimation, les fins sont celles de l'emploi du temps."""
+    rapport = analyse_risque(probleme, nb_tirages=50, graine=0)
+    edt = resous_EDT(probleme)
+    for nom in ["A", "B", "C", "D", "E"]:
+        assert rapport.fin(nom, 50) == edt[nom].fin
+    assert rapport.fin_projet(90) == edt["E"].fin
+    assert rapport.probabilite_critique("C") == 1.0
+    assert rapport.probabilite_critique("F") == 0.0
+
+
+def test_reproductible(probleme):
+    """Une même graine donne le même rapport."""
+    estimations = {
+        "D": TroisPoints(Duree(annees=2), Duree(annees=3), Duree(annees=5)),
+        "F": Loi("uniform", low=Duree(jours=1), high=Duree(annees=8)),
+    }
+    premier = analyse_risque(probleme, 200, graine=4, estimations=estimations)
+    second = analyse_risque(probleme, 200, graine=4, estimations=estimations)
+    assert (premier.centiles_fins == second.centiles_fins).all()
+    assert (premier.probabilites_critiques == second.probabilites_critiques).all()
+
+
+def test_centiles():
+    """Les centiles d'une loi uniforme sont retrouvés."""
+    probleme = Probleme(
+        [
+            Tache(
+                nom="A",
+                duree=Duree(jours=10),
+                prerequis=[],
+                estimation=Loi("uniform", low=Duree(jours=0), high=Duree(jours=100)),
+            )
+        ]
+    )
+    rapport = analyse_risque(probleme, 20000, graine=2, centiles=(10, 50, 90))
+    for centile in (10, 50, 90):
+        assert abs(rapport.fin("A", centile)._secondes / 86400 - centile) < 2
+
+
+def test_probabilite_critique():
+    """Deux branches concurrentes : la plus longue est critique plus souvent."""
+    probleme = Probleme(
+        [
+            Tache(
+                nom="A",
+                duree=Duree(jours=5),
+                prerequis=[],
+                estimation=TroisPoints(Duree(jours=1), Duree(jours=5), Duree(jours=9)),
+            ),
+            Tache(nom="B", duree=Duree(jours=4), prerequis=[]),
+            Tache(
+                nom="C",
+                duree=Duree(jours=1),
+                prerequis=[
+                    Prerequis(nom="A", typ="fin", latence=Duree()),
+                    Prerequis(nom="B", typ="fin", latence=Duree()),
+                ],
+            ),
+        ]
+    )
+    rapport = analyse_risque(probleme, 5000, graine=3)
+    assert rapport.probabilite_critique("C") == 1.0
+    assert rapport.probabilite_critique("A") > rapport.probabilite_critique("B") > 0
+
+
+def test_dates(probleme):
+    """Les fins peuvent être données en dates."""
+    rapport = analyse_risque(probleme, 10, graine=0, date_commencement="23/12/1998")
+    assert rapport.date_fin("A", 50) == Date(jours=6, mois=1, annees=2002)
+    with pytest.raises(ValueError):
+        analyse_risque(probleme, 10).date_fin("A", 50)
+
+
+def test_centile_absent(probleme):
+    """Un centile non calculé est refusé."""
+    rapport = analyse_risque(probleme, 10, centiles=(50,))
+    with pytest.raises(ValueError):
+        rapport.fin("A", 90)
+    with pytest.raises(ValueError):
+        rapport.fin("Z", 50)
+
+
+def test_processus(probleme):
+    """Le résultat ne dépend pas du nombre de processus."""
+    estimations = {
+        "A": TroisPoints(Duree(annees=2), Duree(annees=3), Duree(annees=5)),
+        "D": TroisPoints(Duree(annees=2), Duree(annees=3), Duree(annees=5), "triangulaire"),
+        "F": Loi("uniform", low=Duree(jours=1), high=Duree(annees=8)),
+    }
+    attendu = analyse_risque(
+        probleme, 500, graine=7, estimations=estimations, taille_bloc=50
+    )
+    obtenu = analyse_risque(
+        probleme, 500, graine=7, estimations=estimations, taille_bloc=50, processus=2
+    )
+    assert obtenu.nb_tirages == 500
+    assert (obtenu.centiles_fins == attendu.centiles_fins).all()
+    assert (obtenu.centiles_projet == attendu.centiles_projet).all()
+    assert (obtenu.probabilites_critiques == attendu.probabilites_critiques).all()
+    with pytest.raises(ValueError):
+        analyse_risque(probleme, 10, processus=0)
+
+
+def test_petits_blocs():
+    """La queue de distribution ne dépend pas de la taille des blocs."""
+    probleme = Probleme(
+        [
+            Tache(
+                nom="A",
+                duree=Duree(jours=3),
+                prerequis=[],
+                estimation=TroisPoints(Duree(jours=2), Duree(jours=3), Duree(jours=20)),
+            ),
+            Tache(nom="B", duree=Duree(jours=2), prerequis=[Prerequis("A", "fin", Duree())]),
+        ]
+    )
+    reference = analyse_risque(probleme, 20000, graine=1, centiles=(99,)).fin("B", 99)
+    for taille_bloc in [5, 1]:
+        rapport = analyse_risque(
+            probleme, 20000, graine=1, centiles=(99,), taille_bloc=taille_bloc
+        )
+        assert abs(rapport.fin("B", 99)._secondes - reference._secondes) < 86400
+
+
+class _Debordante(Loi):
+    """Loi qui tire hors de l'étendue qu'elle annonce."""
+
+    def etendue(self):
+        return 10000, 15000
+
+
+def test_debordement():
+    """Les tirages hors de l'étendue annoncée tombent dans les classes ouvertes."""
+    probleme = Probleme([Tache(nom="A", duree=Duree(jours=1), prerequis=[])])
+    rapport = analyse_risque(
+        probleme,
+        20000,
+        graine=0,
+        centiles=(0, 25, 75, 100),
+        estimations={"A": _Debordante("uniform", low=10000, high=20000)},
+    )
+    fins = [rapport.fin("A", centile)._secondes for centile in (0, 25, 75, 100)]
+    assert 10000 <= fins[0] < 10010 and 19990 < fins[3] <= 20000
+    assert abs(fins[1] - 12500) < 100
+    assert abs(fins[2] - 17500) < 100
+
+
+@pytest.mark.parametrize(
+    "loi, nb_taches",
+    [(Loi("lognormal", mean=11, sigma=1), 50), (Loi("pareto", a=1.5), 5)],
+)
+def test_queue_lourde(loi, nb_taches):
+    """Une loi à queue lourde donne ses centiles et sa fin maximale exacte."""
+    import numpy as np
+
+    probleme = Probleme(
+        [Tache(nom=str(i), duree=Duree(secondes=1), prerequis=[], estimation=loi) for i in range(nb_taches)]
+    )
+    rapport = analyse_risque(probleme, 200000, graine=3, centiles=(50, 90, 100))
+    tirages = loi.tire(np.random.default_rng(3), 200000)
+    attendu = np.percentile(tirages, [50, 90])
+    largeur = (tirages.max() - tirages.min()) / 1000 + 1
+    for centile, valeur in zip((50, 90), attendu):
+        assert abs(rapport.fin("0", centile)._secondes - valeur) <= 3 * largeur + 0.02 * valeur
+    assert rapport.fin_projet(100)._secondes >= rapport.fin("0", 100)._secondes